@@ -0,0 +1,61 @@
+"""
+Compares the accumulation of partitions by growing a frame with a concat
+per partition against the accumulation engine, which loads the
+partitions on a thread pool and concatenates them once.
+
+The weekly stats of all positions are accumulated for one season and
+for all seasons. The concat cost alone is measured on the preloaded
+partitions, since it grows quadratically with the number of partitions
+for the loop.
+
+Run from within the benchmarks directory.
+"""
+
+import pandas as pd
+
+import src.loader.statistics as stats
+import src.utils.accumulator as accumulator
+from src.config.mapping import week_map
+
+from timing import measure
+
+POSITIONS = ["QB", "RB", "WR", "TE"]
+
+
+def get_calls(years):
+    return [(position, week, year) for year in years for position in POSITIONS
+            for week in range(1, week_map[year] + 1)]
+
+
+def accumulate_loop(loader, calls):
+    df = pd.DataFrame()
+    for args in calls:
+        df = pd.concat([df, loader(*args)])
+    return df
+
+
+def concat_loop(frames):
+    df = pd.DataFrame()
+    for frame in frames:
+        df = pd.concat([df, frame])
+    return df
+
+
+if __name__ == "__main__":
+    for label, years in [("1 season", [2021]), (f"{len(week_map)} seasons", list(week_map.keys()))]:
+        calls = get_calls(years)
+        # warm up the storage backend and the page cache
+        frames = [stats.get_weekly_stats(*args) for args in calls]
+
+        loop, loop_seconds = measure(accumulate_loop, stats.get_weekly_stats, calls)
+        engine, engine_seconds = measure(accumulator.accumulate, stats.get_weekly_stats, calls)
+        pd.testing.assert_frame_equal(loop, engine)
+
+        _, concat_loop_seconds = measure(concat_loop, frames)
+        _, concat_seconds = measure(accumulator.concat, frames)
+
+        print(f"{label}: {len(calls)} partitions, {engine.shape[0]} rows")
+        print(f"{'':<4}{'load + concat loop':<24}{loop_seconds:>8.2f} s")
+        print(f"{'':<4}{'accumulate':<24}{engine_seconds:>8.2f} s")
+        print(f"{'':<4}{'concat loop only':<24}{concat_loop_seconds:>8.2f} s")
+        print(f"{'':<4}{'single concat only':<24}{concat_seconds:>8.2f} s")
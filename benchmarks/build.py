@@ -0,0 +1,53 @@
+"""
+Compares building the summaries one after another in the main process
+against building them on a process pool.
+
+The stats, snapcounts, team stats, features and statistics of the
+seasons with schedules are built into a temporary directory, so the
+stored summaries, the manifest and the player registry are not touched.
+The players are registered before the build. The loader cache is
+disabled, otherwise the sequential build would profit from the frames
+loaded by earlier runs.
+
+Run from within the benchmarks directory.
+"""
+import os
+import shutil
+import tempfile
+
+import src.preprocessing.build as build
+import src.preprocessing.registry as registry
+import src.preprocessing.statistics.statistics as statistics
+import src.utils.cache as cache
+import src.utils.manifest as manifest
+
+YEARS = range(2021, 2015, -1)
+
+
+def get_tasks(prefix):
+    tasks = list()
+    pending = [task for task in statistics.get_tasks() if task.year in YEARS]
+    while pending:
+        task = pending.pop()
+        task.dir = os.path.join(prefix, task.dir.replace("../", ""))
+        tasks.append(task)
+        pending.extend(task.get_dependencies())
+    return tasks
+
+
+if __name__ == "__main__":
+    cache.ENABLED = False
+    results = dict()
+    for workers in sorted({1, 2, 4, build.WORKERS}):
+        prefix = tempfile.mkdtemp()
+        manifest.PATH = os.path.join(prefix, "manifest.json")
+        registry.DIR = os.path.join(prefix, "registry")
+        try:
+            registry.update(YEARS)
+            results[workers] = build.build(get_tasks(prefix), workers)
+        finally:
+            shutil.rmtree(prefix)
+
+    print()
+    for workers, summary in results.items():
+        print(f"{workers:>3} workers{summary['seconds']:>8.2f} s{results[1]['seconds'] / summary['seconds']:>8.2f}x")
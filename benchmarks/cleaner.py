@@ -0,0 +1,70 @@
+"""
+Compares the row-wise cleaning with apply against the vectorized,
+column-at-a-time cleaning of the weekly and yearly stats, and the
+row-wise team lookups of the projected players against the lookup
+of their team codes.
+
+The raw csv files are read upfront, only the cleaning is measured.
+
+Run from within the benchmarks directory.
+"""
+import glob
+import os
+import time
+
+import pandas as pd
+
+import src.config.fantasypros as fp_mapping
+import src.utils.cleaner as cleaner
+
+
+def clean_rowwise(df, types):
+    df = cleaner.drop_unnamed(df)
+    df = cleaner.map_column_names(df, types)
+    df = cleaner.check_columns(df)
+    df["team"] = df["player"].apply(cleaner.get_team_stats)
+    df["player"] = df["player"].apply(cleaner.fix_player_stats)
+    df["rost"] = df["rost"].apply(cleaner.fix_rost)
+    return cleaner.assign_type(df, types)
+
+
+def clean_vectorized(df, types):
+    df = cleaner.clean(df, types)
+    df["team"] = cleaner.get_team_stats_column(df["player"])
+    df["player"] = cleaner.fix_player_stats_column(df["player"])
+    return df
+
+
+def split_rowwise(players):
+    return players.apply(cleaner.fix_player_projections), players.apply(cleaner.get_team_projections)
+
+
+def get_frames():
+    frames = list()
+    for path in sorted(glob.glob("../raw/weekly_stats/*/*/week_*.csv")):
+        frames.append((pd.read_csv(path), fp_mapping.stats_type[path.split(os.sep)[-2]]))
+    for path in sorted(glob.glob("../raw/yearly_stats/*/*.csv")):
+        frames.append((pd.read_csv(path), fp_mapping.stats_type[os.path.basename(path).split("_")[0]]))
+    return frames
+
+
+if __name__ == "__main__":
+    frames = get_frames()
+    print(f"{len(frames)} files, {sum(df.size for df, _ in frames)} cells")
+
+    for name, func in [("row-wise", clean_rowwise), ("vectorized", clean_vectorized)]:
+        start = time.perf_counter()
+        for df, types in frames:
+            func(df.copy(), types)
+        seconds = time.perf_counter() - start
+        print(f"{name:<20}{seconds:>8.2f} s{1000 * seconds / len(frames):>8.2f} ms/file")
+
+    players = [pd.read_csv(path).iloc[:, 0] for path in sorted(glob.glob("../raw/projections/*/*/week_*.csv"))]
+    print(f"{len(players)} projection files, {sum(map(len, players))} players")
+
+    for name, func in [("row-wise teams", split_rowwise), ("team codes", cleaner.split_team_projections)]:
+        start = time.perf_counter()
+        for column in players:
+            func(column)
+        seconds = time.perf_counter() - start
+        print(f"{name:<20}{seconds:>8.2f} s{1000 * seconds / len(players):>8.2f} ms/file")
@@ -0,0 +1,62 @@
+"""
+Compares rebuilding the weekly summaries of a season against updating
+them incrementally when the latest week was added.
+
+The stats of all positions and the snapcounts of 2021 are stored into a
+temporary directory without their last week, then they are rebuilt in
+full and updated by the missing week. The loader cache is disabled,
+otherwise the weeks loaded before would be served from memory.
+
+Run from within the benchmarks directory.
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import src.preprocessing.statistics.snapcounts as snapcounts
+import src.preprocessing.statistics.stats as stats
+import src.utils.cache as cache
+import src.utils.manifest as manifest
+
+from src.config.mapping import week_map
+
+YEAR = 2021
+
+
+def get_tasks(prefix):
+    tasks = [task for task in stats.get_tasks() + snapcounts.get_tasks() if task.year == YEAR]
+    for task in tasks:
+        task.dir = os.path.join(prefix, task.dir.replace("../", ""))
+    return tasks
+
+
+def drop_last_week(tasks):
+    for task in tasks:
+        df = task.store_accumulated_data()
+        task.write(df.loc[df["week"] < week_map[YEAR]])
+
+
+if __name__ == "__main__":
+    cache.ENABLED = False
+    prefix = tempfile.mkdtemp()
+    manifest.PATH = os.path.join(prefix, "manifest.json")
+    try:
+        tasks = get_tasks(prefix)
+
+        drop_last_week(tasks)
+        start = time.perf_counter()
+        expected = [task.store_accumulated_data() for task in tasks]
+        full = time.perf_counter() - start
+
+        drop_last_week(tasks)
+        start = time.perf_counter()
+        updated = [task.store_accumulated_data(weeks=task.get_changed_weeks()) for task in tasks]
+        incremental = time.perf_counter() - start
+
+        for a, b in zip(expected, updated):
+            assert a.equals(b), "summaries differ"
+        print(f"{'full':<14}{full:>8.3f} s")
+        print(f"{'incremental':<14}{incremental:>8.3f} s{full / incremental:>8.1f}x")
+    finally:
+        shutil.rmtree(prefix)
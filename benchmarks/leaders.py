@@ -0,0 +1,62 @@
+"""
+Compares building the leaderboards of several metrics and seasons one
+Leaders object at a time, as the tool did, against the leaderboard
+engine pivoting the weekly stats once.
+
+Each old object loads the summary of its season again, builds the week
+columns with a mask per week and aggregates them per player. The engine
+is measured once with building the cube and once selecting all
+leaderboards from the kept cube.
+
+Run from within the benchmarks directory.
+"""
+
+import numpy as np
+
+from src.config.mapping import week_map
+from src.metrics.leaders import Leaders
+from src.preprocessing.statistics.stats import Stats
+
+from timing import measure
+
+POSITION = "WR"
+YEARS = [2017, 2018, 2019, 2020, 2021]
+METRICS = ["receiving_rec", "receiving_tgt", "receiving_yds", "receiving_td", "fantasy_points"]
+RUNS = 3
+
+
+def get_leaders_each(metric, year):
+    # the data of the Leaders tool for one metric and season
+    df = Stats(POSITION, year).get_accumulated_data()
+    df = df.loc[:, ["player", "week", "team", "games", metric]]
+    for week in range(1, week_map[year] + 1):
+        df[f"week_{week}"] = df.loc[df["week"] == week].loc[:, metric]
+    df = df.drop(["week", metric], axis=1)
+    df = df.groupby(["player", "team"], as_index=False).agg(
+        {"games": np.sum, **{f"week_{week}": np.sum for week in range(1, week_map[year] + 1)}})
+
+    df[f"total_{metric}"] = df.loc[:, [f"week_{i}" for i in range(1, week_map[year] + 1)]].sum(axis=1)
+    df = df.sort_values(by=f"total_{metric}", ascending=False)
+    df[f"total_{metric}_rank"] = df[f"total_{metric}"].rank(ascending=False)
+    df[f"{metric}_per_game"] = df.loc[:, f"total_{metric}"] / df.loc[:, "games"]
+    df = df.sort_values(by=f"{metric}_per_game", ascending=False)
+    df[f"{metric}_per_game_rank"] = df[f"{metric}_per_game"].rank(ascending=False)
+    return df
+
+
+def get_leaders_engine(leaders):
+    return [leaders.get_leaders(metric, year, per_game=per_game)
+            for metric in METRICS for year in YEARS for per_game in [False, True]]
+
+
+if __name__ == "__main__":
+    print(f"{len(METRICS)} metrics of {len(YEARS)} seasons")
+    _, each = measure(lambda: [get_leaders_each(metric, year) for metric in METRICS for year in YEARS], runs=RUNS)
+    leaders = Leaders(POSITION, YEARS, METRICS)
+    results = {
+        "one per metric": each,
+        "engine": measure(lambda: get_leaders_engine(Leaders(POSITION, YEARS, METRICS)), runs=RUNS)[1],
+        "engine kept cube": measure(get_leaders_engine, leaders, runs=RUNS)[1],
+    }
+    for name, seconds in results.items():
+        print(f"{name:<20}{seconds * 1000:>10.2f} ms{each / seconds:>10.1f}x")
@@ -0,0 +1,60 @@
+"""
+Compares the memory of the loaded frames and the time of a merge on
+the player keys with and without the compact mode.
+
+The weekly stats of every position and season, the weekly snapcounts
+and the projections are loaded from the raw data in both modes. The
+loader cache is cleared in between, so every frame is loaded again.
+
+Run from within the benchmarks directory.
+"""
+import pandas as pd
+
+import src.loader.statistics as loader
+import src.utils.accumulator as accumulator
+import src.utils.cache as cache
+import src.utils.compact as compact
+
+from src.config.mapping import week_map
+
+from timing import measure
+
+POSITIONS = ["QB", "RB", "TE", "WR"]
+KEY = ["player", "position", "year", "week"]
+RUNS = 10
+
+
+def load():
+    return {
+        "stats": accumulator.concat([loader.get_accumulated_weekly_stats(position, year)
+                                    for position in POSITIONS for year in week_map.keys()]),
+        "snapcounts": accumulator.concat([loader.get_accumulated_weekly_snapcounts(year)
+                                         for year in week_map.keys() if year >= 2016]),
+        "projections": accumulator.concat([loader.get_accumulated_projections(position) for position in POSITIONS]),
+    }
+
+
+def merge(frames):
+    df, seconds = measure(pd.merge, frames["stats"], frames["snapcounts"][KEY + ["snaps"]], on=KEY, runs=RUNS)
+    return seconds * 1000, len(df)
+
+
+if __name__ == "__main__":
+    results = dict()
+    for enabled in [False, True]:
+        cache.clear()
+        compact.ENABLED = enabled
+        frames = load()
+        results[enabled] = {name: compact.get_memory(df) for name, df in frames.items()}
+        results[enabled]["merge"] = merge(frames)
+
+    print(f"{'':<14}{'default':>10}{'compact':>10}")
+    for name in ["stats", "snapcounts", "projections"]:
+        default, compacted = results[False][name], results[True][name]
+        print(f"{name:<14}{default / 1024 ** 2:>7.1f} MB{compacted / 1024 ** 2:>7.1f} MB{default / compacted:>8.1f}x")
+    default, compacted = sum(results[False][n] for n in ["stats", "snapcounts", "projections"]), \
+        sum(results[True][n] for n in ["stats", "snapcounts", "projections"])
+    print(f"{'total':<14}{default / 1024 ** 2:>7.1f} MB{compacted / 1024 ** 2:>7.1f} MB{default / compacted:>8.1f}x")
+
+    (default, rows), (compacted, _) = results[False]["merge"], results[True]["merge"]
+    print(f"{'merge':<14}{default:>7.1f} ms{compacted:>7.1f} ms{default / compacted:>8.1f}x{rows:>8} rows")
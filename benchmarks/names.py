@@ -0,0 +1,70 @@
+"""
+Compares resolving the player names of a season of play-by-play data
+name by name against resolving them in one pass, and loading the
+stored mapping.
+
+The registry of the season is built into a temporary directory. The
+play-by-play names are abbreviated from the rosters, e.g. A.Rodgers,
+a part of them with a longer first name, e.g. Jos.Allen, as nflfastR
+does for players with the same abbreviation.
+
+Run from within the benchmarks directory.
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import src.loader.playbyplay as pbp
+import src.loader.players as players
+import src.preprocessing.registry as registry
+import src.utils.manifest as manifest
+
+from timing import measure
+
+YEAR = 2021
+PLAYS = 45000
+
+
+def get_plays(rosters):
+    rng = np.random.default_rng(YEAR)
+    rosters = rosters.drop_duplicates(["player", "team"])
+    rows = rosters.iloc[rng.integers(0, len(rosters), PLAYS)]
+    first, last = rows["player"].str.split(n=1).str[0], rows["player"].str.split(n=1).str[1]
+    length = np.where(rng.random(PLAYS) < 0.1, 3, 1)
+    names = [f"{a[:n]}.{b}" for a, b, n in zip(first, last, length)]
+    return pd.DataFrame({"posteam": rows["team"].to_numpy(), "passer_player_name": None,
+                         "receiver_player_name": names, "rusher_player_name": None})
+
+
+def resolve_each(plays):
+    return [registry.resolve(pd.Series([name]), [team], years=YEAR, abbreviated=True, fuzzy=True).iloc[0]
+            for name, team in zip(plays["receiver_player_name"], plays["posteam"])]
+
+
+if __name__ == "__main__":
+    prefix = tempfile.mkdtemp()
+    paths = registry.DIR, pbp.PREFIX, manifest.PATH
+    registry.DIR = os.path.join(prefix, "registry")
+    pbp.PREFIX = os.path.join(prefix, "raw")
+    manifest.PATH = os.path.join(prefix, "manifest.json")
+    try:
+        registry.update([YEAR])
+        plays = get_plays(players.get_players(YEAR))
+        os.makedirs(os.path.dirname(pbp.get_playbyplay_path(YEAR)))
+        plays.to_parquet(pbp.get_playbyplay_path(YEAR))
+
+        sample = plays.iloc[:200]
+        _, each = measure(resolve_each, sample)
+        names, once = measure(registry.get_playbyplay_names, YEAR)
+        _, stored = measure(registry.get_playbyplay_names, YEAR)
+    finally:
+        shutil.rmtree(prefix)
+        registry.DIR, pbp.PREFIX, manifest.PATH = paths
+
+    print(f"{'name by name':<16}{each * len(plays) / len(sample):>8.2f} s (estimated from {len(sample)} plays)")
+    print(f"{'one pass':<16}{once:>8.2f} s")
+    print(f"{'stored':<16}{stored:>8.2f} s")
+    print(f"{len(names)} names of {len(plays)} plays, {names['player_id'].notna().mean():.1%} resolved")
@@ -0,0 +1,82 @@
+"""
+Compares the table extraction of BeautifulSoup with the html.parser
+against the streaming table extractor.
+
+The benchmark runs over the archived FantasyPros and ESPN pages. If no
+pages are archived yet, pages are rendered from the raw csv files with
+the same table markup and some surrounding page content.
+
+Run from within the benchmarks directory.
+"""
+import glob
+import gzip
+import html
+import os
+import time
+
+import bs4
+import pandas as pd
+
+import src.utils.archive as archive
+import src.utils.extractor as extractor
+import src.utils.parser as parser
+
+FANTASYPROS = ("table", {"class": "table"})
+ESPN = ("table", {"class": "Table"})
+
+# page content around the tables, real pages carry navigation, scripts and ads
+FILLER = "".join(f'<div class="nav-item"><a href="/nfl/{i}">Link {i}</a><span>Text</span></div>' for i in range(800))
+SCRIPT = "<script>window.data = {" + ",".join(f'"k{i}": {i}' for i in range(2000)) + "};</script>"
+
+
+def render_fantasypros(df):
+    header = "".join(f"<th>{html.escape(c.split('.')[0])}</th>" for c in df.columns)
+    rows = "".join("<tr>" + "".join(f"<td>{html.escape(str(v))}</td>" for v in row) + "</tr>"
+                   for row in df.itertuples(index=False))
+    return (f"<html><head>{SCRIPT}</head><body>{FILLER}<table class=\"table table-bordered\"><thead><tr>{header}"
+            f"</tr></thead><tbody>{rows}</tbody></table>{FILLER}</body></html>").encode("utf-8")
+
+
+def render_espn(df):
+    teams = "".join(f"<tr><td><span>{html.escape(str(v))}</span></td></tr>" for v in df.iloc[:, 0])
+    header = "".join(f"<th><a>{html.escape(c.split('.')[0])}</a></th>" for c in df.columns[1:])
+    rows = "".join("<tr>" + "".join(f"<td><div>{html.escape(str(v))}</div></td>" for v in row) + "</tr>"
+                   for row in df.iloc[:, 1:].itertuples(index=False))
+    return (f"<html><head>{SCRIPT}</head><body>{FILLER}<table class=\"Table\"><tbody><tr><th>Team</th></tr>{teams}"
+            f"</tbody></table><table class=\"Table\"><thead><tr>{header}</tr></thead><tbody>{rows}</tbody></table>"
+            f"{FILLER}</body></html>").encode("utf-8")
+
+
+def get_pages():
+    pages = list()
+    for path in glob.glob(os.path.join(archive.PREFIX, "*", "*.html.gz")):
+        with gzip.open(path, "rb") as f:
+            identifier = ESPN if "espn" in path else FANTASYPROS
+            pages.append((identifier, f.read()))
+    if pages:
+        return pages, "archived"
+
+    for path in sorted(glob.glob("../raw/weekly_stats/2021/*/week_*.csv")):
+        pages.append((FANTASYPROS, render_fantasypros(pd.read_csv(path))))
+    for path in sorted(glob.glob("../raw/teamstats/20*/*.csv")):
+        pages.append((ESPN, render_espn(pd.read_csv(path))))
+    return pages, "rendered"
+
+
+def parse_soup(content, identifier):
+    return parser.get_data(parser.get_content(bs4.BeautifulSoup(content, "html.parser"), *identifier))
+
+
+if __name__ == "__main__":
+    pages, source = get_pages()
+    print(f"{len(pages)} {source} pages, {sum(len(p) for _, p in pages) / 1024 ** 2:.1f} MB")
+
+    results = dict()
+    for name, func in [("bs4 html.parser", parse_soup), ("extractor", extractor.extract)]:
+        start = time.perf_counter()
+        results[name] = [func(content, identifier) for identifier, content in pages]
+        seconds = time.perf_counter() - start
+        print(f"{name:<20}{seconds:>8.2f} s{1000 * seconds / len(pages):>8.1f} ms/page")
+
+    assert results["bs4 html.parser"] == results["extractor"], "extracted tables differ"
+    print("extracted tables are identical")
@@ -0,0 +1,85 @@
+"""
+Compares loading play-by-play seasons from the extracted csv files,
+read in chunks, against the per-season parquet files with column
+projection and pushed-down filters.
+
+nflfastR seasons are used if available in playbyplay.SOURCE, otherwise
+seasons of the same shape are generated: ~48,000 plays with 372
+columns, mostly numeric with some text columns.
+
+Run from within the benchmarks directory.
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import src.loader.playbyplay as playbyplay
+import src.utils.io as io
+
+from timing import measure
+
+
+YEARS = range(2017, 2022)
+COLUMNS = ["rush_attempt", "rush_touchdown", "yardline_100"]
+FILTERS = [("two_point_attempt", "==", 0), ("rush_attempt", "==", 1)]
+
+
+def generate_season(year, n=48000, numeric=340, text=30):
+    rng = np.random.default_rng(year)
+    data = {f"stat_{i}": rng.normal(size=n).round(3) for i in range(numeric)}
+    data.update({f"text_{i}": rng.choice(["A.Player", "B.Player", "C.Player", None], n) for i in range(text)})
+    data["rush_attempt"] = rng.integers(0, 2, n).astype(float)
+    data["rush_touchdown"] = rng.integers(0, 2, n).astype(float)
+    data["yardline_100"] = rng.integers(1, 100, n).astype(float)
+    data["two_point_attempt"] = rng.choice([0.0, 1.0], n, p=[0.98, 0.02])
+    return pd.DataFrame(data)
+
+
+def load_chunked(path):
+    df = pd.DataFrame()
+    for chunk in pd.read_csv(path, iterator=True, low_memory=False, chunksize=10000):
+        df = pd.concat([df, chunk])
+    return df
+
+
+def load_csv(years):
+    frames = list()
+    for year in years:
+        df = load_chunked(f"{playbyplay.PREFIX}/play-by-play/play_by_play_{year}.csv")
+        df = df.loc[(df["two_point_attempt"] == 0) & (df["rush_attempt"] == 1), COLUMNS]
+        frames.append(df)
+    return pd.concat(frames)
+
+
+if __name__ == "__main__":
+    tmp = tempfile.mkdtemp()
+    try:
+        if not all(os.path.exists(f"{playbyplay.SOURCE}/play_by_play_{year}.csv.gz") for year in YEARS):
+            playbyplay.SOURCE = os.path.join(tmp, "source")
+            os.makedirs(playbyplay.SOURCE)
+            for year in YEARS:
+                generate_season(year).to_csv(f"{playbyplay.SOURCE}/play_by_play_{year}.csv.gz", index=False)
+        playbyplay.PREFIX = os.path.join(tmp, "raw")
+        os.makedirs(f"{playbyplay.PREFIX}/play-by-play")
+
+        for year in YEARS:
+            io.extract_data(f"{playbyplay.SOURCE}/play_by_play_{year}.csv.gz",
+                            f"{playbyplay.PREFIX}/play-by-play/play_by_play_{year}.csv")
+
+        csv, csv_seconds = measure(load_csv, YEARS)
+        _, convert_seconds = measure(lambda: [playbyplay.convert(year) for year in YEARS])
+        _, full_seconds = measure(playbyplay.get_accumulated_playbyplay, YEARS)
+        parquet, parquet_seconds = measure(playbyplay.get_accumulated_playbyplay, YEARS, columns=COLUMNS,
+                                           filters=FILTERS)
+        assert csv[COLUMNS].values.tolist() == parquet[COLUMNS].values.tolist(), "loaded plays differ"
+
+        print(f"{len(YEARS)} seasons, {parquet.shape[0]} selected plays")
+        print(f"{'chunked csv, all columns':<36}{csv_seconds:>8.2f} s")
+        print(f"{'convert to parquet, once':<36}{convert_seconds:>8.2f} s")
+        print(f"{'parquet, all columns':<36}{full_seconds:>8.2f} s")
+        print(f"{'parquet, columns and filters':<36}{parquet_seconds:>8.2f} s")
+    finally:
+        shutil.rmtree(tmp)
@@ -0,0 +1,52 @@
+"""
+Compares ranking the weekly stats by several indicators one sort at a
+time against the ranking engine, in full and in the top-k mode.
+
+The weekly stats of all positions and seasons are loaded upfront, only
+the ranking is measured. The rows are ranked per year, week and
+position, the small groups the tools use, and per position, where the
+partial selection of the top-k mode pays off.
+
+Run from within the benchmarks directory.
+"""
+
+import src.loader.statistics as loader
+import src.metrics.ranking as ranking
+import src.utils.accumulator as accumulator
+
+from src.config.mapping import week_map
+
+from timing import measure
+
+POSITIONS = ["QB", "RB", "TE", "WR"]
+INDICATORS = ["fantasy_points", "passing_yds", "passing_td", "rushing_yds", "rushing_td", "receiving_rec",
+              "receiving_yds", "receiving_td"]
+GROUPS = [["year", "week", "position"], ["position"]]
+K = 12
+RUNS = 10
+
+
+def rank_each(df, keys):
+    # one sort per indicator like rank_statistic and the tools did
+    ranks = dict()
+    for indicator in INDICATORS:
+        df = df.sort_values(by=indicator, ascending=False)
+        ranks[f"{indicator}_rank"] = df.groupby(keys)[indicator].rank(ascending=False, method="min")
+    return ranks
+
+
+if __name__ == "__main__":
+    df = accumulator.concat([loader.get_accumulated_weekly_stats(position, year)
+                             for position in POSITIONS for year in week_map.keys()]).reset_index(drop=True)
+    print(f"{len(df)} player weeks of {len(week_map)} seasons, {len(INDICATORS)} indicators")
+
+    for keys in GROUPS:
+        _, each = measure(rank_each, df, keys, runs=RUNS)
+        results = {
+            "sort each": each,
+            "engine": measure(ranking.rank, df, INDICATORS, keys=keys, runs=RUNS)[1],
+            f"engine top {K}": measure(ranking.rank, df, INDICATORS, keys=keys, k=K, runs=RUNS)[1],
+        }
+        print(f"per {', '.join(keys)}")
+        for name, seconds in results.items():
+            print(f"  {name:<18}{seconds * 1000:>10.2f} ms{each / seconds:>10.1f}x")
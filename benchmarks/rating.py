@@ -0,0 +1,47 @@
+"""
+Compares rating the passers of the weekly stats row by row with apply
+against the vectorized efficiency metrics.
+
+The weekly stats of all positions and seasons are loaded upfront, only
+the rating is measured. The vectorized passer rating is measured on
+the QB weeks like the row-wise one, the efficiency table with all
+metrics on the weeks of all positions.
+
+Run from within the benchmarks directory.
+"""
+
+import src.loader.statistics as loader
+import src.metrics.rating as rating
+import src.utils.accumulator as accumulator
+
+from src.config.mapping import week_map
+
+from timing import measure
+
+POSITIONS = ["QB", "RB", "TE", "WR"]
+RUNS = 10
+
+
+def get_qb_rating_rowwise(player):
+    # the rating of the row-wise implementation the vectorized one replaced
+    att = player["passing_att"]
+    if not att == 0:
+        return 100 / 6 * ((player["passing_cmp"] / att - 0.3) / 0.2 + (player["passing_yds"] / att - 3) / 4 +
+                          (player["passing_td"] / att) / 0.05 + (0.095 - player["passing_int"] / att) / 0.04)
+    return 0
+
+
+if __name__ == "__main__":
+    df = accumulator.concat([loader.get_accumulated_weekly_stats(position, year)
+                             for position in POSITIONS for year in week_map.keys()]).reset_index(drop=True)
+    qb = df.loc[df["position"] == "QB"]
+    print(f"{len(df)} player weeks, {len(qb)} QB weeks of {len(week_map)} seasons")
+
+    _, rowwise = measure(lambda: qb.apply(get_qb_rating_rowwise, axis=1))
+    results = {
+        "row-wise rating": rowwise,
+        "vectorized rating": measure(rating.get_passer_rating, qb, runs=RUNS)[1],
+        "efficiency table": measure(rating.get_efficiency, df, runs=RUNS)[1],
+    }
+    for name, seconds in results.items():
+        print(f"{name:<20}{seconds * 1000:>10.2f} ms{rowwise / seconds:>10.0f}x")
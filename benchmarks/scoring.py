@@ -0,0 +1,86 @@
+"""
+Compares scoring the weekly stats row by row with apply against the
+compiled scoring engine.
+
+The weekly stats of all positions and seasons are loaded upfront, only
+the scoring is measured. The engine scores them in PPR and in a custom
+scheme with a TE premium and 100-yard bonuses. Rescoring a frame for
+several leagues one scheme at a time is compared against scoring all of
+them in one pass with their position ranks, and against scoring them
+again with the points kept from the first call.
+
+Run from within the benchmarks directory.
+"""
+
+import pandas as pd
+
+import src.loader.statistics as loader
+import src.metrics.scoring as scoring
+import src.utils.accumulator as accumulator
+
+from src.config.mapping import week_map
+
+from timing import measure
+
+POSITIONS = ["QB", "RB", "TE", "WR"]
+RUNS = 10
+
+CUSTOM = {
+    "name": "custom",
+    "weights": {"passing_yds": 1 / 25, "passing_td": 6, "passing_int": -2, "rushing_yds": 0.1, "rushing_td": 6,
+                "receiving_rec": 1.0, "receiving_yds": 0.1, "receiving_td": 6, "lst": -2},
+    "positions": {"TE": {"receiving_rec": 1.5}},
+    "bonuses": [{"stat": "passing_yds", "threshold": 300, "points": 3},
+                {"stat": "rushing_yds", "threshold": 100, "points": 3},
+                {"stat": "receiving_yds", "threshold": 100, "points": 3}],
+}
+
+# leagues varying the points per reception, passing touchdown and TE premium
+LEAGUES = [{"name": f"league_{reception}_{passing}_{premium}",
+            "weights": {**CUSTOM["weights"], "receiving_rec": reception, "passing_td": passing},
+            "positions": {"TE": {"receiving_rec": reception + premium}}, "bonuses": CUSTOM["bonuses"]}
+           for reception in [0.0, 0.5, 1.0] for passing in [4, 6] for premium in [0.0, 0.5]]
+
+
+def score_rowwise(player):
+    # the scoring of the row-wise implementation the engine replaced, in PPR
+    if player["position"] == "QB":
+        return 6 * player["rushing_td"] + 0.1 * player["rushing_yds"] + 4 * player["passing_td"] + 1 / 25 * player[
+            "passing_yds"] + (-1) * player["passing_int"] + (-2) * player["lst"]
+    return 6 * (player["rushing_td"] + player["receiving_td"]) + 0.1 * (
+            player["rushing_yds"] + player["receiving_yds"]) + 1.0 * player["receiving_rec"] + (-2) * player["lst"]
+
+
+def score_each(df):
+    # the leagues one scheme at a time, ranked per position and week
+    points = pd.DataFrame({league["name"]: scoring.Scoring(league).score(df) for league in LEAGUES})
+    return points, points.groupby([df["position"], df["year"], df["week"]], observed=True).rank(ascending=False,
+                                                                                                method="min")
+
+
+def score_batch(df):
+    # the leagues in one pass with a new batch, score_leagues keeps the points of a frame between calls
+    batch = scoring.Batch(df)
+    points = batch.score(LEAGUES)
+    return points, batch.rank(points)
+
+
+if __name__ == "__main__":
+    df = accumulator.concat([loader.get_accumulated_weekly_stats(position, year)
+                             for position in POSITIONS for year in week_map.keys()])
+    print(f"{len(df)} player weeks of {len(week_map)} seasons")
+
+    filled = df.fillna(0)
+    _, rowwise = measure(lambda: filled.apply(score_rowwise, axis=1))
+    compiled = scoring.Scoring(CUSTOM)
+    results = {
+        "row-wise ppr": rowwise,
+        "engine ppr": measure(scoring.score, df, "ppr", runs=RUNS)[1],
+        "engine custom": measure(compiled.score, df, runs=RUNS)[1],
+        "compile custom": measure(scoring.Scoring, CUSTOM, runs=RUNS)[1],
+        f"each {len(LEAGUES)} leagues": measure(score_each, df, runs=RUNS)[1],
+        f"batch {len(LEAGUES)} leagues": measure(score_batch, df, runs=RUNS)[1],
+        f"cached {len(LEAGUES)} leagues": measure(scoring.score_leagues, df, LEAGUES, runs=RUNS)[1],
+    }
+    for name, seconds in results.items():
+        print(f"{name:<20}{seconds * 1000:>10.2f} ms{rowwise / seconds:>10.0f}x")
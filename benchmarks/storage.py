@@ -0,0 +1,52 @@
+"""
+Compares the load times of the csv and parquet storage backends.
+
+The cold run of the parquet backend includes the one-way migration of
+the csv files, the warm run reads the migrated parquet files only.
+The benchmark works on a temporary copy of the raw data, so running
+it leaves the raw directory untouched.
+
+Run from within the benchmarks directory.
+"""
+import os
+import shutil
+import tempfile
+
+import src.loader.statistics as stats
+import src.utils.io as io
+import src.utils.storage as storage
+
+from src.config.mapping import week_map
+
+from timing import measure
+
+
+def load_tables(prefix):
+    for root, _, files in os.walk(prefix):
+        for file in files:
+            if file.endswith(".csv"):
+                io.load(os.path.join(root, file))
+
+
+def load_weekly_stats():
+    for position in ["QB", "RB", "TE", "WR"]:
+        for year in week_map.keys():
+            stats.get_accumulated_weekly_stats(position, year)
+
+
+if __name__ == "__main__":
+    tmp = tempfile.mkdtemp()
+    try:
+        prefix = os.path.join(tmp, "raw")
+        shutil.copytree(stats.PREFIX, prefix, ignore=shutil.ignore_patterns("*.parquet"))
+        stats.PREFIX = prefix
+
+        print(f"{'backend':<10}{'task':<20}{'cold [s]':>10}{'warm [s]':>10}")
+        for backend in ["csv", "parquet"]:
+            storage.BACKEND = backend
+            for task, func in [("raw tables", lambda: load_tables(prefix)), ("weekly stats", load_weekly_stats)]:
+                _, cold = measure(func)
+                _, warm = measure(func)
+                print(f"{backend:<10}{task:<20}{cold:>10.2f}{warm:>10.2f}")
+    finally:
+        shutil.rmtree(tmp)
@@ -0,0 +1,59 @@
+"""
+Compares loading the stored summaries from csv files against loading
+them from typed parquet files, in full and only the three columns and
+the weeks a tool like the game rating needs.
+
+The statistics of the seasons with schedules are stored in both formats
+into a temporary directory, their players are registered there before.
+
+Run from within the benchmarks directory.
+"""
+import os
+import shutil
+import tempfile
+
+import src.preprocessing.preprocessing as preprocessing
+import src.preprocessing.registry as registry
+import src.preprocessing.statistics.statistics as statistics
+import src.utils.manifest as manifest
+
+from timing import measure
+
+YEARS = range(2021, 2015, -1)
+COLUMNS = ["player", "fantasy_points", "week"]
+WEEKS = range(1, 9)
+
+
+def get_tasks(prefix):
+    tasks = [task for task in statistics.get_tasks() if task.year in YEARS]
+    for task in tasks:
+        task.dir = os.path.join(prefix, task.dir.replace("../", ""))
+    return tasks
+
+
+def load(tasks, **kwargs):
+    for task in tasks:
+        task.refresh = False
+    return measure(lambda: sum(len(task.get_accumulated_data(**kwargs)) for task in tasks))
+
+
+if __name__ == "__main__":
+    prefix = tempfile.mkdtemp()
+    manifest.PATH = os.path.join(prefix, "manifest.json")
+    registry.DIR = os.path.join(prefix, "registry")
+    try:
+        registry.update(YEARS)
+        tasks = get_tasks(prefix)
+        for format_ in ["csv", "parquet"]:
+            preprocessing.FORMAT = format_
+            for task in tasks:
+                task.store_accumulated_data(record=False)
+            size = sum(os.path.getsize(task.get_path()) for task in tasks)
+            print(f"{format_:<10}{size / 1024 ** 2:>8.1f} MB")
+
+            for name, kwargs in [("all", dict()), ("columns", {"columns": COLUMNS}),
+                                 ("columns, weeks", {"columns": COLUMNS, "weeks": WEEKS})]:
+                rows, seconds = load(tasks, **kwargs)
+                print(f"{'':<10}{name:<18}{seconds:>8.3f} s{rows:>8} rows")
+    finally:
+        shutil.rmtree(prefix)
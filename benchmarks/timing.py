@@ -0,0 +1,26 @@
+"""
+Implements the timing shared by the benchmarks.
+
+The benchmarks import it as a sibling module, so they are run from
+within the benchmarks directory.
+"""
+import time
+
+
+def measure(func, *args, runs=1, **kwargs):
+    """
+    Calls a function and measures the seconds per call.
+
+    :param func: function to measure
+    :type func: callable
+    :param args: arguments of the function
+    :param runs: number of calls averaged
+    :type runs: int
+    :param kwargs: keyword arguments of the function
+    :return: result of the last call and the mean seconds per call
+    :rtype: tuple
+    """
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start) / runs
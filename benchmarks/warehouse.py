@@ -0,0 +1,89 @@
+"""
+Compares answering common questions by loading the summaries into
+pandas against querying the warehouse.
+
+The warehouse of all seasons is built from the stored summaries into a
+temporary directory. The loader cache is disabled, otherwise pandas
+would be served the frames loaded by the earlier runs.
+
+Run from within the benchmarks directory.
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+import src.loader.schedules as schedules
+import src.preprocessing.warehouse as warehouse
+import src.utils.cache as cache
+import src.utils.manifest as manifest
+
+from src.preprocessing.statistics.stats import Stats
+from src.preprocessing.statistics.teamstats import Defense
+
+from timing import measure
+
+YEARS = range(2016, 2022)
+RUNS = 10
+
+# WR weeks with more than 8 targets against the 10 defenses allowing the most passing yards, the
+# schedules start in 2016
+TARGETS = """
+SELECT s.player, s.year, s.week, g.opponent, s.receiving_tgt, s.fantasy_points
+FROM stats s
+JOIN schedules g ON g.team = s.team AND g.year = s.year AND g.week = s.week
+JOIN (SELECT team, year, RANK() OVER (PARTITION BY year ORDER BY passing_yds_allowed DESC) AS rank FROM defense) d
+  ON d.team = g.opponent AND d.year = g.year
+WHERE s.position = 'WR' AND s.receiving_tgt > 8 AND d.rank <= 10
+"""
+
+
+def get_targets_pandas():
+    stats = pd.concat([Stats("WR", year).get_accumulated_data() for year in YEARS])
+    stats = stats.loc[stats["receiving_tgt"] > 8]
+    games = schedules.get_schedules(YEARS)
+    defense = pd.concat([Defense(year).get_accumulated_data() for year in YEARS])
+    defense["rank"] = defense.groupby("year")["passing_yds_allowed"].rank(method="min", ascending=False)
+
+    df = pd.merge(stats, games, on=["team", "year", "week"])
+    df = pd.merge(df, defense.loc[defense["rank"] <= 10, ["team", "year"]].rename(columns={"team": "opponent"}),
+                  on=["opponent", "year"])
+    return df[["player", "year", "week", "opponent", "receiving_tgt", "fantasy_points"]]
+
+
+def get_player_pandas():
+    df = pd.concat([Stats("RB", year).get_accumulated_data() for year in YEARS])
+    return df.loc[df["player"] == "Derrick Henry"]
+
+
+def get_player_warehouse():
+    return warehouse.select("stats", player="Derrick Henry", year=YEARS)
+
+
+def get_targets_warehouse():
+    return warehouse.query(TARGETS)
+
+
+if __name__ == "__main__":
+    cache.ENABLED = False
+    prefix = tempfile.mkdtemp()
+    manifest.PATH = os.path.join(prefix, "manifest.json")
+    warehouse.PATH = os.path.join(prefix, "warehouse.sqlite")
+    try:
+        start = time.perf_counter()
+        warehouse.build()
+        print(f"built in {time.perf_counter() - start:.1f} s, {os.path.getsize(warehouse.PATH) / 1024 ** 2:.1f} MB\n")
+
+        for name, functions in [("targets", [get_targets_pandas, get_targets_warehouse]),
+                                ("player", [get_player_pandas, get_player_warehouse])]:
+            (pandas, pandas_seconds), (stored, warehouse_seconds) = [measure(function, runs=RUNS)
+                                                                      for function in functions]
+            pandas_ms, pandas_rows = pandas_seconds * 1000, len(pandas)
+            warehouse_ms, warehouse_rows = warehouse_seconds * 1000, len(stored)
+            assert pandas_rows == warehouse_rows, "results differ"
+            print(f"{name:<10}{'pandas':<12}{pandas_ms:>10.1f} ms{pandas_rows:>8} rows")
+            print(f"{'':<10}{'warehouse':<12}{warehouse_ms:>10.1f} ms{pandas_ms / warehouse_ms:>8.1f}x")
+    finally:
+        shutil.rmtree(prefix)
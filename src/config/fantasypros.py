@@ -218,4 +218,23 @@ pa_type = {
     "pa_k": float,
     "rank_dst": float,
     "pa_dst": float
-}
\ No newline at end of file
+}
+
+# maps the rate columns of the yearly stats and snapcounts to the totals they are recomputed from, i.e.
+# numerator, denominator and factor, team_snaps are the snaps of the team in the games of the player
+yearly_rates = {
+    "passing_cmppct": ("passing_cmp", "passing_att", 100),
+    "passing_avg": ("passing_yds", "passing_att", 1),
+    "rushing_avg": ("rushing_yds", "rushing_att", 1),
+    "receiving_avg": ("receiving_yds", "receiving_rec", 1),
+    "fantasy_points_per_game": ("fantasy_points", "games", 1),
+    "snaps_per_game": ("snaps", "games", 1),
+    "snaps_pct": ("snaps", "team_snaps", 100),
+    "points_per_100_snaps": ("fantasy_points", "snaps", 100)
+}
+
+# stores the columns of the yearly stats that are the maximum of the weeks
+yearly_maxima = ["rushing_lng", "receiving_long", "receiving_lg"]
+
+# stores the shares of the snapcounts averaged over the weeks weighted by the snaps
+yearly_shares = ["rush_pct", "tgt_pct", "touch_pct", "util_pct"]
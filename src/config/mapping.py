@@ -78,4 +78,8 @@ team_changes_map = {
     "STL": "LAR",  # changed team name in 2016
     "RAM": "LAR",  # changed team name in 2016
     "Washington": "WAS",  # sometimes called only Washington
+    "Washington Redskins": "WAS",  # changed team name in 2020
+    "Oakland Raiders": "LV",  # changed team name in 2020
+    "San Diego Chargers": "LAC",  # changed team name in 2017
+    "St. Louis Rams": "LAR",  # changed team name in 2016
 }
@@ -0,0 +1,40 @@
+""" Holds the scoring schemes of the fantasy leagues.
+
+A scheme maps the stats to the points per unit. Positions override
+the points of single stats, e.g. a TE premium, and bonuses award
+points once a stat reaches a threshold in a game, e.g. a 100-yard game.
+Stats missing in a scheme score no points.
+"""
+# maps the stats to points for standard scoring
+standard = {
+    "name": "standard",
+    "weights": {
+        "passing_yds": 1 / 25,
+        "passing_td": 4,
+        "passing_int": -1,
+        "rushing_yds": 0.1,
+        "rushing_td": 6,
+        "receiving_yds": 0.1,
+        "receiving_td": 6,
+        "lst": -2
+    },
+    "positions": {},
+    "bonuses": []
+}
+
+# maps the stats to points for half-PPR scoring
+halfppr = {
+    **standard,
+    "name": "halfppr",
+    "weights": {**standard["weights"], "receiving_rec": 0.5}
+}
+
+# maps the stats to points for PPR scoring
+ppr = {
+    **standard,
+    "name": "ppr",
+    "weights": {**standard["weights"], "receiving_rec": 1.0}
+}
+
+# stores the scoring schemes by name
+schemes = {scheme["name"]: scheme for scheme in [standard, halfppr, ppr]}
@@ -0,0 +1,56 @@
+import os
+
+import pandas as pd
+
+import src.utils.accumulator as accumulator
+import src.utils.storage as storage
+
+
+PREFIX = "../raw"
+SOURCE = "../../nflfastR-data/data"
+
+YEARS = range(1999, 2022)
+
+# rows per row group, filters skip row groups by their statistics
+ROW_GROUP_SIZE = 10000
+
+
+def get_playbyplay(year, columns=None, filters=None):
+    path = get_playbyplay_path(year)
+
+    if not os.path.exists(path):
+        convert(year)
+
+    df = pd.read_parquet(path, columns=columns, filters=filters)
+    return df.reset_index(drop=True)
+
+
+def get_accumulated_playbyplay(years=YEARS, columns=None, filters=None, workers=accumulator.WORKERS):
+    for year in years:
+        if not os.path.exists(get_playbyplay_path(year)):
+            convert(year)
+
+    calls = [(year, columns, filters) for year in years]
+    return accumulator.accumulate(get_playbyplay, calls, workers).reset_index(drop=True)
+
+
+def convert(year):
+    df = pd.read_csv(_source_path(year), low_memory=False)
+    df["year"] = year
+
+    path = get_playbyplay_path(year)
+    storage.make_dirs(path)
+    df.to_parquet(path + ".tmp", index=False, row_group_size=ROW_GROUP_SIZE)
+    os.replace(path + ".tmp", path)
+
+
+def get_playbyplay_path(year):
+    return f"{PREFIX}/play-by-play/play_by_play_{year}.parquet"
+
+
+def _source_path(year):
+    # seasons extracted to csv before are converted from there
+    path = f"{PREFIX}/play-by-play/play_by_play_{year}.csv"
+    if os.path.exists(path):
+        return path
+    return f"{SOURCE}/play_by_play_{year}.csv.gz"
@@ -0,0 +1,37 @@
+import src.utils.accumulator as accumulator
+import src.utils.cache as cache
+import src.utils.compact as compact
+import src.utils.io as io
+
+from src.config.mapping import week_map
+
+
+PREFIX = "../raw"
+
+
+def get_accumulated_players(years=week_map.keys(), lazy=False):
+    calls = [(year,) for year in years]
+    return accumulator.accumulate(get_players, calls, lazy=lazy)
+
+
+@cache.memoize(lambda year: get_players_path(year))
+@compact.compacted
+def get_players(year):
+    # the rosters are not fetched, seasons without a stored roster are missing
+    path = get_players_path(year)
+    if not io.exists(path):
+        return None
+    return io.load(path)
+
+
+def get_players_path(year):
+    return f"{PREFIX}/players/players_{year}.csv"
+
+
+class TeamsLoader:
+    # loads the rosters of a season, the players per team, position and week
+    def __init__(self, year):
+        self.year = year
+
+    def get_data(self):
+        return get_players(self.year)
@@ -1,8 +1,13 @@
+import numpy as np
 import pandas as pd
-import os
 
-import src.utils.cleaner as cleaner
+import src.utils.accumulator as accumulator
+import src.utils.archive as archive
+import src.utils.cache as cache
+import src.utils.compact as compact
+import src.utils.fetcher as fetcher
 import src.utils.io as io
+import src.utils.manifest as manifest
 
 from src.config.mapping import week_map
 
@@ -11,35 +16,170 @@ from src.config.mapping import week_map
 PREFIX = "../raw"
 
 
-def update():
-    for year in week_map.keys():
-        get_schedule(year)
+def update(workers=None):
+    fetcher.get_fetcher().run(get_targets(), lambda path: not manifest.get_manifest().is_stale(path), manifest.store,
+                              workers, manifest.record_failure)
+    manifest.save()
 
 
+def refresh(year=list(week_map.keys())[0], workers=None):
+    with archive.using("revalidate"):
+        fetcher.get_fetcher().run(get_targets([year]), lambda path: False, manifest.store, workers,
+                                  manifest.record_failure)
+    manifest.save()
+
+
+def reparse(years=week_map.keys(), workers=None):
+    with archive.using("offline"):
+        fetcher.get_fetcher().run(get_targets(years), lambda path: False, manifest.store, workers,
+                                  manifest.record_failure)
+    manifest.save()
+
+
+def get_targets(years=week_map.keys()):
+    return [(get_schedule_path(year), _fetch_schedule, (year,)) for year in years]
+
+
+@cache.memoize(lambda year: get_schedule_path(year))
+@compact.compacted
 def get_schedule(year):
-    path = f"{PREFIX}/schedules/schedule_{year}.csv"
+    path = get_schedule_path(year)
 
-    if not os.path.exists(path):
-        url = f"https://www.fantasypros.com/nfl/schedule/grid.php?year={year}"
-        data = io.get_from_fantasypros(url)
-        df = pd.DataFrame(data=data[0][1:], columns=data[0][0])
+    if not io.exists(path):
+        df = _fetch_schedule(year)
         io.store(path, df)
     else:
-        df = pd.read_csv(path)
+        df = io.load(path)
+
+    df.columns = ["team"] + list(range(1, df.shape[1]))
+
+    schedule = df.reset_index().melt(id_vars=["index", "team"], var_name="week", value_name="game")
+    schedule.sort_values(["index", "week"], kind="stable", inplace=True)
+
+    games = schedule["game"].astype(str)
+    away = games.str.startswith("@").to_numpy()
+    home = games.str.startswith("vs").to_numpy()
+    bye = games.isin(["BYE", "-"]).to_numpy()
+
+    opponent = np.select([bye, away, home], ["BYE", games.str[1:], games.str[2:]], None)
+
+    location = np.full(len(games), np.nan, dtype=object)
+    location[away] = False
+    location[home] = True
+
+    return pd.DataFrame({"team": schedule["team"].to_numpy(),
+                         "opponent": opponent,
+                         "week": schedule["week"].to_numpy(dtype=np.int64),
+                         "home": location,
+                         "year": year})
+
+
+def get_schedules(years=week_map.keys()):
+    return accumulator.accumulate(get_schedule, [(year,) for year in years]).reset_index(drop=True)
+
+
+def get_schedule_index(years=week_map.keys()):
+    return ScheduleIndex(get_schedules(years))
+
+
+class ScheduleIndex:
+    """
+    Looks up the opponent and location of a team in a week of a season.
+
+    The schedules are stored in dense (year, team, week) arrays of team
+    codes, so a lookup is an array access instead of a merge. Byes have
+    no opponent code and no location.
+    """
+    def __init__(self, schedule):
+        opponents = schedule.loc[~schedule["opponent"].isin(["BYE"]) & schedule["opponent"].notna(), "opponent"]
+
+        self.years = np.sort(schedule["year"].unique())
+        self.teams = np.array(sorted(set(schedule["team"]) | set(opponents)), dtype=object)
+        self.weeks = int(schedule["week"].max())
+
+        shape = (len(self.years), len(self.teams), self.weeks + 1)
+        self.opponent = np.full(shape, -1, dtype=np.int16)
+        self.home = np.full(shape, -1, dtype=np.int8)
+        self.scheduled = np.zeros(shape, dtype=bool)
+
+        idx = (np.searchsorted(self.years, schedule["year"].to_numpy()),
+               np.searchsorted(self.teams, schedule["team"].to_numpy()),
+               schedule["week"].to_numpy())
+        self.scheduled[idx] = True
+
+        played = schedule["home"].notna().to_numpy()
+        played_idx = tuple(i[played] for i in idx)
+        self.opponent[played_idx] = np.searchsorted(self.teams, schedule["opponent"].to_numpy()[played])
+        self.home[played_idx] = schedule["home"].to_numpy()[played].astype(np.int8)
+
+    def get(self, year, team, week):
+        """
+        Returns the opponent and location of a team.
+
+        :param year: season
+        :type year: int
+        :param team: team abbreviation
+        :type team: str
+        :param week: week of the season
+        :type week: int
+        :return: opponent, "BYE" for byes, and whether the team plays at home
+        :rtype: tuple
+        """
+        i, j = self._find(np.array([year]), np.array([team], dtype=object))
+        if i[0] < 0 or j[0] < 0 or not 0 < week <= self.weeks or not self.scheduled[i[0], j[0], week]:
+            raise KeyError((year, team, week))
+
+        opponent = self.opponent[i[0], j[0], week]
+        if opponent < 0:
+            return "BYE", np.nan
+        return self.teams[opponent], bool(self.home[i[0], j[0], week])
+
+    def lookup(self, years, teams, weeks):
+        """
+        Returns the opponents and locations of many teams at once.
+
+        :param years: seasons
+        :type years: array-like
+        :param teams: team abbreviations
+        :type teams: array-like
+        :param weeks: weeks of the season
+        :type weeks: array-like
+        :return: opponent and home column, missing games are NaN
+        :rtype: pandas.DataFrame
+        """
+        years = np.asarray(years)
+        teams = np.asarray(teams, dtype=object)
+        weeks = np.asarray(weeks, dtype=np.int64)
+
+        i, j = self._find(years, teams)
+        found = (i >= 0) & (j >= 0) & (weeks > 0) & (weeks <= self.weeks)
+        idx = (i[found], j[found], weeks[found])
+        found[found] = self.scheduled[idx]
+        idx = (i[found], j[found], weeks[found])
+
+        codes = self.opponent[idx]
+        locations = self.home[idx]
+
+        opponent = np.full(len(years), np.nan, dtype=object)
+        opponent[found] = np.where(codes < 0, "BYE", self.teams[codes.clip(0)])
+        home = np.full(len(years), np.nan, dtype=object)
+        home[found] = np.where(locations < 0, np.nan, locations.astype(bool).astype(object))
+
+        return pd.DataFrame({"opponent": opponent, "home": home})
 
-    df.columns = ["team"] + ["week_" + str(i) for i in range(1, df.shape[1])]
-    df.set_index("team", drop=True, inplace=True)
+    def _find(self, years, teams):
+        i = np.searchsorted(self.years, years).clip(max=len(self.years) - 1)
+        j = np.searchsorted(self.teams, teams).clip(max=len(self.teams) - 1)
+        i[self.years[i] != years] = -1
+        j[self.teams[j] != teams] = -1
+        return i, j
 
-    schedule = pd.DataFrame(columns=["team", "opponent", "week", "home"])
-    for i, games in df.iterrows():
-        for j, game in enumerate(games):
-            schedule = pd.concat([schedule, pd.DataFrame({"team": [i],
-                                                          "opponent": [cleaner.get_opponent(game)],
-                                                          "week": [j + 1],
-                                                          "home": [cleaner.get_location(game)]})],
-                                 ignore_index=True)
 
-    schedule["year"] = year
+def get_schedule_path(year):
+    return f"{PREFIX}/schedules/schedule_{year}.csv"
 
-    return schedule
 
+def _fetch_schedule(year):
+    url = f"https://www.fantasypros.com/nfl/schedule/grid.php?year={year}"
+    data = io.get_from_fantasypros(url)
+    return pd.DataFrame(data=data[0][1:], columns=data[0][0])
@@ -1,9 +1,16 @@
 import itertools
 import pandas as pd
-import os
 
+import src.utils.accumulator as accumulator
+import src.utils.archive as archive
+import src.utils.cache as cache
 import src.utils.cleaner as cleaner
+import src.utils.compact as compact
+import src.utils.fetcher as fetcher
 import src.utils.io as io
+import src.utils.manifest as manifest
+
+import src.loader.playbyplay as playbyplay
 
 import src.config.fantasypros as fp_mapping
 import src.config.espn as espn_mapping
@@ -12,45 +19,33 @@ from src.config.mapping import week_map
 
 PREFIX = "../raw"
 
+# derives the yearly stats and snapcounts from the weekly partitions instead of fetching the season pages
+DERIVED = False
 
-def get_accumulated_weekly_stats(position, year):
-    df = pd.DataFrame()
-    for week in range(1, week_map[year] + 1):
-        weekly = get_weekly_stats(position, week, year)
-        df = pd.concat([df, weekly])
-    return df
 
+def get_accumulated_weekly_stats(position, year, lazy=False):
+    calls = [(position, week, year) for week in range(1, week_map[year] + 1)]
+    return accumulator.accumulate(get_weekly_stats, calls, lazy=lazy)
 
-def get_accumulated_weekly_snapcounts(year):
-    df = pd.DataFrame()
-    for week in range(1, week_map[year] + 1):
-        weekly = get_weekly_snapcounts(week, year)
-        df = pd.concat([df, weekly])
-    return df
 
+def get_accumulated_weekly_snapcounts(year, lazy=False):
+    calls = [(week, year) for week in range(1, week_map[year] + 1)]
+    return accumulator.accumulate(get_weekly_snapcounts, calls, lazy=lazy)
 
-def get_accumulated_projections(position, year=2021):
-    df = pd.DataFrame()
-    for week in range(1, week_map[year] + 1):
-        weekly = get_projections(position, week, year)
-        df = pd.concat([df, weekly])
-    return df
 
+def get_accumulated_projections(position, year=2021, lazy=False):
+    calls = [(position, week, year) for week in range(1, week_map[year] + 1)]
+    return accumulator.accumulate(get_projections, calls, lazy=lazy)
 
-def get_accumulated_yearly_stats(position):
-    df = pd.DataFrame()
-    for year in week_map.keys():
-        yearly = get_yearly_stats(position, year)
-        df = pd.concat([df, yearly])
-    return df
 
+def get_accumulated_yearly_stats(position, lazy=False):
+    calls = [(position, year) for year in week_map.keys()]
+    return accumulator.accumulate(derive_yearly_stats if DERIVED else get_yearly_stats, calls, lazy=lazy)
 
-def get_accumulated_yearly_snapcounts():
-    df = pd.DataFrame()
-    for year in week_map.keys():
-        yearly = get_yearly_snapcounts(year)
-        df = pd.concat([df, yearly])
-    return df
+
+def get_accumulated_yearly_snapcounts(lazy=False):
+    calls = [(year,) for year in week_map.keys()]
+    return accumulator.accumulate(derive_yearly_snapcounts if DERIVED else get_yearly_snapcounts, calls, lazy=lazy)
 
 
 def get_offense_stats(year, season="REG"):
@@ -73,58 +68,95 @@ def get_defense_stats(year, season="REG"):
     return pd.merge(df, get_defense_downs_stats(year, season), how=how_, on=on_)
 
 
-def update():
-    for position in ["QB", "RB", "TE", "WR"]:
-        for year in week_map.keys():
-            get_yearly_stats(position, year)
-            for week in range(1, week_map[year] + 1):
-                get_weekly_stats(position, week, year)
+def update(workers=None, max_age=manifest.MAX_AGE):
+    live = get_live_paths()
+
+    def is_current(path):
+        return not manifest.get_manifest().is_stale(path, path in live, max_age)
 
+    fetcher.get_fetcher().run(get_targets(), is_current, manifest.store, workers, manifest.record_failure)
+    manifest.save()
+
+
+def refresh(year=list(week_map.keys())[0], workers=None):
+    with archive.using("revalidate"):
+        fetcher.get_fetcher().run(get_targets([year]), lambda path: False, manifest.store, workers,
+                                  manifest.record_failure)
+    manifest.save()
+
+
+def reparse(years=week_map.keys(), workers=None):
+    with archive.using("offline"):
+        fetcher.get_fetcher().run(get_targets(years), lambda path: False, manifest.store, workers,
+                                  manifest.record_failure)
+    manifest.save()
+
+
+def get_live_paths(year=list(week_map.keys())[0]):
+    # the season-to-date tables and the latest week change while a season is in progress
+    weeks = [week for week in range(1, week_map[year] + 1) if io.exists(get_weekly_stats_path("QB", week, year))]
+    if weeks and weeks[-1] == week_map[year]:
+        return set()
+
+    seasonal = [_fetch_yearly_stats, _fetch_yearly_snapcounts, _fetch_points_allowed, _fetch_team_stats]
+    paths = {path for path, fetch, _ in get_targets([year]) if fetch in seasonal}
+    if weeks:
+        paths.update(get_weekly_stats_path(position, weeks[-1], year) for position in ["QB", "RB", "TE", "WR"])
+        paths.add(get_weekly_snapcounts_path(weeks[-1], year))
+    return paths
+
+
+def get_targets(years=week_map.keys()):
+    targets = list()
     for position in ["QB", "RB", "TE", "WR"]:
-        for week in range(1, week_map[2021] + 1):
-            get_projections(position, week)
+        for year in years:
+            if not DERIVED:
+                targets.append((get_yearly_stats_path(position, year), _fetch_yearly_stats, (position, year)))
+            for week in range(1, week_map[year] + 1):
+                targets.append((get_weekly_stats_path(position, week, year), _fetch_weekly_stats,
+                                (position, week, year)))
+
+    if 2021 in years:
+        for position in ["QB", "RB", "TE", "WR"]:
+            for week in range(1, week_map[2021] + 1):
+                targets.append((get_projections_path(position, week, 2021), _fetch_projections, (position, week)))
+
+    for year in years:
+        if year >= 2016:
+            if not DERIVED:
+                targets.append((get_yearly_snapcounts_path(year), _fetch_yearly_snapcounts, (year,)))
+            for week in range(1, week_map[year] + 1):
+                targets.append((get_weekly_snapcounts_path(week, year), _fetch_weekly_snapcounts, (week, year)))
 
-    for year in range(2016, list(week_map.keys())[0] + 1):
-        get_yearly_snapcounts(year)
-        for week in range(1, week_map[year] + 1):
-            get_weekly_snapcounts(week, year)
+    for year in years:
+        targets.append((get_points_allowed_path(year), _fetch_points_allowed, (year,)))
 
-    for year in week_map.keys():
-        get_points_allowed(year)
+    for year in years:
+        for team in ["offense", "defense"]:
+            for stat in ["passing", "rushing", "receiving", "downs"]:
+                skip = 1 if stat == "downs" else 0
+                targets.append((get_team_stats_path(year, team, stat, "REG"), _fetch_team_stats,
+                                (year, team, stat, skip)))
 
-    for year in week_map.keys():
-        get_offense_passing_stats(year)
-        get_offense_rushing_stats(year)
-        get_offense_receiving_stats(year)
-        get_offense_downs_stats(year)
-        get_defense_passing_stats(year)
-        get_defense_rushing_stats(year)
-        get_defense_receiving_stats(year)
-        get_defense_downs_stats(year)
+    return targets
 
 
+@cache.memoize(lambda position, week, year: get_weekly_stats_path(position, week, year))
+@compact.compacted
 def get_weekly_stats(position, week, year):
-    path = f"{PREFIX}/weekly_stats/{year}/{position.upper()}/week_{week}.csv"
+    path = get_weekly_stats_path(position, week, year)
 
-    if not os.path.exists(path):
-        url = f"https://www.fantasypros.com/nfl/stats/{position.lower()}.php?year={year}&week={week}&range=week"
-        data = io.get_from_fantasypros(url)
-        df = pd.DataFrame(data=data[0][1:], columns=data[0][0])
+    if not io.exists(path):
+        df = _fetch_weekly_stats(position, week, year)
         io.store(path, df)
     else:
-        df = pd.read_csv(path)
+        df = io.load(path)
 
-    df = cleaner.drop_unnamed(df)
-    df = cleaner.map_column_names(df, fp_mapping.stats_type[position])
-    df = cleaner.check_columns(df)
+    df = cleaner.clean(df, fp_mapping.stats_type[position])
 
     # TODO fix team assignment
-    df["team"] = df["player"].apply(cleaner.get_team_stats)
-
-    df["player"] = df["player"].apply(cleaner.fix_player_stats)
-    df["rost"] = df["rost"].apply(cleaner.fix_rost)
-
-    df = cleaner.assign_type(df, fp_mapping.stats_type[position])
+    df["team"] = cleaner.get_team_stats_column(df["player"])
+    df["player"] = cleaner.fix_player_stats_column(df["player"])
 
     df = df.loc[df["games"] == 1]
     df.drop(["rank", "rost", "fantasy_points_per_game"], axis=1, inplace=True)
@@ -136,28 +168,22 @@ def get_weekly_stats(position, week, year):
     return df
 
 
+@cache.memoize(lambda position, year: get_yearly_stats_path(position, year))
+@compact.compacted
 def get_yearly_stats(position, year):
-    path = f"{PREFIX}/yearly_stats/{year}/{position.upper()}_{year}.csv"
+    path = get_yearly_stats_path(position, year)
 
-    if not os.path.exists(path):
-        url = f"https://www.fantasypros.com/nfl/stats/{position.lower()}.php?year={year}&range=full"
-        data = io.get_from_fantasypros(url)
-        df = pd.DataFrame(data=data[0][1:], columns=data[0][0])
+    if not io.exists(path):
+        df = _fetch_yearly_stats(position, year)
         io.store(path, df)
     else:
-        df = pd.read_csv(path)
+        df = io.load(path)
 
-    df = cleaner.drop_unnamed(df)
-    df = cleaner.map_column_names(df, fp_mapping.stats_type[position])
-    df = cleaner.check_columns(df)
+    df = cleaner.clean(df, fp_mapping.stats_type[position])
 
     # TODO fix team assignment
-    df["team"] = df["player"].apply(cleaner.get_team_stats)
-
-    df["player"] = df["player"].apply(cleaner.fix_player_stats)
-    df["rost"] = df["rost"].apply(cleaner.fix_rost)
-
-    df = cleaner.assign_type(df, fp_mapping.stats_type[position])
+    df["team"] = cleaner.get_team_stats_column(df["player"])
+    df["player"] = cleaner.fix_player_stats_column(df["player"])
 
     df = df.loc[df["games"] >= 1]
     df.drop(["rank", "rost"], axis=1, inplace=True)
@@ -168,24 +194,21 @@ def get_yearly_stats(position, year):
     return df
 
 
+@cache.memoize(lambda week, year: get_weekly_snapcounts_path(week, year))
+@compact.compacted
 def get_weekly_snapcounts(week, year):
     if year < 2016:
         return None
     else:
-        path = f"{PREFIX}/weekly_snapcounts/{year}/week_{week}.csv"
+        path = get_weekly_snapcounts_path(week, year)
 
-        if not os.path.exists(path):
-            url = f"https://www.fantasypros.com/nfl/reports/snap-count-analysis/?week={week}&snaps=0&range=week&year={year}"
-            data = io.get_from_fantasypros(url)
-            df = pd.DataFrame(data=data[0][1:], columns=data[0][0])
+        if not io.exists(path):
+            df = _fetch_weekly_snapcounts(week, year)
             io.store(path, df)
         else:
-            df = pd.read_csv(path)
+            df = io.load(path)
 
-    df = cleaner.drop_unnamed(df)
-    df = cleaner.map_column_names(df, fp_mapping.snapcounts_type)
-    df = cleaner.check_columns(df)
-    df = cleaner.assign_type(df, fp_mapping.snapcounts_type)
+    df = cleaner.clean(df, fp_mapping.snapcounts_type)
 
     df = df.loc[df["games"] == 1]
     df.drop(["snaps_per_game"], axis=1, inplace=True)
@@ -196,24 +219,21 @@ def get_weekly_snapcounts(week, year):
     return df
 
 
+@cache.memoize(lambda year: get_yearly_snapcounts_path(year))
+@compact.compacted
 def get_yearly_snapcounts(year):
     if year < 2016:
         return None
     else:
-        path = f"{PREFIX}/yearly_snapcounts/snapcounts_{year}.csv"
+        path = get_yearly_snapcounts_path(year)
 
-        if not os.path.exists(path):
-            url = f"https://www.fantasypros.com/nfl/reports/snap-count-analysis/?year={year}&snaps=0&range=full"
-            data = io.get_from_fantasypros(url)
-            df = pd.DataFrame(data=data[0][1:], columns=data[0][0])
+        if not io.exists(path):
+            df = _fetch_yearly_snapcounts(year)
             io.store(path, df)
         else:
-            df = pd.read_csv(path)
+            df = io.load(path)
 
-    df = cleaner.drop_unnamed(df)
-    df = cleaner.map_column_names(df, fp_mapping.snapcounts_type)
-    df = cleaner.check_columns(df)
-    df = cleaner.assign_type(df, fp_mapping.snapcounts_type)
+    df = cleaner.clean(df, fp_mapping.snapcounts_type)
 
     df = df.loc[df["games"] >= 1]
 
@@ -222,24 +242,62 @@ def get_yearly_snapcounts(year):
     return df
 
 
+@compact.compacted
+def derive_yearly_stats(position, year):
+    df = get_accumulated_weekly_stats(position, year)
+    columns = [column for column in fp_mapping.stats_type[position] if column not in ["rank", "rost"]]
+    df = aggregate(df, ["player", "team", "position", "year"], columns + ["team", "position", "year"])
+    # ordered like the season page
+    return df.sort_values("fantasy_points", ascending=False, kind="stable", ignore_index=True)
+
+
+@compact.compacted
+def derive_yearly_snapcounts(year):
+    if year < 2016:
+        return None
+
+    df = get_accumulated_weekly_snapcounts(year)
+    # the weekly snap share is of the snaps of the team in the week
+    df["team_snaps"] = df["snaps"] / df["snaps_pct"] * 100
+    df = aggregate(df, ["player", "position", "year"], list(fp_mapping.snapcounts_type) + ["year"])
+    return df.sort_values("player", kind="stable", ignore_index=True)
+
+
+def aggregate(df, keys, columns):
+    # sums the totals, takes the maxima and the last team, weights the shares by the snaps and recomputes the rates
+    df = df.drop("week", axis=1).astype({key: object for key in keys})
+    rates = [column for column in fp_mapping.yearly_rates if column in columns]
+    maxima = [column for column in fp_mapping.yearly_maxima if column in columns]
+    shares = [column for column in fp_mapping.yearly_shares if column in columns]
+    for column in shares:
+        df[column] = df[column] * df["snaps"]
+
+    functions = {column: "max" if column in maxima else "last" if column == "team" else "sum"
+                 for column in df.columns if column not in keys + rates}
+    df = df.groupby(keys, sort=False).agg(functions).reset_index()
+
+    for column in shares:
+        df[column] = (df[column] / df["snaps"]).where(df["snaps"] > 0, 0.0)
+    for column in rates:
+        numerator, denominator, factor = fp_mapping.yearly_rates[column]
+        df[column] = (df[numerator] / df[denominator] * factor).where(df[denominator] > 0, 0.0)
+    return df.loc[:, columns]
+
+
+@cache.memoize(lambda position, week, year: get_projections_path(position, week, year))
+@compact.compacted
 def get_projections(position, week, year=2021):
-    path = f"{PREFIX}/projections/{year}/{position.upper()}/week_{week}.csv"
+    path = get_projections_path(position, week, year)
 
-    if not os.path.exists(path):
-        url = f"https://www.fantasypros.com/nfl/projections/{position.lower()}.php?week={week}"
-        data = io.get_from_fantasypros(url)
-        df = pd.DataFrame(data=data[0][1:], columns=data[0][0])
+    if not io.exists(path):
+        df = _fetch_projections(position, week)
         io.store(path, df)
     else:
-        df = pd.read_csv(path)
+        df = io.load(path)
 
-    df = cleaner.drop_unnamed(df)
-    df = cleaner.map_column_names(df, fp_mapping.projections_type[position])
-    df = cleaner.check_columns(df)
-    df = cleaner.assign_type(df, fp_mapping.projections_type[position])
+    df = cleaner.clean(df, fp_mapping.projections_type[position])
 
-    df["team"] = df["player"].apply(cleaner.get_team_projections)
-    df["player"] = df["player"].apply(cleaner.fix_player_projections)
+    df["player"], df["team"] = cleaner.split_team_projections(df["player"])
 
     df["position"] = position
     df["week"] = week
@@ -248,24 +306,25 @@ def get_projections(position, week, year=2021):
     return df
 
 
-def get_points_allowed(year):
-    path = f"{PREFIX}/points_allowed/points_allowed_{year}.csv"
+@cache.memoize(lambda year, abbreviated=False: get_points_allowed_path(year))
+@compact.compacted
+def get_points_allowed(year, abbreviated=False):
+    path = get_points_allowed_path(year)
 
-    if not os.path.exists(path):
-        url = f"https://www.fantasypros.com/nfl/points-allowed.php?year={year}"
-        data = io.get_from_fantasypros(url)
-        data_mod = list()
-        for i in range(0, len(data[0][1]), len(data[0][0])):
-            data_mod.append(data[0][1][i:i + len(data[0][0])])
-        df = pd.DataFrame(data=data_mod, columns=data[0][0])
+    if not io.exists(path):
+        df = _fetch_points_allowed(year)
         io.store(path, df)
     else:
-        df = pd.read_csv(path)
+        df = io.load(path)
 
     df = cleaner.drop_unnamed(df)
     df = cleaner.map_column_names(df, dict([item for item in fp_mapping.pa_type.items()][:df.shape[1]]))
-    df = cleaner.check_columns(df)
-    df = cleaner.assign_type(df, fp_mapping.pa_type)
+    df = cleaner.fix_columns(df, fp_mapping.pa_type)
+
+    # the page names the teams, the other tables hold their abbreviations; mapped before the frame is
+    # compacted, so the teams take the categories shared with the other frames in compact mode
+    if abbreviated:
+        df["team"] = cleaner.add_team_abbreviation_column(df["team"])
 
     df["year"] = year
 
@@ -314,45 +373,106 @@ def get_defense_downs_stats(year, season="REG"):
     return _get_team_stats(year, "defense", "downs", espn_mapping.defense_downs_map, season, skip=1)
 
 
-def get_playbyplay_stats(year):
-    path = f"{PREFIX}/play-by-play/play_by_play_{year}.csv"
+@cache.memoize(lambda year, columns, filters: playbyplay.get_playbyplay_path(year))
+def get_playbyplay_stats(year, columns=None, filters=None):
+    return playbyplay.get_playbyplay(year, columns, filters)
+
+
+@cache.memoize(lambda year, team, stat, col_map, season, skip: get_team_stats_path(year, team, stat, season))
+@compact.compacted
+def _get_team_stats(year, team, stat, col_map, season="REG", skip=0):
+    path = get_team_stats_path(year, team, stat, season)
 
-    if not os.path.exists(path):
-        url = f"../../nflfastR-data/data/play_by_play_{year}.csv.gz"
-        io.extract_data(url, path)
+    if not io.exists(path):
+        df = _fetch_team_stats(year, team, stat, skip)
+        io.store(path, df)
+    else:
+        df = io.load(path)
 
-    df = io.load_data(path)
+    df = cleaner.clean(df, col_map)
+
+    df["team"] = cleaner.add_team_abbreviation_column(df["team"])
 
     df["year"] = year
 
     return df
 
 
-def _get_team_stats(year, team, stat, col_map, season="REG", skip=0):
-    path = f"{PREFIX}/teamstats/{year}/{team}_{stat}_{year}_{season}.csv"
-    seasontype = 2  # TODO Fixme to load post season stats
+def get_weekly_stats_path(position, week, year):
+    return f"{PREFIX}/weekly_stats/{year}/{position.upper()}/week_{week}.csv"
 
-    if not os.path.exists(path):
-        url = f"https://www.espn.com/nfl/stats/team/_/view/{team}/stat/{stat}/season/{year}/seasontype/{seasontype}"
-        data = io.get_from_espn(url)
-        idx = list(itertools.chain.from_iterable(data[0]))[skip:]
-        columns = data[1][skip]
-        stats = data[1][skip+1:]
-        df = pd.DataFrame(data=stats, index=idx[1:], columns=columns)
-        df.index.name = idx[0]
-        df.reset_index(inplace=True)
-        io.store(path, df)
-    else:
-        df = pd.read_csv(path)
 
-    df = cleaner.drop_unnamed(df)
-    df = cleaner.map_column_names(df, col_map)
-    df = cleaner.check_columns(df)
-    df = cleaner.assign_type(df, col_map)
+def get_yearly_stats_path(position, year):
+    return f"{PREFIX}/yearly_stats/{year}/{position.upper()}_{year}.csv"
 
-    df["team"] = df["team"].apply(cleaner.add_team_abbreviation)
 
-    df["year"] = year
+def get_weekly_snapcounts_path(week, year):
+    return f"{PREFIX}/weekly_snapcounts/{year}/week_{week}.csv"
 
-    return df
 
+def get_yearly_snapcounts_path(year):
+    return f"{PREFIX}/yearly_snapcounts/snapcounts_{year}.csv"
+
+
+def get_projections_path(position, week, year):
+    return f"{PREFIX}/projections/{year}/{position.upper()}/week_{week}.csv"
+
+
+def get_points_allowed_path(year):
+    return f"{PREFIX}/points_allowed/points_allowed_{year}.csv"
+
+
+def get_team_stats_path(year, team, stat, season):
+    return f"{PREFIX}/teamstats/{year}/{team}_{stat}_{year}_{season}.csv"
+
+
+def _fetch_weekly_stats(position, week, year):
+    url = f"https://www.fantasypros.com/nfl/stats/{position.lower()}.php?year={year}&week={week}&range=week"
+    data = io.get_from_fantasypros(url)
+    return pd.DataFrame(data=data[0][1:], columns=data[0][0])
+
+
+def _fetch_yearly_stats(position, year):
+    url = f"https://www.fantasypros.com/nfl/stats/{position.lower()}.php?year={year}&range=full"
+    data = io.get_from_fantasypros(url)
+    return pd.DataFrame(data=data[0][1:], columns=data[0][0])
+
+
+def _fetch_weekly_snapcounts(week, year):
+    url = f"https://www.fantasypros.com/nfl/reports/snap-count-analysis/?week={week}&snaps=0&range=week&year={year}"
+    data = io.get_from_fantasypros(url)
+    return pd.DataFrame(data=data[0][1:], columns=data[0][0])
+
+
+def _fetch_yearly_snapcounts(year):
+    url = f"https://www.fantasypros.com/nfl/reports/snap-count-analysis/?year={year}&snaps=0&range=full"
+    data = io.get_from_fantasypros(url)
+    return pd.DataFrame(data=data[0][1:], columns=data[0][0])
+
+
+def _fetch_projections(position, week):
+    url = f"https://www.fantasypros.com/nfl/projections/{position.lower()}.php?week={week}"
+    data = io.get_from_fantasypros(url)
+    return pd.DataFrame(data=data[0][1:], columns=data[0][0])
+
+
+def _fetch_points_allowed(year):
+    url = f"https://www.fantasypros.com/nfl/points-allowed.php?year={year}"
+    data = io.get_from_fantasypros(url)
+    data_mod = list()
+    for i in range(0, len(data[0][1]), len(data[0][0])):
+        data_mod.append(data[0][1][i:i + len(data[0][0])])
+    return pd.DataFrame(data=data_mod, columns=data[0][0])
+
+
+def _fetch_team_stats(year, team, stat, skip=0):
+    seasontype = 2  # TODO Fixme to load post season stats
+    url = f"https://www.espn.com/nfl/stats/team/_/view/{team}/stat/{stat}/season/{year}/seasontype/{seasontype}"
+    data = io.get_from_espn(url)
+    idx = list(itertools.chain.from_iterable(data[0]))[skip:]
+    columns = data[1][skip]
+    stats = data[1][skip+1:]
+    df = pd.DataFrame(data=stats, index=idx[1:], columns=columns)
+    df.index.name = idx[0]
+    df.reset_index(inplace=True)
+    return df
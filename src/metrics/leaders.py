@@ -0,0 +1,122 @@
+"""
+Builds the leaderboards of a position for many metrics and seasons.
+
+The weekly stats of the seasons are pivoted once into a cube of the
+players and teams of each season, the metrics and the weeks, weeks
+without a game hold zero. The totals, per game values and their ranks
+per season are computed for all metrics at once from the cube. The
+cube and the table are kept, so the leaderboards of any metric and
+season are selected without loading the stats again.
+"""
+import pandas as pd
+
+import src.metrics.ranking as ranking
+
+from src.config.mapping import week_map
+from src.preprocessing.statistics.stats import Stats
+
+# columns identifying a row of the cube
+KEYS = ["year", "player", "team"]
+
+
+class Leaders:
+    def __init__(self, position, years, metrics):
+        """
+        Leaderboards of a position.
+
+        :param position: position of the players
+        :type position: str
+        :param years: seasons
+        :type years: list of int
+        :param metrics: columns of the weekly stats
+        :type metrics: list of str
+        """
+        self.position = position
+        self.years = list(years)
+        self.metrics = list(metrics)
+        self.cube = None
+        self.table = None
+
+    def load_data(self):
+        """ Loads the weekly stats of the seasons, only the columns of
+        the metrics. """
+        columns = list(dict.fromkeys(KEYS + ["week", "games"] + self.metrics))
+        return pd.concat([Stats(self.position, year).get_accumulated_data(columns=columns) for year in self.years],
+                         ignore_index=True)
+
+    def get_cube(self):
+        """
+        Returns the cube of the weekly metrics, built once.
+
+        :return: games and metrics per player and team of the seasons, the columns are the metrics and weeks
+        :rtype: pandas.DataFrame
+        """
+        if self.cube is None:
+            values = list(dict.fromkeys(["games"] + self.metrics))
+            weeks = range(1, max(week_map[year] for year in self.years) + 1)
+            cube = self.load_data().pivot_table(index=KEYS, columns="week", values=values, aggfunc="sum",
+                                                fill_value=0, observed=True)
+            self.cube = cube.reindex(columns=pd.MultiIndex.from_product([values, weeks], names=["metric", "week"]),
+                                     fill_value=0)
+        return self.cube
+
+    def get_data(self):
+        """
+        Returns the totals and per game values of the metrics with their
+        ranks per season, computed once.
+
+        :return: games, total_<metric>, <metric>_per_game and their ranks per player and team of the seasons,
+            the rows are the rows of the cube
+        :rtype: pandas.DataFrame
+        """
+        if self.table is None:
+            totals = self.get_cube().T.groupby(level="metric", sort=False).sum().T
+            games = totals["games"].where(totals["games"] > 0)
+            table = pd.concat([totals[["games"]], totals[self.metrics].add_prefix("total_"),
+                               totals[self.metrics].div(games, axis=0).add_suffix("_per_game")], axis=1)
+            table = table.reset_index()
+            indicators = [f"total_{metric}" for metric in self.metrics] + [f"{metric}_per_game"
+                                                                            for metric in self.metrics]
+            self.table = pd.concat([table, ranking.rank(table, indicators, keys=["year"])], axis=1)
+        return self.table
+
+    def get_leaders(self, metric, year, n=20, per_game=False):
+        """
+        Returns the leaderboard of a metric in a season.
+
+        :param metric: metric of the leaderboard
+        :type metric: str
+        :param year: season
+        :type year: int
+        :param n: number of players, ties at the last place are included
+        :type n: int
+        :param per_game: whether to rank the metric per game instead of the total
+        :type per_game: bool
+        :return: player, team, games, the total or per game metric and the metric per week of the season,
+            best player first
+        :rtype: pandas.DataFrame
+        """
+        indicator = f"{metric}_per_game" if per_game else f"total_{metric}"
+        table = self.get_data()
+        table = table.loc[(table["year"] == year) & (table[f"{indicator}_rank"] <= n)]
+        table = table.sort_values(by=indicator, ascending=False)
+
+        weeks = self.get_cube()[metric].iloc[table.index, :week_map[year]]
+        weeks.columns = [f"week_{week}" for week in weeks.columns]
+        return pd.concat([table[["player", "team", "games", indicator]].reset_index(drop=True),
+                          weeks.reset_index(drop=True)], axis=1)
+
+    def get_player(self, player, year):
+        """
+        Returns the totals, per game values and ranks of a player in a
+        season.
+
+        :param player: name of the player
+        :type player: str
+        :param year: season
+        :type year: int
+        :return: a row per team of the player
+        :rtype: pandas.DataFrame
+        """
+        table = self.get_data()
+        return table.loc[(table["player"] == player) & (table["year"] == year)]
@@ -1,3 +1,126 @@
+"""
+Ranks the players by many indicators in one pass.
+
+The rows are grouped by year, week and position, as far as the frame
+holds them, and all indicators are ranked within the groups at once.
+The ranks are returned as one wide frame with a rank column per
+indicator, aligned with the rows of the frame.
+
+The top-k mode ranks only the best k rows of every group. Instead of
+sorting each group, the k-th best value of every group is found by
+partial selection over a matrix of the groups and their rows, and only
+the rows reaching it, including ties at the k-th place, are ranked.
+Rows without a value are not ranked.
+"""
+import numpy as np
+import pandas as pd
+
+# columns grouping the rows, the ones in the frame are used
+KEYS = ["year", "week", "position"]
+
+# the lowest rank of tied rows, the mean rank of tied rows as pandas
+# ranks by default, the rank among the distinct values, and the min rank
+# as a share of the ranked rows of the group
+METHODS = ["min", "average", "dense", "percentile"]
+
+
+def rank(df, indicators, keys=KEYS, method="min", ascending=False, k=None):
+    """
+    Ranks the rows of a frame by the indicators within the groups of the
+    keys, the best row ranks first.
+
+    :param df: indicators per row
+    :type df: pandas.DataFrame
+    :param indicators: columns to rank
+    :type indicators: list of str
+    :param keys: columns grouping the rows, keys missing in the frame are ignored
+    :type keys: list of str
+    :param method: min, average, dense or percentile
+    :type method: str
+    :param ascending: whether the lowest value ranks first, e.g. for interceptions
+    :type ascending: bool
+    :param k: ranks only the best k rows of every group and indicator if set
+    :type k: int
+    :return: rank per row and indicator in the columns <indicator>_rank
+    :rtype: pandas.DataFrame
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method}, use one of {METHODS}.")
+
+    codes = get_groups(df, keys)
+    x = df[indicators].to_numpy(dtype=np.float64, na_value=np.nan)
+    if k is None:
+        ranks = pd.DataFrame(x).groupby(codes).rank(method="min" if method == "percentile" else method,
+                                                    ascending=ascending, pct=method == "percentile").to_numpy()
+    else:
+        ranks = rank_top(-x if ascending else x, codes, method, k)
+    return pd.DataFrame(ranks, index=df.index, columns=[f"{indicator}_rank" for indicator in indicators])
+
+
+def rank_top(x, codes, method, k):
+    """ Ranks the best k rows of every group in every column of a matrix
+    in descending order, the other rows get no rank. """
+    sizes = np.bincount(codes)
+    order = np.argsort(codes, kind="stable")
+    groups = codes[order]
+    # the place of every row within its group in the padded matrix of the groups, rows and columns
+    places = np.arange(len(codes)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    values = x[order]
+    valid = ~np.isnan(values)
+    padded = np.full((len(sizes), sizes.max(initial=0), x.shape[1]), np.inf)
+    padded[groups, places] = np.where(valid, -values, np.inf)
+
+    ranks = np.full(x.shape, np.nan)
+    width = min(k, padded.shape[1])
+    if width == 0:
+        return ranks
+    # the k-th best value of every group and column, groups with less values select all of them
+    thresholds = -np.partition(padded, width - 1, axis=1)[:, width - 1]
+    selected = valid & (values >= thresholds[groups])
+    for j in range(x.shape[1]):
+        rows = order[selected[:, j]]
+        counts = np.bincount(groups[valid[:, j]], minlength=len(sizes))
+        ranks[rows, j] = rank_selected(x[rows, j], codes[rows], method, counts)
+    return ranks
+
+
+def rank_selected(values, codes, method, counts):
+    """ Ranks the values within their groups in descending order, the
+    selection holds every value better than a selected one. """
+    order = np.lexsort((-values, codes))
+    values, groups = values[order], codes[order]
+    starts = np.r_[True, groups[1:] != groups[:-1]]
+    changes = starts | np.r_[True, values[1:] != values[:-1]]
+
+    places = np.arange(len(values))
+    if method == "dense":
+        distinct = np.cumsum(changes)
+        ranks = distinct - np.maximum.accumulate(np.where(starts, distinct, 0)) + 1
+    elif method == "average":
+        # the selection holds all rows tied with a selected one
+        runs = np.cumsum(changes) - 1
+        ranks = np.maximum.accumulate(np.where(changes, places, 0)) - np.maximum.accumulate(
+            np.where(starts, places, 0)) + 1 + (np.bincount(runs)[runs] - 1) / 2
+    else:
+        ranks = np.maximum.accumulate(np.where(changes, places, 0)) - np.maximum.accumulate(
+            np.where(starts, places, 0)) + 1
+        if method == "percentile":
+            ranks = ranks / counts[groups]
+
+    result = np.empty(len(values))
+    result[order] = ranks
+    return result
+
+
+def get_groups(df, keys):
+    """ Returns the group code of every row, the rows form one group
+    without keys in the frame. """
+    keys = [key for key in keys if key in df.columns]
+    if not keys:
+        return np.zeros(len(df), dtype=np.int64)
+    return df.groupby(keys, sort=False, observed=True, dropna=False).ngroup().to_numpy()
+
+
 def rank_statistic(df, indicator):
     """
     Sorts data regarding indicator and adds column with rank.
@@ -12,6 +135,3 @@ def rank_statistic(df, indicator):
     df = df.sort_values(by=indicator, ascending=False)
     df[f"{indicator}_rank"] = df[indicator].rank(ascending=False)
     return df
-
-
-
@@ -1,3 +1,146 @@
+"""
+Rates the efficiency of the players on whole frames of stats.
+
+Each metric is computed column-wise over all rows at once, rows with a
+zero denominator, e.g. a QB without attempts in a week, are masked and
+get no value instead of a branch per row. Stats missing in the frame,
+e.g. the passing stats of a RB, count as zero, so the weekly stats of
+all positions and seasons are rated in one call.
+
+The stats hold no routes run, the snaps of the features stand in for
+the routes, and no sack yards, which are only subtracted from the net
+yards of ANY/A if the frame holds them.
+"""
+import numpy as np
+import pandas as pd
+
+import src.metrics.scoring as scoring
+
+# bounds of each of the four components of the passer rating
+COMPONENT_MIN = 0.0
+COMPONENT_MAX = 2.375
+
+# yards lost by sacks, not part of the stats of FantasyPros
+SACK_YARDS = "sacked_yds"
+
+# stats counting as an opportunity of a player
+OPPORTUNITIES = ["passing_att", "rushing_att", "receiving_tgt"]
+
+# columns of a frame identifying the rows of the efficiency table
+KEYS = ["player_id", "player", "team", "position", "year", "week"]
+
+
+def get_passer_rating(df):
+    """
+    Calculates the rating of the passers as introduced in the early 1970s
+    by Don Smith, Seymour Siwoff and Don Weiss, each component is clamped
+    to [0, 2.375] as in the official formula.
+
+    :param df: passing stats per row
+    :type df: pandas.DataFrame
+    :return: passer rating per row, no value without attempts
+    :rtype: pandas.Series
+    """
+    cmp, att, yds, td, ints = get_columns(df, ["passing_cmp", "passing_att", "passing_yds", "passing_td",
+                                               "passing_int"])
+    components = np.column_stack([(divide(cmp, att) - 0.3) * 5, (divide(yds, att) - 3) * 0.25, divide(td, att) * 20,
+                                  COMPONENT_MAX - divide(ints, att) * 25])
+    rating = np.clip(components, COMPONENT_MIN, COMPONENT_MAX).sum(axis=1) / 6 * 100
+    return pd.Series(rating, index=df.index, name="passer_rating")
+
+
+def get_adjusted_net_yards_per_attempt(df):
+    """
+    Calculates the adjusted net yards per attempt (ANY/A) of the passers,
+    passing yards plus 20 per touchdown minus 45 per interception and the
+    sack yards per dropback.
+
+    :param df: passing stats per row
+    :type df: pandas.DataFrame
+    :return: ANY/A per row, no value without dropbacks
+    :rtype: pandas.Series
+    """
+    att, yds, td, ints, sacked, sack_yds = get_columns(df, ["passing_att", "passing_yds", "passing_td", "passing_int",
+                                                            "sacked", SACK_YARDS])
+    return pd.Series(divide(yds + 20 * td - 45 * ints - sack_yds, att + sacked), index=df.index, name="any_a")
+
+
+def get_yards_per_target(df):
+    """
+    Calculates the receiving yards per target.
+
+    :param df: receiving stats per row
+    :type df: pandas.DataFrame
+    :return: yards per target per row, no value without targets
+    :rtype: pandas.Series
+    """
+    yds, tgt = get_columns(df, ["receiving_yds", "receiving_tgt"])
+    return pd.Series(divide(yds, tgt), index=df.index, name="yards_per_target")
+
+
+def get_yards_per_snap(df):
+    """
+    Calculates the receiving yards per offensive snap, the snaps stand in
+    for the routes run.
+
+    :param df: receiving stats and snaps per row, see src.preprocessing.statistics.features
+    :type df: pandas.DataFrame
+    :return: yards per snap per row, no value without snaps
+    :rtype: pandas.Series
+    """
+    yds, snaps = get_columns(df, ["receiving_yds", "snaps"])
+    return pd.Series(divide(yds, snaps), index=df.index, name="yards_per_snap")
+
+
+def get_points_per_opportunity(df, scheme="standard"):
+    """
+    Calculates the fantasy points per opportunity, the passing attempts,
+    rushing attempts and targets.
+
+    :param df: stats per row, optionally with the position of the row
+    :type df: pandas.DataFrame
+    :param scheme: name of a scheme of src.config.scoring, a scheme or a compiled scheme
+    :type scheme: str or dict or src.metrics.scoring.Scoring
+    :return: points per opportunity per row, no value without opportunities
+    :rtype: pandas.Series
+    """
+    points = scoring.score(df, scheme).to_numpy()
+    opportunities = get_columns(df, OPPORTUNITIES).sum(axis=0)
+    return pd.Series(divide(points, opportunities), index=df.index, name="points_per_opportunity")
+
+
+def get_efficiency(df, scheme="standard"):
+    """
+    Rates the efficiency of every row of a frame, e.g. the weekly stats
+    of all positions and seasons.
+
+    :param df: stats per row
+    :type df: pandas.DataFrame
+    :param scheme: scheme of the fantasy points, see get_points_per_opportunity
+    :type scheme: str or dict or src.metrics.scoring.Scoring
+    :return: keys of the rows with their passer rating, ANY/A, yards per target, yards per snap if the frame holds
+        snaps, and points per opportunity
+    :rtype: pandas.DataFrame
+    """
+    metrics = [get_passer_rating(df), get_adjusted_net_yards_per_attempt(df), get_yards_per_target(df)]
+    if "snaps" in df.columns:
+        metrics.append(get_yards_per_snap(df))
+    metrics.append(get_points_per_opportunity(df, scheme))
+    return pd.concat([df[[key for key in KEYS if key in df.columns]], *metrics], axis=1)
+
+
+def get_columns(df, columns):
+    """ Returns the columns of a frame as float arrays, missing columns
+    and values are zero. """
+    return scoring.get_matrix(df, columns).T
+
+
+def divide(numerator, denominator):
+    """ Divides the arrays element-wise, the quotient is NaN where the
+    denominator is zero. """
+    return np.divide(numerator, denominator, out=np.full(len(numerator), np.nan), where=denominator != 0)
+
+
 def get_qb_rating(player):
     """
     Calculates the rating of a QB as introduced in the early 1970s by
@@ -5,17 +148,8 @@ def get_qb_rating(player):
 
     :param player: stats of QB
     :type player: pandas.Series
-    :return: QB rating
+    :return: QB rating, zero without attempts
     :rtype: float
     """
-    comp = player["passing_cmp"]
-    pass_yds = player["passing_yds"]
-    pass_td = player["passing_td"]
-    ints = player["passing_int"]
-    pass_att = player["passing_att"]
-
-    if not pass_att == 0:
-        return 100 / 6 * ((comp / pass_att - 0.3) / 0.2 + (pass_yds / pass_att - 3) / 4 + (pass_td / pass_att) / 0.05 +
-                          (0.095 - ints / pass_att) / 0.04)
-    else:
-        return 0
+    rating = get_passer_rating(player.to_frame().T).iloc[0]
+    return 0 if np.isnan(rating) else rating
@@ -1,51 +1,312 @@
+"""
+Scores the stats of the players with the scoring scheme of a league.
+
+A scheme, see src.config.scoring, is compiled once into a weight matrix
+of the stats and positions and a matrix of the bonuses and positions.
+A frame is scored with one matrix multiply of its stats with the weight
+matrix, and one of the reached bonus thresholds with the bonus matrix,
+taking the column of the position of each row. Stats missing in the
+frame, e.g. the passing stats of a RB, score no points. Positions
+without overrides and frames without positions score the default
+weights of the scheme.
+
+Several schemes, e.g. the leagues of a shop, are scored in one pass:
+their weight and bonus matrices are stacked side by side, so a frame is
+scored under all of them with one matrix multiply. The compiled schemes
+and the points of a frame are cached by the hash of the scheme. The
+points cached by score_leagues are kept as long as the frame lives, so
+frames are not to be changed in place after scoring.
+"""
+import functools
+import hashlib
+import json
+import weakref
+
+import numpy as np
+import pandas as pd
+
+import src.config.scoring as config
+
+
+class Scoring:
+    def __init__(self, scheme):
+        """
+        Compiles a scoring scheme.
+
+        :param scheme: points per stat, position overrides and bonuses, see src.config.scoring
+        :type scheme: dict
+        """
+        self.name = scheme.get("name")
+        self.hash = get_hash(scheme)
+        overrides = scheme.get("positions", dict())
+        bonuses = scheme.get("bonuses", list())
+
+        # the last column holds the default weights of positions without overrides
+        self.positions = list(overrides)
+        self.stats = sorted({stat for weights in [scheme["weights"], *overrides.values()] for stat in weights} |
+                            {bonus["stat"] for bonus in bonuses})
+        self.weights = np.zeros((len(self.stats), len(self.positions) + 1))
+        for j, position in enumerate(self.positions + [None]):
+            weights = {**scheme["weights"], **overrides.get(position, dict())}
+            for stat, points in weights.items():
+                self.weights[self.stats.index(stat), j] = points
+
+        self.bonus_stats = [self.stats.index(bonus["stat"]) for bonus in bonuses]
+        self.thresholds = np.array([bonus["threshold"] for bonus in bonuses], dtype=np.float64)
+        self.bonuses = np.zeros((len(bonuses), len(self.positions) + 1))
+        for i, bonus in enumerate(bonuses):
+            for j, position in enumerate(self.positions + [None]):
+                if bonus.get("positions") is None or position in bonus["positions"]:
+                    self.bonuses[i, j] = bonus["points"]
+
+    def score(self, df):
+        """
+        Scores the stats of a frame.
+
+        :param df: stats per row, optionally with the position of the row
+        :type df: pandas.DataFrame
+        :return: fantasy points per row
+        :rtype: pandas.Series
+        """
+        points = self.score_positions(get_matrix(df, self.stats))
+        return pd.Series(points[np.arange(len(df)), self.get_columns(df)], index=df.index, name="fantasy_points")
+
+    def score_positions(self, x):
+        """ Returns the points of the rows of a stats matrix for every
+        position column. """
+        points = x @ self.weights
+        if len(self.thresholds):
+            points += (x[:, self.bonus_stats] >= self.thresholds) @ self.bonuses
+        return points
+
+    def get_columns(self, df):
+        """ Returns the weight column of the position of every row. """
+        if "position" not in df.columns or not self.positions:
+            return np.full(len(df), len(self.positions))
+        codes = pd.Categorical(df["position"].astype(object), categories=self.positions).codes.astype(np.int64)
+        return np.where(codes < 0, len(self.positions), codes)
+
+
+class Batch:
+    def __init__(self, df, results=None):
+        """
+        Scores a frame under several schemes.
+
+        :param df: stats per row, optionally with the position, year and week of the row
+        :type df: pandas.DataFrame
+        :param results: points of the frame by scheme hash scored before, shared with the batch
+        :type results: dict
+        """
+        self.df = df
+        # the distinct positions of the rows, rows without a position take the last one
+        codes, positions = pd.factorize(df["position"].astype(object) if "position" in df.columns else
+                                        pd.Series(np.nan, index=df.index))
+        self.positions = list(positions) + [None]
+        self.codes = np.where(codes < 0, len(positions), codes)
+        self.stats = list()
+        self.x = np.zeros((len(df), 0))
+        # points per row by the hash of the scheme
+        self.results = dict() if results is None else results
+
+    def score(self, schemes):
+        """
+        Scores the frame under the schemes, the schemes not scored
+        before are scored in one pass.
+
+        :param schemes: schemes, see src.config.scoring, or their names
+        :type schemes: list of str or dict or Scoring
+        :return: points per row and scheme, the columns are the names of the schemes or their hashes
+        :rtype: pandas.DataFrame
+        """
+        compiled = [get_compiled(scheme) for scheme in schemes]
+        pending = list({scoring.hash: scoring for scoring in compiled if scoring.hash not in self.results}.values())
+        if pending:
+            points = self.score_pending(pending)
+            for j, scoring in enumerate(pending):
+                self.results[scoring.hash] = points[:, j]
+
+        columns = [scoring.name or scoring.hash for scoring in compiled]
+        return pd.DataFrame(np.column_stack([self.results[scoring.hash] for scoring in compiled]),
+                            index=self.df.index, columns=columns)
+
+    def score_pending(self, compiled):
+        """ Scores the frame under the stacked weight and bonus matrices
+        of the schemes, returns the points per row and scheme. """
+        stats = sorted({stat for scoring in compiled for stat in scoring.stats})
+        x = self.get_matrix(stats)
+        index = {stat: i for i, stat in enumerate(stats)}
+
+        widths = [scoring.weights.shape[1] for scoring in compiled]
+        offsets = np.cumsum([0] + widths[:-1])
+        weights = np.zeros((len(stats), sum(widths)))
+        bonuses = np.zeros((sum(len(scoring.thresholds) for scoring in compiled), sum(widths)))
+        bonus_stats, thresholds = list(), list()
+        for scoring, offset, width in zip(compiled, offsets, widths):
+            weights[[index[stat] for stat in scoring.stats], offset:offset + width] = scoring.weights
+            bonuses[len(thresholds):len(thresholds) + len(scoring.thresholds), offset:offset + width] = scoring.bonuses
+            bonus_stats += [index[scoring.stats[i]] for i in scoring.bonus_stats]
+            thresholds += scoring.thresholds.tolist()
+
+        points = x @ weights
+        if thresholds:
+            points += (x[:, bonus_stats] >= np.array(thresholds)) @ bonuses
+        # the weight column of each position per scheme, taken by the position codes of the rows
+        lookup = np.column_stack([offset + scoring.get_columns(pd.DataFrame({"position": self.positions}))
+                                  for scoring, offset in zip(compiled, offsets)])
+        return np.take_along_axis(points, lookup[self.codes], axis=1)
+
+    def get_matrix(self, stats):
+        """ Returns the stats matrix of the frame, only the stats not
+        loaded before are taken from the frame. """
+        missing = [stat for stat in stats if stat not in self.stats]
+        if missing:
+            self.x = np.hstack([self.x, get_matrix(self.df, missing)])
+            self.stats += missing
+        return self.x[:, [self.stats.index(stat) for stat in stats]]
+
+    def rank(self, points):
+        """
+        Ranks the points per position and, if in the frame, per year and
+        week, the best player ranks first.
+
+        :param points: points per row and scheme
+        :type points: pandas.DataFrame
+        :return: ranks per row and scheme
+        :rtype: pandas.DataFrame
+        """
+        keys = [self.df[key] for key in ["position", "year", "week"] if key in self.df.columns]
+        if not keys:
+            return points.rank(ascending=False, method="min")
+        return points.groupby(keys, observed=True, sort=False).rank(ascending=False, method="min")
+
+
+def get_matrix(df, stats):
+    """
+    Returns the stats of the frame as a float matrix, stats missing in
+    the frame or the rows are zero.
+
+    :param df: stats per row
+    :type df: pandas.DataFrame
+    :param stats: columns of the matrix
+    :type stats: list of str
+    :return: matrix of the rows and stats
+    :rtype: numpy.ndarray
+    """
+    return df.reindex(columns=stats).to_numpy(dtype=np.float64, na_value=0.0)
+
+
+@functools.lru_cache(maxsize=None)
+def get_scoring(name):
+    """ Returns the compiled scoring scheme of src.config.scoring with
+    the name. """
+    return Scoring(config.schemes[name])
+
+
+# compiled schemes by their hash
+compiled_schemes = dict()
+
+
+def get_compiled(scheme):
+    """
+    Returns the compiled scheme, compiles each scheme only once.
+
+    :param scheme: name of a scheme of src.config.scoring, a scheme or a compiled scheme
+    :type scheme: str or dict or Scoring
+    :return: compiled scheme
+    :rtype: Scoring
+    """
+    if isinstance(scheme, Scoring):
+        return scheme
+    if isinstance(scheme, str):
+        return get_scoring(scheme)
+    key = get_hash(scheme)
+    if key not in compiled_schemes:
+        compiled_schemes[key] = Scoring(scheme)
+    return compiled_schemes[key]
+
+
+def get_hash(scheme):
+    """ Returns the hash of the content of a scheme. """
+    return hashlib.sha1(json.dumps(scheme, sort_keys=True).encode()).hexdigest()
+
+
+# points of the frames scored by score_leagues by the identity of the
+# frame, dropped with the frame
+points_cache = dict()
+
+
+def get_results(df):
+    """ Returns the points of the frame by scheme hash scored before. """
+    key = id(df)
+    if key not in points_cache:
+        points_cache[key] = dict()
+        weakref.finalize(df, points_cache.pop, key, None)
+    return points_cache[key]
+
+
+def score_leagues(df, schemes):
+    """
+    Scores a frame under the schemes of several leagues in one pass and
+    ranks the players per position. Schemes the frame was scored under
+    before are not scored again.
+
+    :param df: stats per row, optionally with the position, year and week of the row
+    :type df: pandas.DataFrame
+    :param schemes: schemes, see src.config.scoring, or their names
+    :type schemes: list of str or dict or Scoring
+    :return: points and ranks per row and scheme
+    :rtype: tuple of pandas.DataFrame
+    """
+    batch = Batch(df, get_results(df))
+    points = batch.score(schemes)
+    return points, batch.rank(points)
+
+
+def score(df, scheme="standard"):
+    """
+    Scores the stats of a frame with a scoring scheme.
+
+    :param df: stats per row, optionally with the position of the row
+    :type df: pandas.DataFrame
+    :param scheme: name of a scheme of src.config.scoring, a scheme or a compiled scheme
+    :type scheme: str or dict or Scoring
+    :return: fantasy points per row
+    :rtype: pandas.Series
+    """
+    return get_compiled(scheme).score(df)
+
+
 def calculate_standard_fantasy_points(player):
     """
     Calculates fantasy points with standard scoring scheme.
 
-    :param player: stats of QB
+    :param player: stats of a player
     :type player: pandas.Series
     :return: standard fantasy points
     :rtype: float
     """
-    if player["position"] == "QB":
-        return 6 * player["rushing_td"] + 0.1 * player["rushing_yds"] + 4 * player["passing_td"] + 1 / 25 * player[
-            "passing_yds"] + (-1) * player["passing_int"] + (-2) * player["lst"]
-    elif player["position"] == "RB" or player["position"] == "TE" or player["position"] == "WR":
-        return 6 * (player["rushing_td"] + player["receiving_td"]) + 0.1 * (
-                player["rushing_yds"] + player["receiving_yds"]) + (-2) * player["lst"]
+    return score(player.to_frame().T, "standard").iloc[0]
 
 
 def calculate_halfppr_fantasy_points(player):
     """
     Calculates fantasy points with half-PPR scoring scheme.
 
-    :param player: stats of QB
+    :param player: stats of a player
     :type player: pandas.Series
     :return: half-PPR fantasy points
     :rtype: float
     """
-    if player["position"] == "QB":
-        return 6 * player["rushing_td"] + 0.1 * player["rushing_yds"] + 4 * player["passing_td"] + 1 / 25 * player[
-            "passing_yds"] + (-1) * player["passing_int"] + (-2) * player["lst"]
-    elif player["position"] == "RB" or player["position"] == "TE" or player["position"] == "WR":
-        return 6 * (player["rushing_td"] + player["receiving_td"]) + 0.1 * (
-                player["rushing_yds"] + player["receiving_yds"]) + 0.5 * player["receiving_rec"] + (-2) * player[
-                   "lst"]
+    return score(player.to_frame().T, "halfppr").iloc[0]
 
 
 def calculate_ppr_fantasy_points(player):
     """
     Calculates fantasy points with PPR scoring scheme.
 
-    :param player: stats of QB
+    :param player: stats of a player
     :type player: pandas.Series
     :return: PPR fantasy points
     :rtype: float
     """
-    if player["position"] == "QB":
-        return 6 * player["rushing_td"] + 0.1 * player["rushing_yds"] + 4 * player["passing_td"] + 1 / 25 * player[
-            "passing_yds"] + (-1) * player["passing_int"] + (-2) * player["lst"]
-    elif player["position"] == "RB" or player["position"] == "TE" or player["position"] == "WR":
-        return 6 * (player["rushing_td"] + player["receiving_td"]) + 0.1 * (
-                player["rushing_yds"] + player["receiving_yds"]) + 1.0 * player["receiving_rec"] + (-2) * player[
-                   "lst"]
+    return score(player.to_frame().T, "ppr").iloc[0]
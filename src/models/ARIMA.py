@@ -31,7 +31,8 @@ from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 
 from pmdarima.arima import auto_arima
 
-from src.preprocessing.statistics.statistics import Statistics
+import src.metrics.scoring as scoring
+from src.preprocessing.statistics.features import get_features
 
 SHOW_PLOT = True
 
@@ -93,16 +94,6 @@ def predict_performance(df_train, selector, n_samples):
     return stepwise_model.predict(n_periods=n_samples)
 
 
-def calculate_fantasy_points(series):
-    pass_yds = series["passing_yds"]
-    pass_int = series["passing_int"]
-    pass_td = series["passing_td"]
-    rush_yds = series["rushing_yds"]
-    rush_td = series["rushing_td"]
-    fumbles_lost = series["lst"]
-    return 1 / 25 * pass_yds + (-1) * pass_int + 4 * pass_td + 0.1 * rush_yds + 6 * rush_td + (-2) * fumbles_lost
-
-
 if __name__ == "__main__":
     # define selector and player (here for QB)
     selectors = ["passing_yds", "passing_int", "passing_td", "rushing_yds", "rushing_td", "lst"]
@@ -110,13 +101,12 @@ if __name__ == "__main__":
     position = "QB"
     year_to_pred = 2021
 
-    # load weekly stats for given year range
-    df = pd.DataFrame()
-    for year in range(2010, year_to_pred + 1):
-        df = pd.concat([df, Statistics(position, year).get_accumulated_data()])
+    # load weekly stats of the player for given year range
+    df = get_features(range(2010, year_to_pred + 1), columns=selectors + ["games"], positions=[position],
+                      players=[player]).reset_index()
 
     # get stats where player played
-    df_player = df.loc[(df["player"] == player) & (df["games"] != 0)].reset_index(drop=True)
+    df_player = df.loc[df["games"] != 0].reset_index(drop=True)
 
     # get prediction for each performance metric
     df_pred = pd.DataFrame(np.nan, index=selectors, columns=["actual", "predicted"])
@@ -139,6 +129,5 @@ if __name__ == "__main__":
         df_pred.loc[selector, "actual"] = df_test[selector].sum()
         df_pred.loc[selector, "predicted"] = df_test[f"{selector}_pred"].sum()
 
-    # calculate fantasy points
-    print(calculate_fantasy_points(df_pred.loc[:, "actual"]))
-    print(calculate_fantasy_points(df_pred.loc[:, "predicted"]))
+    # calculate fantasy points of the actual and predicted stats
+    print(scoring.score(df_pred.T.assign(position=position)))
@@ -1,5 +1,4 @@
 import numpy as np
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
@@ -9,7 +8,7 @@ from sklearn.svm import SVR
 from sklearn.metrics import mean_squared_error
 from sklearn.pipeline import Pipeline
 
-from src.preprocessing.statistics.statistics import Statistics
+from src.preprocessing.statistics.features import get_features
 
 if __name__ == "__main__":
     # specify requirements
@@ -17,13 +16,11 @@ if __name__ == "__main__":
     position = "QB"
     year_to_pred = 2021
 
-    # load all present data
-    df = pd.DataFrame()
-    for year in range(2009, year_to_pred + 1):
-        df = pd.concat([df, Statistics(position, year).get_accumulated_data()])
+    # load all present features of the player, seasons before 2016 have no snapcounts
+    df = get_features(range(2009, year_to_pred + 1), positions=[position], players=[player]).reset_index()
+    df = df.dropna(axis=1)
 
     # clean
-    df = df.loc[df["player"] == player].reset_index(drop=True)
     df.drop(["player", "position", "games", "team", "week"], axis=1, inplace=True)
 
     # make categorical data numeric
@@ -0,0 +1,111 @@
+"""
+Builds summaries concurrently on a process pool.
+
+The summaries, e.g. the stats of a position and season, are independent
+of each other apart from their dependencies, e.g. the statistics are
+built from the stats and defense summaries. A summary is submitted as
+soon as the summaries it depends on are stored. Dependencies stored in
+the same build are loaded from their files instead of being accumulated
+again.
+
+The workers write the summaries atomically, only the main process
+reads and records them in the manifest. The team aliases the workers
+could not map are reported once at the end of the build. Incrementally, the main process
+determines the changed weeks of the stored weekly summaries and the
+workers only load these weeks.
+"""
+import collections
+import concurrent.futures
+import os
+import time
+
+import src.utils.cleaner as cleaner
+import src.utils.manifest as manifest
+
+# number of summaries built concurrently
+WORKERS = os.cpu_count() or 1
+
+
+def build(tasks, workers=WORKERS, incremental=False):
+    """
+    Builds and stores the summaries in order of their dependencies.
+
+    :param tasks: summaries to build
+    :type tasks: list of Preprocessing
+    :param workers: number of processes, builds in the main process for one
+    :type workers: int
+    :param incremental: updates stored weekly summaries only by their changed weeks
+    :type incremental: bool
+    :return: paths of the built and failed summaries, seconds per summary, the elapsed time and the unknown
+        team aliases with their number of rows
+    :rtype: dict
+    """
+    pending = {task.get_path(): task for task in tasks}
+    dependencies = {path: {dependency.get_path() for dependency in task.get_dependencies()} & pending.keys()
+                    for path, task in pending.items()}
+    summary = {"built": list(), "failed": list(), "timings": dict(), "seconds": 0.0,
+               "unknown": collections.Counter()}
+
+    start = time.perf_counter()
+    with get_executor(workers) as executor:
+        running = dict()
+        while pending or running:
+            for path, task in list(pending.items()):
+                if dependencies[path] & set(summary["failed"]):
+                    print(f"{path} skipped: dependency failed")
+                    summary["failed"].append(path)
+                    del pending[path]
+                elif dependencies[path] <= set(summary["built"]):
+                    for dependency in task.get_dependencies():
+                        if dependency.get_path() in dependencies[path]:
+                            dependency.refresh = False
+                    # the manifest is only read by the main process
+                    weeks = task.get_changed_weeks() if incremental else None
+                    running[executor.submit(store, task, weeks)] = task
+                    del pending[path]
+
+            if not running:
+                if pending:
+                    raise ValueError(f"circular dependencies between {', '.join(pending)}")
+                break
+
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                path = task.get_path()
+                try:
+                    rows, seconds, unknown = future.result()
+                except (Exception, SystemExit) as e:
+                    print(f"{path} failed: {e}")
+                    summary["failed"].append(path)
+                    continue
+                manifest.get_manifest().record_build(path, task.get_sources())
+                summary["built"].append(path)
+                summary["timings"][path] = seconds
+                summary["unknown"].update(unknown)
+                print(f"{path:<64}{rows:>8} rows{seconds:>8.2f} s")
+    manifest.save()
+    summary["seconds"] = time.perf_counter() - start
+
+    print(f"built {len(summary['built'])}, failed {len(summary['failed'])} summaries in {summary['seconds']:.1f} s "
+          f"({sum(summary['timings'].values()):.1f} s of work on {workers} workers)")
+    if summary["unknown"]:
+        print("unknown team aliases: " + ", ".join(f"{alias} ({rows} rows)"
+                                                    for alias, rows in summary["unknown"].most_common()))
+    return summary
+
+
+def store(task, weeks=None):
+    """ Stores a summary without recording it, runs in the worker.
+    Returns the team aliases not found while building it. """
+    start = time.perf_counter()
+    before = cleaner.get_unknown_aliases()
+    df = task.store_accumulated_data(record=False, weeks=weeks)
+    return len(df), time.perf_counter() - start, cleaner.get_unknown_aliases() - before
+
+
+def get_executor(workers):
+    if workers > 1:
+        return concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    # a single worker runs the tasks one after another in the main process
+    return concurrent.futures.ThreadPoolExecutor(max_workers=1)
@@ -7,9 +7,43 @@ for a whole season.
 Refreshing means, that it will, regardless if the file already
 exists, accumulate the stats again. However, this does not mean that
 the stats itself are refreshed.
+
+Every stored summary is recorded in the manifest together with the
+sources it was built from, so an update only rebuilds the summaries
+whose sources changed.
+
+The summaries are stored as csv or as typed parquet files, which keep
+the types of the columns and describe the summary in their schema
+metadata. Parquet files are read column by column and skip the rows of
+other weeks and players without parsing them. Stored csv summaries are
+migrated one-way the first time they are loaded as parquet.
+
+Summaries of weekly data can be updated incrementally: only the weeks
+missing in the stored summary and the weeks whose sources changed since
+it was built, e.g. a corrected past week, are loaded and replace their
+rows in the stored summary.
+
+In compact mode, see src.utils.compact, the summaries are returned with
+categorical keys and downcast stats.
 """
+import json
 import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import src.utils.accumulator as accumulator
+import src.utils.compact as compact
+import src.utils.manifest as manifest
+import src.utils.storage as storage
+
+from src.config.mapping import week_map
+
+# format of the stored summaries, either "csv" or "parquet"
+FORMAT = "csv"
+
+# key of the summary description in the parquet schema metadata
+METADATA = b"summary"
 
 
 class Preprocessing:
@@ -18,26 +52,214 @@ class Preprocessing:
         self.refresh = refresh
         self.filename = str()
         self.dir = str()
+        # the summary accumulates weekly data and can be updated week by week
+        self.weekly = False
 
     def concat_data(self):
         raise NotImplementedError
 
-    def get_accumulated_data(self):
-        """ Returns the accumulated weekly data. """
-        if not os.path.exists(os.path.join(self.dir, self.filename)) or self.refresh:
+    def load_week(self, week):
+        """ Returns the data of a week of the summary. """
+        raise NotImplementedError
+
+    def get_weeks(self):
+        return range(1, week_map[self.year] + 1)
+
+    def get_week_sources(self, week):
+        """ Returns the paths of the stored data a week of the summary
+        is built from. """
+        raise NotImplementedError
+
+    def get_sources(self):
+        """ Returns the paths of the stored data the summary is built
+        from, by default of all weeks. """
+        return [source for week in self.get_weeks() for source in self.get_week_sources(week)]
+
+    def get_dependencies(self):
+        """ Returns the summaries the summary is built from, they have
+        to be stored before. """
+        return list()
+
+    def get_path(self):
+        """ Returns the path of the stored summary in the selected
+        format. """
+        path = os.path.join(self.dir, self.filename)
+        if FORMAT == "parquet":
+            return storage.get_parquet_path(path)
+        return path
+
+    def get_accumulated_data(self, columns=None, weeks=None, players=None):
+        """
+        Returns the accumulated weekly data.
+
+        :param columns: columns to return, defaults to all
+        :type columns: list of str
+        :param weeks: weeks to return, defaults to all
+        :type weeks: list of int
+        :param players: players to return, defaults to all
+        :type players: list of str
+        :return: accumulated data
+        :rtype: pandas.DataFrame
+        """
+        if FORMAT == "parquet" and not self.refresh:
+            self.migrate()
+
+        if not os.path.exists(self.get_path()) or self.refresh:
             # accumulate data
-            return self.concat_data()
+            df = select(self.concat_data(), columns, weeks, players)
         else:
             # load stored data
-            return self.load_accumulated_data()
+            df = self.load_accumulated_data(columns, weeks, players)
+        return compact.compact(df)
+
+    def load_accumulated_data(self, columns=None, weeks=None, players=None):
+        """ Loads the stored summary, only the given columns and the
+        rows of the given weeks and players. """
+        if FORMAT == "parquet":
+            filters = list()
+            if weeks is not None:
+                filters.append(("week", "in", list(weeks)))
+            if players is not None:
+                filters.append(("player", "in", list(players)))
+            df = pd.read_parquet(self.get_path(), columns=columns, filters=filters or None)
+            return df.reset_index(drop=True)
+
+        usecols = None
+        if columns is not None:
+            # the columns filtered on are read as well
+            usecols = set(columns)
+            if weeks is not None:
+                usecols.add("week")
+            if players is not None:
+                usecols.add("player")
+        return select(pd.read_csv(self.get_path(), usecols=usecols), columns, weeks, players)
+
+    def store_accumulated_data(self, record=True, weeks=None):
+        """ Stores the accumulated weekly data and records it in the
+        manifest. The file is replaced at once, so readers never see a
+        partially written summary. If weeks are given, only these weeks
+        of the stored summary are updated, see get_changed_weeks. """
+        os.makedirs(os.path.join(os.getcwd(), self.dir), exist_ok=True)
+        if weeks is not None:
+            df = self.update_accumulated_data(weeks)
+            if weeks:
+                self.write(df)
+        else:
+            df = self.get_accumulated_data()
+            self.write(df)
+        if record:
+            manifest.get_manifest().record_build(self.get_path(), self.get_sources())
+        return df
+
+    def get_changed_weeks(self):
+        """
+        Returns the weeks that are missing in the stored summary or
+        whose sources changed since the summary was built. Weeks whose
+        sources are not stored yet are skipped.
+
+        :return: changed weeks, None if the summary is not stored or not weekly
+        :rtype: list of int
+        """
+        if not self.weekly or not os.path.exists(self.get_path()):
+            return None
+
+        m = manifest.get_manifest()
+        stored = set(self.load_accumulated_data(columns=["week"])["week"].unique())
+        entry = m.get(self.get_path()) or dict()
+        recorded = entry.get("sources") or dict()
+
+        weeks = list()
+        for week in self.get_weeks():
+            sources = self.get_week_sources(week)
+            if not all(manifest.is_stored(source) for source in sources):
+                continue
+            if week not in stored or any(m.get_hash(source) != recorded.get(os.path.normpath(source))
+                                         for source in sources):
+                weeks.append(week)
+        return weeks
+
+    def update_accumulated_data(self, weeks):
+        """
+        Replaces the rows of the weeks in the stored summary by the
+        reloaded weeks.
+
+        :param weeks: weeks to reload
+        :type weeks: list of int
+        :return: updated summary
+        :rtype: pandas.DataFrame
+        """
+        stored = self.load_accumulated_data()
+        if not weeks:
+            return stored
+
+        frames = [stored.loc[~stored["week"].isin(weeks)]]
+        frames.extend(accumulator.iterate(self.load_week, [(week,) for week in weeks]))
+        df = accumulator.concat(frames)
+        return df.sort_values("week", kind="stable").reset_index(drop=True)
+
+    def write(self, df):
+        path = self.get_path()
+        if FORMAT == "parquet":
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = dict(table.schema.metadata or dict())
+            metadata[METADATA] = json.dumps(self.describe(df)).encode("utf-8")
+            pq.write_table(table.replace_schema_metadata(metadata), path + ".tmp")
+        else:
+            df.to_csv(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+
+    def describe(self, df):
+        """ Returns the description of the summary stored in the schema
+        metadata. """
+        return {"summary": type(self).__name__, "year": self.year, "rows": len(df),
+                "types": {str(column): str(dtype) for column, dtype in df.dtypes.items()}}
+
+    def get_schema(self):
+        """
+        Returns the description of the stored parquet summary without
+        reading its data.
+
+        :return: name of the summary class, year, number of rows and types of the columns
+        :rtype: dict
+        """
+        metadata = pq.read_schema(self.get_path()).metadata or dict()
+        return json.loads(metadata[METADATA]) if METADATA in metadata else None
+
+    def migrate(self):
+        """ Converts the stored csv summary to parquet once, the csv file
+        is kept. """
+        path = os.path.join(self.dir, self.filename)
+        if not os.path.exists(self.get_path()) and os.path.exists(path):
+            self.write(pd.read_csv(path))
+
+    def is_outdated(self):
+        """ Checks if the stored summary is missing or one of its
+        sources changed since it was built. """
+        return manifest.get_manifest().is_outdated(self.get_path(), self.get_sources())
 
-    def load_accumulated_data(self):
-        """ Loads the stored csv file. """
-        return pd.read_csv(os.path.join(self.dir, self.filename))
 
-    def store_accumulated_data(self):
-        """ Stores the accumulated weekly data. """
-        if not os.path.exists(self.dir):
-            os.makedirs(os.path.join(os.getcwd(), self.dir))
-        self.get_accumulated_data().to_csv(os.path.join(self.dir, self.filename), index=False)
+def select(df, columns=None, weeks=None, players=None):
+    """
+    Selects the rows of the weeks and players and the columns of the
+    summary.
 
+    :param df: summary
+    :type df: pandas.DataFrame
+    :param columns: columns to select, defaults to all
+    :type columns: list of str
+    :param weeks: weeks to select, defaults to all
+    :type weeks: list of int
+    :param players: players to select, defaults to all
+    :type players: list of str
+    :return: selection
+    :rtype: pandas.DataFrame
+    """
+    if weeks is not None:
+        df = df.loc[df["week"].isin(list(weeks))]
+    if players is not None:
+        df = df.loc[df["player"].isin(list(players))]
+    if columns is not None:
+        df = df.loc[:, list(columns)]
+    if weeks is not None or players is not None:
+        df = df.reset_index(drop=True)
+    return df
@@ -0,0 +1,101 @@
+"""
+Reconciles the yearly stats and snapcounts derived from the weekly
+partitions with the season pages fetched from FantasyPros.
+
+The rates on the season pages are rounded to one decimal, the snap
+shares and snaps per game to integers, and the derived snap shares are
+averaged over weekly shares rounded to integers, so these columns are
+compared with a tolerance. The season pages count games without
+offensive snaps, which the weekly snapcounts do not list, so the games,
+snaps per game and snap share of these players differ. Players whose
+keys are not unique on one side, e.g. two tight ends named Zach Miller,
+are not compared.
+
+Running this script prints the report of all seasons.
+"""
+import pandas as pd
+
+import src.config.fantasypros as fp_mapping
+import src.loader.statistics as loader
+
+from src.config.mapping import week_map
+
+POSITIONS = ["QB", "RB", "TE", "WR"]
+
+# keys identifying a player on the season pages
+KEYS = {"stats": ["player", "team"], "snapcounts": ["player", "position"]}
+
+# differences tolerated per column, the rounding of the season pages
+TOLERANCE = 0.01
+TOLERANCES = {**{column: 0.05 for column in fp_mapping.yearly_rates},
+              **{column: 1.0 for column in fp_mapping.yearly_shares},
+              "snaps_per_game": 0.5, "snaps_pct": 1.0}
+
+
+def reconcile(years=week_map.keys()):
+    """
+    Compares the derived yearly stats and snapcounts with the fetched
+    season pages column by column.
+
+    :param years: seasons
+    :type years: list of int
+    :return: kind, position, year and column with the number of compared and mismatched rows and the maximum
+        difference, the players row counts the players compared and the players missing on one side
+    :rtype: pandas.DataFrame
+    """
+    reports = list()
+    for year in years:
+        for position in POSITIONS:
+            reports.append(compare(loader.derive_yearly_stats(position, year), loader.get_yearly_stats(position, year),
+                                   "stats", position, year))
+        if year >= 2016:
+            reports.append(compare(loader.derive_yearly_snapcounts(year), loader.get_yearly_snapcounts(year),
+                                   "snapcounts", None, year))
+    return pd.concat(reports, ignore_index=True)
+
+
+def compare(derived, scraped, kind, position, year):
+    """
+    Compares a derived yearly table with the fetched season page.
+
+    :param derived: yearly table derived from the weekly partitions
+    :type derived: pandas.DataFrame
+    :param scraped: yearly table of the season page
+    :type scraped: pandas.DataFrame
+    :param kind: stats or snapcounts
+    :type kind: str
+    :param position: position of the stats
+    :type position: str
+    :param year: season
+    :type year: int
+    :return: report of the table, see reconcile
+    :rtype: pandas.DataFrame
+    """
+    keys = KEYS[kind]
+    derived = derived.astype({key: object for key in keys})
+    scraped = scraped.astype({key: object for key in keys})
+    df = pd.merge(derived.drop_duplicates(keys, keep=False), scraped.drop_duplicates(keys, keep=False), on=keys,
+                  suffixes=("_derived", "_scraped"))
+    missing = len(derived) + len(scraped) - 2 * len(df)
+
+    rows = [("players", len(df), missing, float("nan"))]
+    for column in derived.columns:
+        if column in keys or column in ["team", "position", "year"]:
+            continue
+        difference = (df[f"{column}_derived"] - df[f"{column}_scraped"]).abs()
+        mismatched = int((difference > TOLERANCES.get(column, TOLERANCE) + 1e-9).sum())
+        rows.append((column, len(df), mismatched, difference.max()))
+
+    report = pd.DataFrame(rows, columns=["column", "compared", "mismatched", "max_difference"])
+    report.insert(0, "year", year)
+    report.insert(0, "position", position)
+    report.insert(0, "kind", kind)
+    return report
+
+
+if __name__ == "__main__":
+    df = reconcile()
+    summary = df.groupby(["kind", "column"], sort=False).agg({"compared": "sum", "mismatched": "sum",
+                                                              "max_difference": "max"})
+    summary["share"] = summary["mismatched"] / summary["compared"]
+    print(summary.to_string(float_format="{:.3f}".format))
@@ -0,0 +1,452 @@
+"""
+Implements the player registry.
+
+Players are identified by their names in the raw data, which are
+neither unique, e.g. two receivers named Steve Smith played in 2009,
+nor spelled the same in every source, e.g. Todd Gurley and Todd Gurley
+II. The registry assigns every player a stable integer ID and stores
+the name variants of the player and the team and position of the
+player in every week.
+
+The IDs are assigned going through the weeks in order. A name seen
+before is assigned to the player of this name who most recently played
+for the same team, or else on the same position in the last GAP
+seasons. Otherwise, or if that player already has a record in the week,
+a new player is registered.
+The rosters in raw/players are the backbone, names of the weekly stats,
+snapcounts and projections missing in the rosters are registered the
+same way. IDs are never reassigned, an update only registers the
+records not registered yet.
+
+Names are resolved to IDs by merges on normalized names, i.e. lower
+case without punctuation and suffixes like Jr. or II, or on their
+abbreviations, e.g. A.Rodgers in the play-by-play data. A name of
+several players is resolved by the team, position and season of the
+player.
+
+The play-by-play names are resolved within blocks of the players of a
+team and season with the same initial: an exact match first, else the
+most similar name of the block if it is similar enough and no other
+name is as similar. The names of a season are resolved once and the
+mapping is stored, it is resolved again if the play-by-play data or
+the registry changed.
+
+Running this script will update the registry.
+"""
+import difflib
+import os
+
+import numpy as np
+import pandas as pd
+
+import src.loader.playbyplay as pbp
+import src.loader.players as players
+import src.loader.statistics as loader
+import src.utils.accumulator as accumulator
+import src.utils.manifest as manifest
+import src.utils.storage as storage
+
+from src.config.mapping import week_map
+
+DIR = "../preprocessed/registry"
+
+POSITIONS = ["QB", "RB", "TE", "WR"]
+
+# suffixes dropped from the normalized names
+SUFFIXES = ["jr", "sr", "ii", "iii", "iv", "v"]
+
+# columns of the records registered
+RECORD = ["player", "team", "position", "year", "week"]
+
+# columns and types of the stored tables
+PLAYERS = {"player_id": "int64", "player": "object", "position": "object"}
+VARIANTS = {"player_id": "int64", "name": "object"}
+HISTORY = {"player_id": "int64", "key": "object", "team": "object", "position": "object", "year": "int64",
+           "week": "int64"}
+
+# seasons a player may miss and still keep the ID when changing the team
+GAP = 1
+
+# contexts narrowing down the players of a name, from the most to the least specific
+CONTEXTS = [["team", "year", "week"], ["team", "year"], ["position", "year"], ["year"]]
+
+# minimum similarity of an approximate name match
+CUTOFF = 0.8
+
+# columns of the play-by-play data holding player names
+PLAYBYPLAY = ["passer_player_name", "receiver_player_name", "rusher_player_name"]
+
+
+class Registry:
+    def __init__(self, path):
+        self.dir = path
+        self.players = load(os.path.join(path, "players.csv"), PLAYERS)
+        self.variants = load(os.path.join(path, "variants.csv"), VARIANTS)
+        self.history = load(os.path.join(path, "history.csv"), HISTORY)
+        self.keys = None
+        self.blocks = None
+
+    def register(self, records):
+        """
+        Registers the records not registered yet, names seen before
+        are assigned to the IDs of their players, new players get new
+        IDs.
+
+        :param records: player, team, position, year and week of the players
+        :type records: pandas.DataFrame
+        :return: number of players registered
+        :rtype: int
+        """
+        records = records.loc[records["player"].notna(), RECORD].astype({"player": object, "team": object,
+                                                                        "position": object})
+        records["key"] = normalize(records["player"])
+        records = records.drop_duplicates(["key", "team", "year", "week"])
+        registered = self.history[["key", "team", "year", "week"]].drop_duplicates()
+        records = records.merge(registered, how="left", on=["key", "team", "year", "week"], indicator=True)
+        records = records.loc[records["_merge"] == "left_only"].drop("_merge", axis=1)
+        records = records.sort_values(["year", "week"], kind="stable")
+        if records.empty:
+            return 0
+
+        # last team, position and week of every player
+        last = self.history.sort_values(["year", "week"], kind="stable").groupby("player_id").last()
+        teams = last["team"].to_dict()
+        positions = last["position"].to_dict()
+        seen = (last["year"] * 100 + last["week"]).to_dict()
+        ids = self.history.groupby("key")["player_id"].unique().apply(list).to_dict()
+        count = len(self.players)
+
+        assigned = np.empty(len(records), dtype=np.int64)
+        rows = records[["key", "team", "position", "year", "week"]].to_numpy(dtype=object)
+        for indices in records.groupby(["year", "week"], sort=False).indices.values():
+            used = set()
+            pending = list()
+            # players staying with their team first, so a namesake does not take their ID
+            for i in indices:
+                key, team, _, _, _ = rows[i]
+                found = [j for j in ids.get(key, list()) if j not in used and teams[j] == team]
+                if found:
+                    assigned[i] = max(found, key=seen.get)
+                    used.add(assigned[i])
+                else:
+                    pending.append(i)
+            for i in pending:
+                key, team, position, year, _ = rows[i]
+                found = [j for j in ids.get(key, list())
+                         if j not in used and positions[j] == position and seen[j] // 100 >= year - GAP]
+                if found:
+                    assigned[i] = max(found, key=seen.get)
+                else:
+                    assigned[i] = count
+                    count += 1
+                    ids.setdefault(key, list()).append(assigned[i])
+                used.add(assigned[i])
+
+            for i in indices:
+                key, team, position, year, week = rows[i]
+                teams[assigned[i]] = team
+                positions[assigned[i]] = position
+                seen[assigned[i]] = year * 100 + week
+
+        records["player_id"] = assigned
+        new = records.loc[records["player_id"] >= len(self.players)].drop_duplicates("player_id")
+        self.players = pd.concat([self.players, new[["player_id", "player", "position"]]], ignore_index=True)
+        variants = pd.concat([self.variants, records[["player_id", "player"]].rename(columns={"player": "name"})])
+        self.variants = variants.drop_duplicates().reset_index(drop=True)
+        self.history = pd.concat([self.history, records[self.history.columns]], ignore_index=True)
+        self.keys = None
+        self.blocks = None
+        return len(new)
+
+    def resolve(self, names, teams=None, positions=None, years=None, weeks=None, abbreviated=False, fuzzy=False):
+        """
+        Resolves names to the IDs of their players. If several players
+        have the name, the one who played for the team in the week or
+        season, or else on the position in the season, is taken, and
+        else the one who played most recently.
+
+        With fuzzy matching only the players of the team in the season
+        are candidates, and names without an exact match are matched to
+        the most similar name of these players with the same initial,
+        e.g. A.St. Brown to Amon-Ra St. Brown. Names of several of these
+        players, e.g. J.Williams, are left unresolved.
+
+        :param names: names of the players
+        :type names: pandas.Series
+        :param teams: teams of the players
+        :type teams: array-like
+        :param positions: positions of the players
+        :type positions: array-like
+        :param years: seasons of the names
+        :type years: array-like or int
+        :param weeks: weeks of the names
+        :type weeks: array-like or int
+        :param abbreviated: the names are abbreviated, e.g. A.Rodgers
+        :type abbreviated: bool
+        :param fuzzy: match the names approximately within the team and season, requires teams and years
+        :type fuzzy: bool
+        :return: IDs of the players, missing for unknown names
+        :rtype: pandas.Series
+        """
+        names = pd.Series(names)
+        if fuzzy and (teams is None or years is None):
+            raise ValueError("fuzzy matching requires the teams and years of the names")
+        query = pd.DataFrame({"key": normalize(names.astype(object).str.replace(".", ". ", regex=False)).to_numpy()
+                              if abbreviated else normalize(names).to_numpy()})
+        for column, values in [("team", teams), ("position", positions), ("year", years), ("week", weeks)]:
+            if values is not None:
+                query[column] = values.to_numpy() if isinstance(values, pd.Series) else values
+
+        # every distinct name and context is resolved once, e.g. a name per play
+        rows = query.groupby(list(query.columns), dropna=False, sort=False).ngroup().to_numpy()
+        query = query.drop_duplicates(ignore_index=True)
+        query["row"] = np.arange(len(query))
+
+        keys = self.get_keys()
+        candidates = query.merge(keys.loc[keys["abbreviated"] == abbreviated, ["key", "player_id"]], on="key")
+        candidates = candidates.drop_duplicates(["row", "player_id"])
+        if fuzzy:
+            candidates = candidates.merge(self.get_blocks()[["player_id", "team", "year"]],
+                                          on=["player_id", "team", "year"])
+        ids = np.full(len(query), -1, dtype=np.int64)
+        candidates = assign(ids, candidates)
+
+        for context in CONTEXTS:
+            if candidates.empty:
+                break
+            if set(context) <= set(query.columns):
+                history = self.history[["player_id"] + context].drop_duplicates()
+                candidates = assign(ids, candidates.merge(history, on=["player_id"] + context), candidates)
+
+        if not candidates.empty and not fuzzy:
+            # the player who played most recently
+            last = self.history.assign(seen=self.history["year"] * 100 + self.history["week"])
+            last = last.groupby("player_id")["seen"].max()
+            candidates = candidates.assign(seen=candidates["player_id"].map(last).to_numpy())
+            latest = candidates.sort_values("seen", kind="stable").drop_duplicates("row", keep="last")
+            ids[latest["row"].to_numpy()] = latest["player_id"].to_numpy()
+
+        if fuzzy:
+            match(ids, query.loc[ids < 0], self.get_blocks(), abbreviated)
+
+        ids = ids[rows]
+        return pd.Series(pd.arrays.IntegerArray(ids, ids < 0), index=names.index, name="player_id")
+
+    def get_keys(self):
+        """ Returns the normalized and abbreviated names of all name
+        variants. """
+        if self.keys is None:
+            normalized = normalize(self.variants["name"])
+            self.keys = pd.concat([
+                pd.DataFrame({"key": normalized, "player_id": self.variants["player_id"], "abbreviated": False}),
+                pd.DataFrame({"key": abbreviate(normalized), "player_id": self.variants["player_id"],
+                              "abbreviated": True}),
+            ]).drop_duplicates(ignore_index=True)
+        return self.keys
+
+    def get_blocks(self):
+        """ Returns the normalized names of the players of every team
+        and season with their initials. """
+        if self.blocks is None:
+            keys = self.get_keys()
+            keys = keys.loc[~keys["abbreviated"], ["key", "player_id"]]
+            blocks = self.history[["player_id", "team", "year"]].drop_duplicates().merge(keys, on="player_id")
+            self.blocks = blocks.assign(initial=blocks["key"].str[0])
+        return self.blocks
+
+    def get_history(self, ids):
+        """ Returns the teams and positions of the players per week. """
+        return self.history.loc[self.history["player_id"].isin(ids)].drop("key", axis=1)
+
+    def store(self):
+        """ Writes the registry atomically file by file. """
+        for name, df in [("players", self.players), ("variants", self.variants), ("history", self.history)]:
+            path = os.path.join(self.dir, f"{name}.csv")
+            storage.make_dirs(path)
+            df.to_csv(path + ".tmp", index=False)
+            os.replace(path + ".tmp", path)
+
+
+registry = None
+
+
+def get_registry(build=True):
+    """ Returns the registry stored at DIR, registers the players of
+    all seasons if it is not stored yet and build is set. """
+    global registry
+    if registry is None or registry.dir != DIR:
+        registry = Registry(DIR)
+        if build and registry.history.empty:
+            update(registry=registry)
+    return registry
+
+
+def update(years=week_map.keys(), registry=None):
+    """
+    Registers the players of the rosters and the names of the stats,
+    snapcounts and projections missing in the rosters.
+
+    :param years: seasons
+    :type years: list of int
+    :param registry: registry to update, defaults to the registry stored at DIR
+    :type registry: Registry
+    :return: number of players registered
+    :rtype: int
+    """
+    registry = registry or get_registry(build=False)
+    registered = registry.register(get_records(years))
+    registry.store()
+    # the summaries resolving the players depend on the history
+    manifest.get_manifest().record_build(os.path.join(registry.dir, "history.csv"), list())
+    print(f"registered {registered} players, {len(registry.players)} in total")
+    return registered
+
+
+def get_records(years=week_map.keys()):
+    """
+    Returns the records of the rosters and of the names of the stats,
+    snapcounts and projections missing in the rosters.
+
+    :param years: seasons
+    :type years: list of int
+    :return: player, team, position, year and week
+    :rtype: pandas.DataFrame
+    """
+    years = list(years)
+    rosters = players.get_accumulated_players(years)
+    others = accumulator.concat(
+        [loader.get_accumulated_weekly_stats(position, year) for position in POSITIONS for year in years] +
+        [loader.get_accumulated_weekly_snapcounts(year) for year in years if year >= 2016] +
+        [loader.get_accumulated_projections(position, year) for position in POSITIONS for year in years
+         if year == 2021])
+    if rosters.empty:
+        return others.loc[:, RECORD]
+    others = others.loc[~normalize(others["player"]).isin(set(normalize(rosters["player"])))]
+    return accumulator.concat([rosters.loc[:, RECORD], others.loc[:, RECORD]])
+
+
+def get_history_path():
+    return os.path.join(DIR, "history.csv")
+
+
+def get_playbyplay_path(year):
+    return os.path.join(DIR, "playbyplay", f"names_{year}.csv")
+
+
+def resolve(names, teams=None, positions=None, years=None, weeks=None, abbreviated=False, fuzzy=False):
+    """ Resolves names to the IDs of their players, see
+    Registry.resolve. """
+    return get_registry().resolve(names, teams, positions, years, weeks, abbreviated, fuzzy)
+
+
+def get_playbyplay_names(year, refresh=False):
+    """
+    Returns the IDs of the player names of the play-by-play data of a
+    season. The mapping is stored and only resolved again if the
+    play-by-play data or the registry changed.
+
+    :param year: season
+    :type year: int
+    :param refresh: resolve the names even if the stored mapping is up to date
+    :type refresh: bool
+    :return: player, team and year of the names with the IDs of their players, missing for unknown names
+    :rtype: pandas.DataFrame
+    """
+    path = get_playbyplay_path(year)
+    sources = [pbp.get_playbyplay_path(year), get_history_path()]
+    if not refresh and not manifest.get_manifest().is_outdated(path, sources):
+        return load(path, {"player": "object", "team": "object", "year": "int64", "player_id": "Int64"})
+
+    df = pbp.get_playbyplay(year, columns=PLAYBYPLAY + ["posteam"])
+    df = pd.concat([df[[column, "posteam"]].set_axis(["player", "team"], axis=1) for column in PLAYBYPLAY])
+    df = df.dropna().drop_duplicates(ignore_index=True).assign(year=year)
+    df["player_id"] = resolve(df["player"], df["team"], years=year, abbreviated=True, fuzzy=True).array
+
+    storage.make_dirs(path)
+    df.to_csv(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+    manifest.get_manifest().record_build(path, sources)
+    manifest.save()
+    return df
+
+
+def normalize(names):
+    """
+    Normalizes names, i.e. lower case without punctuation and suffixes,
+    e.g. "Odell Beckham Jr." to "odell beckham".
+
+    :param names: names
+    :type names: pandas.Series
+    :return: normalized names
+    :rtype: pandas.Series
+    """
+    names = names.astype(object).str.lower().str.replace(r"[.,'`’]", "", regex=True).str.replace("-", " ", regex=False)
+    names = names.str.replace(rf"\s+(?:{'|'.join(SUFFIXES)})$", "", regex=True)
+    return names.str.split().str.join(" ")
+
+
+def abbreviate(names):
+    """ Abbreviates normalized names to the initial of the first name,
+    e.g. "odell beckham" to "o beckham". """
+    return names.str[0] + " " + names.str.split(n=1).str[1]
+
+
+def assign(ids, candidates, previous=None):
+    """ Assigns the IDs of the rows with one candidate left, returns
+    the candidates of the rows still unresolved. If no candidate of a
+    row is left, the candidates before are kept. """
+    if previous is not None:
+        missing = ~previous["row"].isin(candidates["row"]) & (ids[previous["row"].to_numpy()] < 0)
+        candidates = pd.concat([candidates[previous.columns], previous.loc[missing]])
+    counts = candidates.groupby("row")["player_id"].transform("size")
+    unique = candidates.loc[counts == 1]
+    ids[unique["row"].to_numpy()] = unique["player_id"].to_numpy()
+    return candidates.loc[counts > 1].reset_index(drop=True)
+
+
+def match(ids, query, blocks, abbreviated):
+    """
+    Assigns the names to the most similar name of the players of their
+    team and season with the same initial. Matches below CUTOFF and
+    names with several most similar players are left unresolved.
+
+    :param ids: IDs of the rows, assigned in place
+    :type ids: numpy.ndarray
+    :param query: row, normalized name, team and year of the unresolved names
+    :type query: pandas.DataFrame
+    :param blocks: normalized names, teams, years and initials of the players
+    :type blocks: pandas.DataFrame
+    :param abbreviated: the names are abbreviated, e.g. A.Rodgers
+    :type abbreviated: bool
+    """
+    query = query.loc[query["key"].notna(), ["row", "key", "team", "year"]]
+    query = query.assign(initial=query["key"].str[0])
+    pairs = query.merge(blocks.rename(columns={"key": "candidate"}), on=["team", "year", "initial"])
+    if pairs.empty:
+        return
+
+    if abbreviated:
+        # the first name is cut to the length of the abbreviation, e.g. Jos.Allen for Josh Allen
+        first = pairs["key"].str.split(n=1).str[0]
+        parts = pairs["candidate"].str.split(n=1)
+        prefix = [name[:len(initials)] for name, initials in zip(parts.str[0], first)]
+        pairs["candidate"] = pd.Series(prefix, index=pairs.index) + " " + parts.str[1].fillna("")
+        pairs = pairs.loc[pairs["candidate"].str.split(n=1).str[0] == first]
+
+    pairs["similarity"] = [difflib.SequenceMatcher(None, a, b).ratio()
+                           for a, b in zip(pairs["key"], pairs["candidate"])]
+    pairs = pairs.sort_values("similarity").drop_duplicates(["row", "player_id"], keep="last")
+    best = pairs.groupby("row")["similarity"].transform("max")
+    pairs = pairs.loc[(pairs["similarity"] == best) & (pairs["similarity"] >= CUTOFF)]
+    pairs = pairs.loc[pairs.groupby("row")["player_id"].transform("size") == 1]
+    ids[pairs["row"].to_numpy()] = pairs["player_id"].to_numpy()
+
+
+def load(path, types):
+    if os.path.exists(path):
+        return pd.read_csv(path, dtype=types)
+    return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in types.items()})
+
+
+if __name__ == "__main__":
+    update()
@@ -0,0 +1,181 @@
+"""
+Materializes the features of a season into one summary keyed by
+player, position, year and week.
+
+The weekly stats of all positions are joined with the schedule, the
+yearly defense stats of the opponent, the weekly snapcounts and the
+points the opponent allowed to the position. The joins are done once
+per season when the summary is built, and the summary is only rebuilt
+if one of its sources changed. The opponents are looked up in the
+schedule index and the defense stats and points allowed are indexed by
+the opponent, so no merge on the whole season is needed.
+
+The features are keyed by the name and position of the players, a
+player listed on two positions has a row for each. The player_id column
+holds the ID of the player in the registry, see
+src.preprocessing.registry, and the snapcounts are joined on it.
+
+Running this script will store the features of all seasons.
+"""
+from abc import ABC
+
+import numpy as np
+import pandas as pd
+
+import src.loader.schedules as schedules
+import src.loader.statistics as loader
+import src.preprocessing.build as build
+import src.preprocessing.registry as registry
+import src.utils.accumulator as accumulator
+
+from src.config.mapping import week_map
+from src.preprocessing.preprocessing import Preprocessing
+from src.preprocessing.statistics.snapcounts import Snapcounts
+from src.preprocessing.statistics.stats import Stats
+from src.preprocessing.statistics.teamstats import Defense
+
+POSITIONS = ["QB", "RB", "TE", "WR"]
+
+# key of the features, the summary is sorted by it
+KEY = ["player", "position", "year", "week"]
+
+# columns of the snapcounts joined to the stats
+SNAPCOUNTS = ["snaps", "snaps_pct", "rush_pct", "tgt_pct", "touch_pct", "util_pct", "points_per_100_snaps"]
+
+# columns of the points allowed by the opponent to the position
+POINTS_ALLOWED = ["points_allowed", "points_allowed_rank"]
+
+
+class Features(Preprocessing, ABC):
+    def __init__(self, year, refresh=False):
+        Preprocessing.__init__(self, year, refresh)
+        self.filename = f"features_{self.year}.csv"
+        self.dir = f"../preprocessed/features"
+
+        self.stats = [Stats(position, self.year, refresh=self.refresh) for position in POSITIONS]
+        self.defense = Defense(self.year, refresh=self.refresh)
+        self.snapcounts = Snapcounts(self.year, refresh=self.refresh) if self.year >= 2016 else None
+
+    def concat_data(self):
+        """ Joins the weekly stats of all positions with the schedule,
+        the opponent defense, the snapcounts and the points allowed. """
+        season = accumulator.concat([stats.get_accumulated_data() for stats in self.stats])
+        season = season.reset_index(drop=True)
+
+        # opponent and location, players without a game, e.g. byes or free agents, are dropped
+        games = schedules.ScheduleIndex(schedules.get_schedule(self.year))
+        games = games.lookup(season["year"], season["team"], season["week"])
+        season["opponent"] = games["opponent"].to_numpy()
+        season["home"] = games["home"].to_numpy()
+        season = season.loc[season["opponent"].notna() & (season["opponent"] != "BYE")].reset_index(drop=True)
+
+        ids = registry.resolve(season["player"], season["team"], season["position"], season["year"], season["week"])
+        season.insert(1, "player_id", ids.array)
+
+        # yearly defense stats of the opponent
+        defense = self.defense.get_accumulated_data().drop(["games_defense", "year"], axis=1)
+        defense = defense.drop_duplicates("team").set_index("team").reindex(season["opponent"])
+        season = pd.concat([season, defense.reset_index(drop=True)], axis=1)
+
+        season = self.join_snapcounts(season)
+        season = self.join_points_allowed(season)
+
+        return season.sort_values(KEY, kind="stable").reset_index(drop=True)
+
+    def join_snapcounts(self, season):
+        """ Joins the weekly snapcounts of the players, NaN for seasons
+        without snapcounts. """
+        if self.snapcounts is None:
+            for column in SNAPCOUNTS:
+                season[column] = np.nan
+            return season
+
+        on = ["player_id", "week"]
+        snapcounts = self.snapcounts.get_accumulated_data()
+        snapcounts["player_id"] = registry.resolve(snapcounts["player"], snapcounts["team"], snapcounts["position"],
+                                                   snapcounts["year"], snapcounts["week"]).array
+        snapcounts = snapcounts.dropna(subset=["player_id"]).drop_duplicates(on).set_index(on)
+        index = pd.MultiIndex.from_frame(season[on])
+        snapcounts = snapcounts.reindex(index, columns=SNAPCOUNTS)
+        return pd.concat([season, snapcounts.reset_index(drop=True)], axis=1)
+
+    def join_points_allowed(self, season):
+        """ Joins the fantasy points the opponent allowed to the
+        position in the season. """
+        pa = loader.get_points_allowed(self.year, abbreviated=True)
+        pa = pa.drop_duplicates("team").set_index("team")
+
+        opponents = pa.index.get_indexer(season["opponent"])
+        for column in POINTS_ALLOWED:
+            season[column] = np.nan
+        for position in POSITIONS:
+            rows = ((season["position"] == position) & (opponents >= 0)).to_numpy()
+            season.loc[rows, "points_allowed"] = pa[f"pa_{position.lower()}"].to_numpy()[opponents[rows]]
+            season.loc[rows, "points_allowed_rank"] = pa[f"rank_{position.lower()}"].to_numpy()[opponents[rows]]
+        return season
+
+    def get_sources(self):
+        """ Returns the stats and defense summaries, the snapcounts
+        summary, the schedule, the points allowed of the season and the
+        registry. """
+        sources = [stats.get_path() for stats in self.stats] + [self.defense.get_path()]
+        if self.snapcounts is not None:
+            sources.append(self.snapcounts.get_path())
+        return sources + [schedules.get_schedule_path(self.year), loader.get_points_allowed_path(self.year),
+                          registry.get_history_path()]
+
+    def get_dependencies(self):
+        """ Returns the stats, defense and snapcounts summaries. """
+        return self.stats + [self.defense] + ([self.snapcounts] if self.snapcounts is not None else list())
+
+
+def get_features(years, columns=None, positions=None, players=None, weeks=None, refresh=False):
+    """
+    Returns the features of the seasons indexed by player, position,
+    year and week. Only the given columns and rows are read from the
+    stored summaries. If positions are selected, columns none of the
+    positions has, e.g. the passing stats for receivers, are dropped.
+
+    :param years: seasons
+    :type years: list of int
+    :param columns: columns to return besides the key, defaults to all
+    :type columns: list of str
+    :param positions: positions to return, defaults to all
+    :type positions: list of str
+    :param players: players to return, defaults to all
+    :type players: list of str
+    :param weeks: weeks to return, defaults to all
+    :type weeks: list of int
+    :param refresh: joins the features again instead of reading the stored summaries
+    :type refresh: bool
+    :return: features
+    :rtype: pandas.DataFrame
+    """
+    if columns is not None:
+        columns = list(dict.fromkeys(KEY + list(columns)))
+
+    df = accumulator.concat([Features(year, refresh).get_accumulated_data(columns, weeks, players)
+                            for year in years])
+    if df.empty:
+        return df
+
+    if positions is not None:
+        df = df.loc[df["position"].isin(positions)].dropna(axis=1, how="all")
+
+    return df.set_index(KEY).sort_index()
+
+
+def get_tasks():
+    """ Returns the features of all seasons. """
+    return [Features(year, refresh=True) for year in week_map.keys()]
+
+
+def store_all(workers=build.WORKERS):
+    """ Joins and stores the features of all seasons, the registry is
+    updated before. """
+    registry.update()
+    build.build(get_tasks(), workers)
+
+
+if __name__ == "__main__":
+    store_all()
@@ -8,12 +8,11 @@ the stats itself are refreshed.
 Running this script will store all summaries for the year 2021 or
 refresh them if available offline.
 """
-import pandas as pd
-
 from abc import ABC
 
-from src.config.mapping import week_map
-from src.loader.fantasypros.projections import Projections as Loader
+import src.loader.statistics as loader
+import src.preprocessing.build as build
+
 from src.preprocessing.preprocessing import Preprocessing
 
 
@@ -23,19 +22,29 @@ class Projections(Preprocessing, ABC):
         self.position = position
         self.filename = f"projections_summary_{self.position.upper()}_{self.year}.csv"
         self.dir = f"../preprocessed/projections/{self.year}"
+        self.weekly = True
 
     def concat_data(self):
         """ Concatenates the weekly projections into one. """
-        df = pd.DataFrame()
-        for week in range(1, week_map[self.year] + 1):
-            df = pd.concat([df, Loader(self.position, week, self.refresh).get_data()])
+        df = loader.get_accumulated_projections(self.position, self.year)
         return df.reset_index(drop=True)
 
+    def load_week(self, week):
+        return loader.get_projections(self.position, week, self.year)
+
+    def get_week_sources(self, week):
+        """ Returns the projections of the week. """
+        return [loader.get_projections_path(self.position, week, self.year)]
+
+
+def get_tasks():
+    """ Returns the summaries of all weekly projections. """
+    return [Projections(position, refresh=True) for position in ["DST", "K", "QB", "RB", "TE", "WR"]]
+
 
-def store_all():
+def store_all(workers=build.WORKERS):
     """ Accumulates and stores the weekly projections. """
-    for position in ["DST", "K", "QB", "RB", "TE", "WR"]:
-        Projections(position, refresh=True).store_accumulated_data()
+    build.build(get_tasks(), workers)
 
 
 if __name__ == "__main__":
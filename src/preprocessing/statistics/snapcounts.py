@@ -8,13 +8,13 @@ the stats itself are refreshed.
 Running this script will store all summaries for a denoted year
 range or refresh them if available offline.
 """
-import pandas as pd
 import sys
 
 from abc import ABC
 
-from src.config.mapping import week_map
-from src.loader.fantasypros.snapcounts import WeeklySnapcounts as Loader
+import src.loader.statistics as loader
+import src.preprocessing.build as build
+
 from src.preprocessing.preprocessing import Preprocessing
 
 
@@ -28,21 +28,30 @@ class Snapcounts(Preprocessing, ABC):
 
         self.filename = f"snapcounts_summary_{self.year}.csv"
         self.dir = f"../preprocessed/snapcounts"
+        self.weekly = True
 
     def concat_data(self):
         """ Concatenates the weekly snapcounts into one. """
-        df = pd.DataFrame()
-        for week in range(1, week_map[self.year] + 1):
-            df = pd.concat([df, Loader(week, self.year, self.refresh).get_data()])
-        df = df.loc[df["games"] == 1]
+        df = loader.get_accumulated_weekly_snapcounts(self.year)
         return df.reset_index(drop=True)
 
+    def load_week(self, week):
+        return loader.get_weekly_snapcounts(week, self.year)
 
-def store_all():
-    """ Accumulates and stores all weekly snapcounts for a season. """
+    def get_week_sources(self, week):
+        """ Returns the weekly snapcounts of the week. """
+        return [loader.get_weekly_snapcounts_path(week, self.year)]
+
+
+def get_tasks():
+    """ Returns the summaries of all weekly snapcounts. """
     years = (2016, 2021)
-    for year in range(years[0], years[1] + 1):
-        Snapcounts(year, refresh=True).store_accumulated_data()
+    return [Snapcounts(year, refresh=True) for year in range(years[0], years[1] + 1)]
+
+
+def store_all(workers=build.WORKERS):
+    """ Accumulates and stores all weekly snapcounts for a season. """
+    build.build(get_tasks(), workers)
 
 
 if __name__ == "__main__":
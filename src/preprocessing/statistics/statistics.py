@@ -2,18 +2,20 @@
 Accumulates weekly stats and schedule for a season with the yearly
 team stats for defense.
 
+The statistics of a position are selected from the features of the
+season, which hold the joins of all positions.
+
 Running this script will store the accumulated statistics for a given
 year range.
 """
-import pandas as pd
-
 from abc import ABC
 
+import src.preprocessing.build as build
+import src.preprocessing.statistics.features as features
+
+from src.config.fantasypros import stats_type
 from src.config.mapping import week_map
-from src.loader.fantasypros.schedule import Schedule
 from src.preprocessing.preprocessing import Preprocessing
-from src.preprocessing.statistics.stats import Stats
-from src.preprocessing.statistics.teststats import Defense
 
 
 class Statistics(Preprocessing, ABC):
@@ -25,30 +27,40 @@ class Statistics(Preprocessing, ABC):
         self.filename = f"statistics_{self.position}_{self.year}.csv"
         self.dir = f"../preprocessed/statistics/{self.year}"
 
+        self.features = features.Features(self.year, refresh=self.refresh)
+
     def concat_data(self):
-        """ Concatenates weekly stats and schedule for given position
-        with and opponent yearly stats.
+        """ Selects weekly stats, schedule and opponent yearly stats
+        for given position from the features.
         """
-        season = Stats(self.position, self.year, refresh=self.refresh).get_accumulated_data()
-        season.drop(["rank", "rost", "fantasy_points_per_game"], axis=1, inplace=True)
+        season = self.features.get_accumulated_data()
+        season = season.loc[season["position"] == self.position]
+        season = season.drop(["player_id"] + features.SNAPCOUNTS + features.POINTS_ALLOWED, axis=1)
+        season = season.dropna(axis=1, how="all")
+
+        # stats of the position first
+        columns = [column for column in stats_type[self.position] if column in season.columns]
+        columns += [column for column in season.columns if column not in columns]
+        return season.loc[:, columns].reset_index(drop=True)
+
+    def get_sources(self):
+        """ Returns the features of the season. """
+        return [self.features.get_path()]
 
-        schedule = Schedule(self.year).get_data()
-        season = pd.merge(season, schedule, how="inner", on=["team", "week", "year"])
-        season = season.loc[season["opponent"] != "BYE"]
+    def get_dependencies(self):
+        """ Returns the features of the season. """
+        return [self.features]
 
-        defense = Defense(self.year).get_accumulated_data()
-        defense.drop(["games"], axis=1, inplace=True)
-        defense.rename(columns={"team": "opponent"}, inplace=True)
-        season = pd.merge(season, defense, how="inner", on=["opponent", "year"])
 
-        return season
+def get_tasks():
+    """ Returns the statistics of all positions and seasons. """
+    return [Statistics(position, year, refresh=True) for position in ["QB", "RB", "TE", "WR"]
+            for year in week_map.keys()]
 
 
-def store_all():
+def store_all(workers=build.WORKERS):
     """ Accumulates and stores the accumulated statistics. """
-    for position in ["QB", "RB", "TE", "WR"]:
-        for year in week_map.keys():
-            Statistics(position, year, refresh=True).store_accumulated_data()
+    build.build(get_tasks(), workers)
 
 
 if __name__ == "__main__":
@@ -9,12 +9,12 @@ the stats itself are refreshed.
 Running this script will store all summaries for a denoted year
 range or refresh them if available offline.
 """
-import pandas as pd
-
 from abc import ABC
 
+import src.loader.statistics as loader
+import src.preprocessing.build as build
+
 from src.config.mapping import week_map
-from src.loader.fantasypros.stats import WeeklyStats as Loader
 from src.preprocessing.preprocessing import Preprocessing
 
 
@@ -24,22 +24,30 @@ class Stats(Preprocessing, ABC):
         self.position = position
         self.filename = f"stats_summary_{self.position.upper()}_{self.year}.csv"
         self.dir = f"../preprocessed/stats/{self.year}"
+        self.weekly = True
 
     def concat_data(self):
         """ Concatenates the weekly stats for all positions into
         one. """
-        df = pd.DataFrame()
-        for week in range(1, week_map[self.year] + 1):
-            df = pd.concat([df, Loader(self.position, week, self.year, self.refresh).get_data()])
-        df = df.loc[df["games"] == 1]
+        df = loader.get_accumulated_weekly_stats(self.position, self.year)
         return df.reset_index(drop=True)
 
+    def load_week(self, week):
+        return loader.get_weekly_stats(self.position, week, self.year)
+
+    def get_week_sources(self, week):
+        """ Returns the weekly stats of the week. """
+        return [loader.get_weekly_stats_path(self.position, week, self.year)]
+
+
+def get_tasks():
+    """ Returns the summaries of all weekly stats. """
+    return [Stats(position, year, refresh=True) for position in ["QB", "RB", "TE", "WR"] for year in week_map.keys()]
+
 
-def store_all():
+def store_all(workers=build.WORKERS):
     """ Accumulates and stores all weekly stats for a season. """
-    for position in ["QB", "RB", "TE", "WR"]:
-        for year in week_map.keys():
-            Stats(position, year, refresh=True).store_accumulated_data()
+    build.build(get_tasks(), workers)
 
 
 if __name__ == "__main__":
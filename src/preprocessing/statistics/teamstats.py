@@ -0,0 +1,64 @@
+"""
+Accumulates the yearly team stats for offense and defense, i.e.
+passing, rushing, receiving and downs, into one each.
+
+Refreshing means, that it will, regardless if the file already
+exists, accumulate the stats again. However, this does not mean that
+the stats itself are refreshed.
+
+Running this script will store all team stats for a denoted year
+range.
+"""
+from abc import ABC
+
+import src.loader.statistics as loader
+import src.preprocessing.build as build
+
+from src.config.mapping import week_map
+from src.preprocessing.preprocessing import Preprocessing
+
+
+class TeamStats(Preprocessing, ABC):
+    def __init__(self, team, year, season="REG", refresh=False):
+        Preprocessing.__init__(self, year, refresh)
+        self.team = team
+        self.season = season
+        self.filename = f"{self.team}_stats_{self.year}_{self.season}.csv"
+        self.dir = f"../preprocessed/teamstats"
+
+    def get_sources(self):
+        """ Returns the team stats of the season. """
+        return [loader.get_team_stats_path(self.year, self.team, stat, self.season)
+                for stat in ["passing", "rushing", "receiving", "downs"]]
+
+
+class Offense(TeamStats):
+    def __init__(self, year, season="REG", refresh=False):
+        TeamStats.__init__(self, "offense", year, season, refresh)
+
+    def concat_data(self):
+        """ Merges the offense stats into one. """
+        return loader.get_offense_stats(self.year, self.season)
+
+
+class Defense(TeamStats):
+    def __init__(self, year, season="REG", refresh=False):
+        TeamStats.__init__(self, "defense", year, season, refresh)
+
+    def concat_data(self):
+        """ Merges the defense stats into one. """
+        return loader.get_defense_stats(self.year, self.season)
+
+
+def get_tasks():
+    """ Returns the offense and defense stats of all seasons. """
+    return [cls(year, refresh=True) for cls in [Offense, Defense] for year in week_map.keys()]
+
+
+def store_all(workers=build.WORKERS):
+    """ Accumulates and stores the offense and defense stats. """
+    build.build(get_tasks(), workers)
+
+
+if __name__ == "__main__":
+    store_all()
@@ -0,0 +1,101 @@
+"""
+Updates the raw data and rebuilds the affected summaries.
+
+Only raw partitions that are missing, failed before, came back empty or
+belong to the in-progress season and are outdated are fetched, see
+src.utils.manifest. Afterwards only the summaries whose sources changed
+since they were built are rebuilt, in order of their dependencies: the
+stats and team stats before the features and statistics built from them.
+The players of new weeks are registered before the features are built.
+Finally the tables of the warehouse whose summaries changed are reloaded.
+
+Running this script updates the raw data and all summaries. An
+interrupted update resumes when running it again.
+"""
+import src.loader.schedules as schedules
+import src.loader.statistics as loader
+import src.preprocessing.build as build
+import src.preprocessing.registry as registry
+import src.preprocessing.statistics.features as features
+import src.preprocessing.statistics.projections as projections
+import src.preprocessing.statistics.snapcounts as snapcounts
+import src.preprocessing.statistics.statistics as statistics
+import src.preprocessing.statistics.stats as stats
+import src.preprocessing.statistics.teamstats as teamstats
+import src.preprocessing.warehouse as warehouse
+
+
+def get_tasks():
+    """
+    Returns all summaries in order of their dependencies.
+
+    :return: summaries
+    :rtype: list of Preprocessing
+    """
+    return stats.get_tasks() + snapcounts.get_tasks() + projections.get_tasks() + teamstats.get_tasks() + \
+        features.get_tasks() + statistics.get_tasks()
+
+
+def store_all(workers=build.WORKERS):
+    """
+    Registers the players and builds all summaries, the stats and team
+    stats before the statistics built from them.
+
+    :param workers: number of processes
+    :type workers: int
+    :return: paths of the built and failed summaries, seconds per summary and the elapsed time
+    :rtype: dict
+    """
+    registry.update()
+    return build.build(get_tasks(), workers)
+
+
+def rebuild(tasks=None, workers=build.WORKERS):
+    """
+    Rebuilds the outdated summaries and the summaries depending on
+    them. Weekly summaries are only updated by their changed weeks.
+
+    :param tasks: summaries to check, defaults to all
+    :type tasks: list of Preprocessing
+    :param workers: number of processes
+    :type workers: int
+    :return: paths of the rebuilt summaries
+    :rtype: list of str
+    """
+    outdated = list()
+    paths = set()
+    for task in get_tasks() if tasks is None else tasks:
+        dependencies = {dependency.get_path() for dependency in task.get_dependencies()}
+        if dependencies & paths or task.is_outdated():
+            # accumulates again instead of loading the stored summary
+            task.refresh = True
+            outdated.append(task)
+            paths.add(task.get_path())
+
+    rebuilt = build.build(outdated, workers, incremental=True)["built"] if outdated else list()
+    print(f"rebuilt {len(rebuilt)} summaries")
+    return rebuilt
+
+
+def update(workers=None, processes=build.WORKERS):
+    """
+    Fetches the missing and stale raw data, rebuilds the affected
+    summaries and reloads the affected tables of the warehouse.
+
+    :param workers: number of concurrent downloads
+    :type workers: int
+    :param processes: number of processes rebuilding the summaries
+    :type processes: int
+    :return: paths of the rebuilt summaries
+    :rtype: list of str
+    """
+    loader.update(workers)
+    schedules.update(workers)
+    registry.update()
+    rebuilt = rebuild(workers=processes)
+    warehouse.update()
+    return rebuilt
+
+
+if __name__ == "__main__":
+    update()
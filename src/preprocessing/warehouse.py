@@ -0,0 +1,286 @@
+"""
+Implements a local SQLite warehouse over the raw and preprocessed data.
+
+The weekly stats, snapcounts and projections summaries, the schedules,
+the offense and defense team stats and the points allowed are loaded
+into typed tables of one database file. Player tables are indexed by
+player, year and week, team tables by team, year and week, so questions
+across all seasons are answered by an indexed query instead of loading
+every season into pandas.
+
+Every table is bulk loaded in one transaction and its indexes are
+created afterwards. The database records the hashes of the sources each
+table was loaded from, an update only reloads the tables whose sources
+changed since.
+
+Running this script will build the warehouse of all seasons.
+"""
+import contextlib
+import functools
+import os
+import sqlite3
+
+import pandas as pd
+
+import src.loader.schedules as schedules
+import src.loader.statistics as loader
+import src.utils.accumulator as accumulator
+import src.utils.manifest as manifest
+import src.utils.storage as storage
+
+from src.config.mapping import week_map
+from src.preprocessing.statistics.projections import Projections
+from src.preprocessing.statistics.snapcounts import Snapcounts
+from src.preprocessing.statistics.stats import Stats
+from src.preprocessing.statistics.teamstats import Defense, Offense
+
+PATH = "../preprocessed/warehouse.sqlite"
+
+POSITIONS = ["QB", "RB", "TE", "WR"]
+
+# indexes of the tables with players and with teams, the position index
+# serves queries over all players of a position
+PLAYER_INDEX = ["player", "year", "week"]
+TEAM_INDEX = ["team", "year", "week"]
+POSITION_INDEX = ["position", "year", "week"]
+
+# table with the hashes of the sources each table was loaded from
+SOURCES = "sources"
+
+
+class Table:
+    def __init__(self, name, parts, indexes):
+        self.name = name
+        # loaders of the partitions of the table and the paths of their stored sources
+        self.parts = parts
+        self.indexes = indexes
+
+    def get_sources(self):
+        return [source for _, sources in self.parts for source in sources]
+
+    def load(self):
+        """ Loads the partitions of the table into one. """
+        return accumulator.concat([load() for load, _ in self.parts])
+
+
+def get_tables(years=week_map.keys(), refresh=False):
+    """
+    Returns the tables of the warehouse. The stats, snapcounts and
+    projections are loaded from their summaries, seasons whose raw
+    schedules, team stats or points allowed are not stored are left out.
+
+    :param years: seasons
+    :type years: list of int
+    :param refresh: accumulates the summaries again instead of loading the stored ones
+    :type refresh: bool
+    :return: tables by name
+    :rtype: dict
+    """
+    years = list(years)
+    tables = [
+        Table("stats", get_summary_parts([Stats(position, year, refresh) for year in years for position in POSITIONS]),
+              [PLAYER_INDEX, TEAM_INDEX, POSITION_INDEX]),
+        Table("snapcounts", get_summary_parts([Snapcounts(year, refresh) for year in years if year >= 2016]),
+              [PLAYER_INDEX, TEAM_INDEX, POSITION_INDEX]),
+        Table("projections", get_summary_parts([Projections(position, refresh) for position in POSITIONS
+                                                if Projections(position).year in years]),
+              [PLAYER_INDEX, TEAM_INDEX, POSITION_INDEX]),
+        Table("schedules", get_loader_parts(schedules.get_schedule,
+                                            [(year, [schedules.get_schedule_path(year)]) for year in years]),
+              [TEAM_INDEX]),
+        Table("offense", get_summary_parts([Offense(year, refresh=refresh) for year in years
+                                            if all(map(manifest.is_stored, Offense(year).get_sources()))]),
+              [TEAM_INDEX[:2]]),
+        Table("defense", get_summary_parts([Defense(year, refresh=refresh) for year in years
+                                            if all(map(manifest.is_stored, Defense(year).get_sources()))]),
+              [TEAM_INDEX[:2]]),
+        Table("points_allowed", get_loader_parts(functools.partial(loader.get_points_allowed, abbreviated=True),
+                                                 [(year, [loader.get_points_allowed_path(year)]) for year in years]),
+              [TEAM_INDEX[:2]]),
+    ]
+    return {table.name: table for table in tables}
+
+
+def get_summary_parts(tasks):
+    return [(task.get_accumulated_data, [task.get_path()]) for task in tasks]
+
+
+def get_loader_parts(load, calls):
+    return [(functools.partial(load, year), sources) for year, sources in calls
+            if all(map(manifest.is_stored, sources))]
+
+
+def build(years=week_map.keys(), refresh=False, path=None):
+    """
+    Builds the warehouse from scratch. The database is written to a
+    temporary file first and replaces the stored one when complete.
+
+    :param years: seasons
+    :type years: list of int
+    :param refresh: accumulates the summaries again instead of loading the stored ones
+    :type refresh: bool
+    :param path: path of the database, defaults to PATH
+    :type path: str
+    :return: number of rows per table
+    :rtype: dict
+    """
+    path = path or PATH
+    storage.make_dirs(path)
+    if os.path.exists(path + ".tmp"):
+        os.remove(path + ".tmp")
+
+    with contextlib.closing(sqlite3.connect(path + ".tmp")) as connection:
+        rows = {name: load_table(connection, table) for name, table in get_tables(years, refresh).items()}
+    os.replace(path + ".tmp", path)
+    return rows
+
+
+def update(years=week_map.keys(), refresh=False, path=None):
+    """
+    Reloads the tables whose sources changed since they were loaded,
+    builds the warehouse if it does not exist yet.
+
+    :param years: seasons
+    :type years: list of int
+    :param refresh: accumulates the summaries again instead of loading the stored ones
+    :type refresh: bool
+    :param path: path of the database, defaults to PATH
+    :type path: str
+    :return: number of rows per reloaded table
+    :rtype: dict
+    """
+    path = path or PATH
+    if not os.path.exists(path):
+        return build(years, refresh, path)
+
+    with contextlib.closing(sqlite3.connect(path)) as connection:
+        return {name: load_table(connection, table) for name, table in get_tables(years, refresh).items()
+                if is_outdated(connection, table)}
+
+
+def load_table(connection, table):
+    """
+    Replaces a table by the loaded data in one transaction. The rows are
+    inserted at once and the indexes are created afterwards.
+
+    :param connection: database
+    :type connection: sqlite3.Connection
+    :param table: table to load
+    :type table: Table
+    :return: number of rows
+    :rtype: int
+    """
+    df = table.load()
+    columns = ", ".join(f'"{column}" {get_type(df[column])}' for column in df.columns)
+    placeholders = ", ".join("?" * len(df.columns))
+
+    with connection:
+        connection.execute(f'DROP TABLE IF EXISTS "{table.name}"')
+        connection.execute(f'CREATE TABLE "{table.name}" ({columns})')
+        connection.executemany(f'INSERT INTO "{table.name}" VALUES ({placeholders})', get_rows(df))
+        for index in table.indexes:
+            if set(index) <= set(df.columns):
+                connection.execute(f'CREATE INDEX "{table.name}_{"_".join(index)}" '
+                                   f'ON "{table.name}" ({", ".join(index)})')
+
+        connection.execute(f'CREATE TABLE IF NOT EXISTS "{SOURCES}" ("table" TEXT, source TEXT, hash TEXT)')
+        connection.execute(f'DELETE FROM "{SOURCES}" WHERE "table" = ?', (table.name,))
+        connection.executemany(f'INSERT INTO "{SOURCES}" VALUES (?, ?, ?)',
+                               [(table.name, os.path.normpath(source), manifest.get_manifest().get_hash(source))
+                                for source in table.get_sources()])
+    print(f"{table.name:<16}{len(df):>8} rows")
+    return len(df)
+
+
+def is_outdated(connection, table):
+    """ Checks if a table is missing or one of its sources changed
+    since it was loaded. """
+    try:
+        recorded = connection.execute(f'SELECT source, hash FROM "{SOURCES}" WHERE "table" = ?',
+                                      (table.name,)).fetchall()
+    except sqlite3.OperationalError:
+        return True
+    current = {os.path.normpath(source): manifest.get_manifest().get_hash(source) for source in table.get_sources()}
+    return not recorded or dict(recorded) != current
+
+
+def get_type(series):
+    """ Returns the SQLite type of a column, booleans are stored as
+    integers. """
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(series):
+        return "REAL"
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred in ["boolean", "integer"]:
+        return "INTEGER"
+    if inferred in ["floating", "mixed-integer-float"]:
+        return "REAL"
+    return "TEXT"
+
+
+def get_rows(df):
+    """ Returns the rows as tuples of Python objects, missing values are
+    stored as NULL. """
+    values = df.astype(object).where(df.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+
+def query(sql, params=(), path=None):
+    """
+    Runs a query on the warehouse.
+
+    :param sql: SQL query
+    :type sql: str
+    :param params: parameters of the placeholders in the query
+    :type params: tuple or dict
+    :param path: path of the database, defaults to PATH
+    :type path: str
+    :return: result of the query
+    :rtype: pandas.DataFrame
+    """
+    with contextlib.closing(connect(path)) as connection:
+        return pd.read_sql_query(sql, connection, params=params)
+
+
+def select(table, columns=None, path=None, **where):
+    """
+    Returns the rows of a table matching the conditions, e.g.
+    select("stats", player="Derrick Henry", year=[2019, 2020]). A list
+    matches any of its values.
+
+    :param table: name of the table
+    :type table: str
+    :param columns: columns to return, defaults to all
+    :type columns: list of str
+    :param path: path of the database, defaults to PATH
+    :type path: str
+    :param where: values of the columns to match
+    :type where: dict
+    :return: matching rows
+    :rtype: pandas.DataFrame
+    """
+    conditions = list()
+    params = list()
+    for column, value in where.items():
+        values = list(value) if isinstance(value, (list, tuple, set, range)) else [value]
+        conditions.append(f'"{column}" IN ({", ".join("?" * len(values))})')
+        params.extend(values)
+
+    selected = ", ".join(f'"{column}"' for column in columns) if columns else "*"
+    sql = f'SELECT {selected} FROM "{table}"'
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    return query(sql, tuple(params), path)
+
+
+def connect(path=None):
+    """ Opens the warehouse read-only. """
+    path = path or PATH
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not built, run src/preprocessing/warehouse.py")
+    return sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+
+
+if __name__ == "__main__":
+    update()
@@ -9,10 +9,11 @@ players per week on this position over the last recent years.
 import matplotlib.pyplot as plt
 import matplotlib.patches as mp
 import numpy as np
-import pandas as pd
 import scipy.stats
 
-from src.preprocessing.statistics.statistics import Statistics
+import src.metrics.ranking as ranking
+
+from src.preprocessing.statistics.features import get_features
 
 SNAPS_THRESHOLD = 30
 
@@ -21,41 +22,27 @@ if __name__ == "__main__":
     # position
     position = "WR"
 
-    # load the stats of the recent years
-    df = pd.DataFrame()
-    yearly = pd.DataFrame()
-    for year in range(2016, 2021 + 1):
-        # load summary of offense
-        yearly = Statistics(position, year).get_accumulated_data()
-
-        # get necessary data
-        yearly = yearly.loc[:, ["fantasy_points", "snaps_percent", "week"]]
-
-        # use only if player saw snaps during the game
-        yearly = yearly.loc[(yearly["snaps_percent"] > SNAPS_THRESHOLD)]
-        yearly.drop(["snaps_percent"], axis=1, inplace=True)
+    # load the necessary features of the recent years
+    df = get_features(range(2016, 2021 + 1), columns=["fantasy_points", "snaps_pct"], positions=[position])
 
-        # drop players that have no fantasy points record
-        yearly.dropna(inplace=True)
+    # use only if player saw snaps during the game
+    df = df.loc[(df["snaps_pct"] > SNAPS_THRESHOLD)]
+    df.drop(["snaps_pct"], axis=1, inplace=True)
 
-        # concat to dataframe
-        df = pd.concat([df, yearly])
+    # drop players that have no fantasy points record
+    df.dropna(inplace=True)
 
     # fit a distribution to the fantasy points for each position
     mean, var = scipy.stats.distributions.norm.fit(df.loc[:, "fantasy_points"])
     sigma = np.sqrt(var)
 
     # load stats from the latest season
-    df = Statistics(position, 2021).get_accumulated_data()
-    df = df.loc[:, ["player", "fantasy_points", "team", "opponent", "snaps_percent"]]
+    df = get_features([2021], columns=["fantasy_points", "team", "snaps_pct"], positions=[position])
+    df = df.reset_index(level="player").reset_index(drop=True)
 
-    # drop the BYE week records
-    df = df.loc[df["opponent"] != "BYE"]
-    df.drop("opponent", axis=1, inplace=True)
-
-    # keep only players that saw snaps
-    df = df.loc[df["snaps_percent"] > SNAPS_THRESHOLD]
-    df.drop("snaps_percent", axis=1, inplace=True)
+    # keep only players that saw snaps, the features hold no BYE week records
+    df = df.loc[df["snaps_pct"] > SNAPS_THRESHOLD]
+    df.drop("snaps_pct", axis=1, inplace=True)
 
     # assign each player if his scoring was poor, quality or great
     for i, player in df.iterrows():
@@ -105,10 +92,12 @@ if __name__ == "__main__":
     # plot stacked horizontal bar plot
     df_games = df.copy()
 
-    df_games.sort_values(by="fantasy_points", ascending=False, inplace=True)
-    df_games["fantasy_points_rank"] = df_games["fantasy_points"].rank(ascending=False)
+    # select the top games without sorting all of them, tied games share their average rank
+    df_games["fantasy_points_rank"] = ranking.rank(df_games, ["fantasy_points"], keys=list(), method="average",
+                                                   k=30).to_numpy()
 
     df_games = df_games.loc[df_games["fantasy_points_rank"] < 30]
+    df_games.sort_values(by="fantasy_points", ascending=False, inplace=True)
 
     df_games = df_games[["player", "poor_game", "quality_game", "great_game"]]
     df_games.set_index("player", inplace=True)
@@ -9,11 +9,8 @@ from src.preprocessing.statistics.projections import Projections
 
 
 def compare_metric_prediction(position, year, selector):
-    stats = Statistics(position, year).get_accumulated_data()
-    pred = Projections(position, year).get_accumulated_data()
-
-    stats = stats.loc[:, ["player", "week", selector]]
-    pred = pred.loc[:, ["player", "week", selector]]
+    stats = Statistics(position, year).get_accumulated_data(columns=["player", "week", selector])
+    pred = Projections(position, year).get_accumulated_data(columns=["player", "week", selector])
 
     summary = pd.merge(stats, pred, how="inner", on=["player", "week"])
     summary.rename(columns={f"{selector}_x": "actual", f"{selector}_y": "prediction"}, inplace=True)
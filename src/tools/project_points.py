@@ -19,8 +19,11 @@ import seaborn as sns
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, max_error
 
-import src.preprocessing.projections.projections as projections
-import src.preprocessing.statistics.summary.offense as offense
+import src.preprocessing.registry as registry
+
+from src.config.mapping import teams
+from src.preprocessing.statistics.features import get_features
+from src.preprocessing.statistics.projections import Projections
 
 
 def fix_home(home):
@@ -30,20 +33,6 @@ def fix_home(home):
         return 0
 
 
-def map_names(names):
-    unique_names = dict()
-    id_ = 0
-    for name in names:
-        if name not in unique_names.keys():
-            unique_names[name] = id_
-            id_ += 1
-    return unique_names
-
-
-def fix_names(names, ids):
-    return [int(ids[name]) if name in ids.keys() else np.nan for name in names]
-
-
 if __name__ == "__main__":
     # position, fix
     position = "QB"
@@ -51,36 +40,27 @@ if __name__ == "__main__":
     # player
     player = "Aaron Rodgers"
 
-    # load complete data
-    df = pd.DataFrame()
-    for year in range(2016, 2021 + 1):
-        # load yearly data
-        yearly = offense.get_offense_stats_summary(year)
-
-        # get only relevant position and drop bye week records and if player did not play
-        yearly = yearly.loc[(yearly["position"] == position) & (yearly["opponent"] != "BYE") & (yearly["games"] == 1)]
-        yearly.drop("games", axis=1, inplace=True)
+    # load complete data, the features only hold the columns of the position and no bye week records
+    df = get_features(range(2016, 2021 + 1), positions=[position]).reset_index()
 
-        # change booleans to ints for home game column
-        yearly["home"] = yearly["home"].apply(fix_home)
+    # drop records if player did not play
+    df = df.loc[df["games"] == 1]
+    df.drop("games", axis=1, inplace=True)
 
-        # drop columns not relevant for position QB
-        yearly.drop(["rost", 'rushing_ya', 'rushing_lg', 'rushing_20p', 'receiving_rec', 'receiving_tgt',
-                     'receiving_yds', 'receiving_yr', 'receiving_td', 'receiving_lg', 'receiving_20p'],
-                    axis=1, inplace=True)
+    # change booleans to ints for home game column
+    df["home"] = df["home"].apply(fix_home)
 
-        # drop nans in row entries
-        yearly.dropna(axis=0, inplace=True)
+    # drop nans in row entries
+    df.dropna(axis=0, inplace=True)
 
-        # concat
-        df = pd.concat([df, yearly])
-
-    # add fantasy points predictions from fantasy pros
-    df_predictions = projections.get_accumulated_projections_weekly(2021, "QB")
-    df_predictions["year"] = 2021  # TODO fixme in projections loader
-    df_predictions = df_predictions.loc[:, ["player", "week", "year", "position", "fantasy_points"]]
+    # add fantasy points predictions from fantasy pros, joined on the ids of the players
+    df_predictions = Projections(position).get_accumulated_data()
+    df_predictions["player_id"] = registry.resolve(df_predictions["player"], df_predictions["team"],
+                                                   df_predictions["position"], df_predictions["year"],
+                                                   df_predictions["week"]).array
+    df_predictions = df_predictions.loc[:, ["player_id", "week", "year", "fantasy_points"]]
     df_predictions.rename(columns={"fantasy_points": "fantasy_points_pred_fantasypros"}, inplace=True)
-    df = pd.merge(df, df_predictions, how="outer", on=["player", "week", "position", "year"])
+    df = pd.merge(df, df_predictions, how="outer", on=["player_id", "week", "year"])
 
     # drop players that have no fantasy points recorded
     df = df[df["fantasy_points"].notna()]
@@ -88,14 +68,9 @@ if __name__ == "__main__":
     # drop position
     df.drop("position", axis=1, inplace=True)
 
-    # fix team and opponents
-    team_ids = map_names(df.team.unique())
-    df["team_id"] = fix_names(df["team"].to_list(), team_ids)
-    df["opponent_id"] = fix_names(df["opponent"].to_list(), team_ids)
-
-    # fix names
-    name_ids = map_names(df.player.unique())
-    df["player_id"] = fix_names(df["player"].to_list(), name_ids)
+    # ids of team and opponent
+    df["team_id"] = pd.Categorical(df["team"], categories=teams).codes
+    df["opponent_id"] = pd.Categorical(df["opponent"], categories=teams).codes
 
     # split into features and targets
     df_features = df.drop(["fantasy_points", "fantasy_points_pred_fantasypros", "player", "team", "opponent"], axis=1)
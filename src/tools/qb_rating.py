@@ -14,34 +14,14 @@ import seaborn as sns
 import utils.fantasy_pros as fp
 import utils.data_handling as dh
 
+import src.metrics.ranking as ranking
+from src.metrics.rating import get_passer_rating
+
 sns.set_style("whitegrid")
 
 YEAR = 2020
 
 
-def get_qb_rating(player):
-    """
-    Calculates the rating of a QB as introduced in the early 1970s by
-    Don Smith, Seymour Siwoff and Don Weiss.
-
-    :param player: stats of QB
-    :type player: pandas.Series
-    :return: QB rating
-    :rtype: float
-    """
-    comp = player["passing_cmp"]
-    pass_yds = player["passing_yds"]
-    pass_td = player["passing_td"]
-    ints = player["passing_int"]
-    pass_att = player["passing_att"]
-
-    if not pass_att == 0:
-        return 100 / 6 * ((comp / pass_att - 0.3) / 0.2 + (pass_yds / pass_att - 3) / 4 + (pass_td / pass_att) / 0.05 +
-                          (0.095 - ints / pass_att) / 0.04)
-    else:
-        return 0
-
-
 if __name__ == "__main__":
     # load raw
     yearly = dh.read_csv_file("../raw/yearly_stats/QB/QB_{}.csv".format(YEAR))
@@ -51,14 +31,14 @@ if __name__ == "__main__":
     yearly = fp.clean_stats_qb(yearly)
 
     # get rankings
-    yearly["rating"] = yearly.apply(get_qb_rating, axis=1)
+    yearly["rating"] = get_passer_rating(yearly).fillna(0)
 
     # use only QB that have played number of games
     games_threshold = 10
     yearly = yearly.loc[(yearly["games"] > games_threshold), :]
 
     # get the rank of the rating
-    yearly["rating_rank"] = yearly["rating"].rank(ascending=False)
+    yearly["rating_rank"] = ranking.rank(yearly, ["rating"], keys=list(), method="average").to_numpy()
     yearly = yearly.astype({"rating_rank": int})
 
     # plot the rating vs fantasy points
@@ -4,26 +4,19 @@ the mean. A high or low touchdown total is not predictive for future
 performance as these players will often regress towards the mean or
 average the following year.
 """
-import os
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
-import tqdm
 
-import src.preprocessing.playbyplay.playbyplay as pbp
+import src.loader.playbyplay as pbp
+import src.metrics.ranking as ranking
+import src.preprocessing.registry as registry
 from src.preprocessing.statistics.statistics import Statistics
 
 sns.set_style("whitegrid")
 
 
-def fix_player_names(name):
-    split = name.split()
-    first_initial = split[0][0]
-    last_name = split[1]
-    return '.'.join([first_initial, last_name])
-
-
 if __name__ == "__main__":
     # year
     year = 2021
@@ -31,35 +24,18 @@ if __name__ == "__main__":
     # position and play combinations
     comb = [("QB", "pass"), ("QB", "rush"), ("RB", "rush"), ("RB", "rec"), ("WR", "rec"), ("TE", "rec")]
     for position, play in comb:
-        # load historical play-by-play data
-        if not os.path.exists(f"../preprocessed/play-by-play/pbp_1999to{year}.csv"):
-            df_prob = pbp.concat_playbyplay_data((1999, year))
-            df_prob = df_prob.loc[:, ["rush_attempt", "rush_touchdown", "pass_attempt", "pass_touchdown",
-                                      "yardline_100", "two_point_attempt", "year"]]
-        else:
-            df_prob = pd.DataFrame()
-            chunks = pd.read_csv(f"../preprocessed/play-by-play/pbp_1999to{year}.csv", iterator=True, low_memory=False,
-                                 chunksize=10000)
-            for chunk in tqdm.tqdm(chunks):
-                chunk = chunk.loc[:, ["rush_attempt", "rush_touchdown", "pass_attempt", "pass_touchdown",
-                                      "yardline_100", "two_point_attempt", "year"]]
-                df_prob = pd.concat([df_prob, chunk])
-
-        # select data from previous years
-        df_prob = df_prob.loc[(df_prob["year"] < year)]
-
         # select pass or run attempts
         if play == "pass" or play == "rec":
             # passing/receiving: pass attempt that ended in a touchdown
-            df_prob = df_prob.loc[:, ["pass_attempt", "pass_touchdown", "yardline_100", "two_point_attempt"]]
-            df_prob = df_prob.rename({"pass_attempt": "attempt", "pass_touchdown": "touchdown"}, axis=1)
+            attempt, touchdown = "pass_attempt", "pass_touchdown"
         elif play == "rush":
             # rushing: rush attempt that ended in a touchdown
-            df_prob = df_prob.loc[:, ["rush_attempt", "rush_touchdown", "yardline_100", "two_point_attempt"]]
-            df_prob = df_prob.rename({"rush_attempt": "attempt", "rush_touchdown": "touchdown"}, axis=1)
+            attempt, touchdown = "rush_attempt", "rush_touchdown"
 
-        # select only normal attempts
-        df_prob = df_prob.loc[(df_prob["two_point_attempt"] == 0) & (df_prob["attempt"] == 1)]
+        # load normal attempts of previous years
+        df_prob = pbp.get_accumulated_playbyplay(range(1999, year), columns=[attempt, touchdown, "yardline_100"],
+                                                 filters=[("two_point_attempt", "==", 0), (attempt, "==", 1)])
+        df_prob = df_prob.rename({attempt: "attempt", touchdown: "touchdown"}, axis=1)
 
         # find probability of scoring a touchdown depending on distance to endzone
         df_prob = df_prob.groupby("yardline_100")["touchdown"].value_counts(normalize=True)
@@ -73,65 +49,58 @@ if __name__ == "__main__":
         df_prob.plot(x="yardline_100", y="probability_of_touchdown", title=f"Probability for {play}ing TD")
         plt.savefig(f"../reports/td_regression_candidates/touchdown_probability_{play}.png")
 
-        # load play-by-play data for defined year
-        if not os.path.exists(f"../raw/play-by-play/play_by_play_{year}.csv"):
-            df_train = pbp.get_playbyplay_data(year)
-        else:
-            df_train = pd.DataFrame()
-            chunks = pd.read_csv(f"../raw/play-by-play/play_by_play_{year}.csv", iterator=True, low_memory=False,
-                                 chunksize=10000, index_col=0)
-            for chunk in tqdm.tqdm(chunks):
-                df_train = pd.concat([df_train, chunk])
-
-        # get player, team and distance to endzone
+        # load player, team and distance to endzone for defined year
         if play == "pass":
-            df_train = df_train.loc[:, ["passer_player_name", "posteam", "yardline_100"]]
+            player = "passer_player_name"
         elif play == "rec":
-            df_train = df_train.loc[:, ["receiver_player_name", "posteam", "yardline_100"]]
+            player = "receiver_player_name"
         elif play == "rush":
-            df_train = df_train.loc[:, ["rusher_player_name", "posteam", "yardline_100"]]
+            player = "rusher_player_name"
+        df_train = pbp.get_playbyplay(year, columns=[player, "posteam", "yardline_100"])
         df_train = df_train.dropna()
 
         # rename features
         df_train = df_train.rename(columns={df_train.columns[0]: "player", "posteam": "team"})
 
+        # ids of the players, the play-by-play names are abbreviated, e.g. A.Rodgers
+        df_train = df_train.merge(registry.get_playbyplay_names(year), how="left", on=["player", "team"])
+
         # join probability with training
         data = df_train.merge(df_prob, how="left", on="yardline_100")
 
         # group by player and team and sum up expected touchdowns
-        data = data.groupby(["player", "team"], as_index=False).agg({"probability_of_touchdown": np.sum}).rename(
+        data = data.groupby(["player_id", "team"], as_index=False).agg({"probability_of_touchdown": np.sum}).rename(
             {"probability_of_touchdown": "Expected touchdowns"}, axis=1)
         data = data.sort_values(by="Expected touchdowns", ascending=False)
 
-        # rank the expected touchdowns
-        data["Expected touchdowns rank"] = data["Expected touchdowns"].rank(ascending=False)
-
         # load final stats
         df_actual = Statistics(position, year).get_accumulated_data()
 
         # get player, team and td
         if play == "pass":
-            df_actual = df_actual.loc[:, ["player", "team", "passing_td"]]
+            df_actual = df_actual.loc[:, ["player", "team", "week", "passing_td"]]
             df_actual = df_actual.rename({"passing_td": "touchdowns"}, axis=1)
         elif play == "rec":
-            df_actual = df_actual.loc[:, ["player", "team", "receiving_td"]]
+            df_actual = df_actual.loc[:, ["player", "team", "week", "receiving_td"]]
             df_actual = df_actual.rename({"receiving_td": "touchdowns"}, axis=1)
         elif play == "rush":
-            df_actual = df_actual.loc[:, ["player", "team", "rushing_td"]]
+            df_actual = df_actual.loc[:, ["player", "team", "week", "rushing_td"]]
             df_actual = df_actual.rename({"rushing_td": "touchdowns"}, axis=1)
 
-        # clean up player names
-        df_actual["player"] = df_actual["player"].apply(fix_player_names)
+        # ids of the players
+        df_actual["player_id"] = registry.resolve(df_actual["player"], df_actual["team"], position, year,
+                                                  df_actual["week"]).array
 
         # summarize the year
-        df_actual = df_actual.groupby(["player", "team"]).agg({"touchdowns": np.sum}).reset_index()
+        df_actual = df_actual.groupby(["player", "player_id", "team"]).agg({"touchdowns": np.sum}).reset_index()
 
         # merge raw and drop position
-        data = df_actual.merge(data, how="left", on=["player", "team"]).dropna()
+        data = df_actual.merge(data, how="left", on=["player_id", "team"]).dropna()
 
-        # rename features and calculate rank of actual touchdowns
+        # rename features and rank the expected and actual touchdowns of the players in one pass
         data = data.rename({"touchdowns": "Actual touchdowns"}, axis=1)
-        data["Actual touchdowns rank"] = data["Actual touchdowns"].rank(ascending=False)
+        ranks = ranking.rank(data, ["Expected touchdowns", "Actual touchdowns"], method="average")
+        data[["Expected touchdowns rank", "Actual touchdowns rank"]] = ranks.to_numpy()
 
         # calculate regression candidate
         data["Regression candidate"] = data["Expected touchdowns"] - data["Actual touchdowns"]
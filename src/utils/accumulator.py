@@ -0,0 +1,92 @@
+"""
+Implements the accumulation of partitions into one frame.
+
+The partitions, e.g. the weekly stats of a season, are loaded on a
+thread pool. Their columns are unified upfront and the frames are
+concatenated once, instead of growing the accumulated frame partition
+by partition which copies all previous partitions each time.
+"""
+import collections
+import concurrent.futures
+import itertools
+
+import pandas as pd
+
+import src.utils.compact as compact
+
+# number of partitions loaded concurrently
+WORKERS = 8
+
+
+def accumulate(loader, calls, workers=WORKERS, lazy=False):
+    """
+    Loads all partitions and concatenates them into one.
+
+    :param loader: loads a partition, may return None for missing data
+    :type loader: callable
+    :param calls: arguments of the loader for each partition
+    :type calls: list of tuples
+    :param workers: number of partitions loaded concurrently
+    :type workers: int
+    :param lazy: returns an iterator of the partitions instead
+    :type lazy: bool
+    :return: accumulated partitions
+    :rtype: pandas.DataFrame or iterator of pandas.DataFrame
+    """
+    if lazy:
+        return iterate(loader, calls, workers)
+    return concat(list(iterate(loader, calls, workers)))
+
+
+def iterate(loader, calls, workers=WORKERS):
+    """
+    Loads the partitions concurrently and yields them in the order of
+    the calls. Missing partitions are skipped. At most one partition
+    per worker is loaded ahead of the consumer.
+
+    :param loader: loads a partition, may return None for missing data
+    :type loader: callable
+    :param calls: arguments of the loader for each partition
+    :type calls: list of tuples
+    :param workers: number of partitions loaded concurrently
+    :type workers: int
+    :return: loaded partitions
+    :rtype: iterator of pandas.DataFrame
+    """
+    calls = iter(calls)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        # at most one load per worker is in flight, the next one is submitted as a partition is yielded
+        running = collections.deque(executor.submit(loader, *args) for args in itertools.islice(calls, workers))
+        while running:
+            df = running.popleft().result()
+            for args in itertools.islice(calls, 1):
+                running.append(executor.submit(loader, *args))
+            if df is not None:
+                yield df
+
+
+def concat(frames):
+    """
+    Concatenates the frames at once. The columns are unified before,
+    in the order of their first appearance.
+
+    :param frames: frames to concatenate
+    :type frames: list of pandas.DataFrame
+    :return: concatenated frames
+    :rtype: pandas.DataFrame
+    """
+    if not frames:
+        return pd.DataFrame()
+
+    columns = list()
+    seen = set()
+    for df in frames:
+        for column in df.columns:
+            if column not in seen:
+                seen.add(column)
+                columns.append(column)
+
+    frames = [df if df.columns.to_list() == columns else df.reindex(columns=columns) for df in frames]
+    # categoricals are only concatenated as such if their categories are equal
+    frames = [compact.align(df) for df in frames]
+    return pd.concat(frames, copy=False)
@@ -0,0 +1,133 @@
+"""
+Implements the on-disk archive of the fetched html pages.
+
+Every page is stored gzip compressed and keyed by its url, together
+with the ETag and Last-Modified headers of the response. Parsing a
+page again, e.g. after a change of a column map, runs from the archive
+without any network calls. Refreshing sends conditional requests, so
+unchanged pages are not downloaded again.
+
+Modes:
+archive: serves archived pages, fetches missing ones
+revalidate: sends conditional requests for archived pages
+offline: serves archived pages only, never touches the network
+"""
+import collections
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import time
+import urllib.parse
+
+import src.utils.fetcher as fetcher
+
+# directory of the archived pages, next to the raw tables
+PREFIX = "../raw/html"
+
+# selects how archived pages are served, see module docstring
+MODE = "archive"
+
+# page as served to the parser, content holds the raw html
+Page = collections.namedtuple("Page", ["url", "content", "status_code"])
+
+
+def get(url):
+    """
+    Returns the page of the url according to the archive mode.
+
+    :param url: url of the page
+    :type url: str
+    :return: page with html content
+    :rtype: Page
+    """
+    meta = load_meta(url)
+
+    if meta and MODE != "revalidate":
+        return Page(url, load_content(url), 200)
+    if not meta and MODE == "offline":
+        raise SystemExit(f"{url} is not archived.")
+
+    headers = dict()
+    if meta and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = fetcher.get_fetcher().get(url, headers=headers)
+
+    if response.status_code == 304:
+        # page did not change, only note the revalidation
+        meta["revalidated"] = time.time()
+        store_meta(url, meta)
+        return Page(url, load_content(url), 200)
+    if response.status_code == 200:
+        store(url, response.content, response.headers)
+    return Page(url, response.content, response.status_code)
+
+
+@contextlib.contextmanager
+def using(mode):
+    """ Switches the archive mode within the context. """
+    global MODE
+    previous = MODE
+    MODE = mode
+    try:
+        yield
+    finally:
+        MODE = previous
+
+
+def get_path(url):
+    """
+    Returns the path of the archived page, grouped by host and keyed
+    by the hash of the url.
+
+    :param url: url of the page
+    :type url: str
+    :return: path without extension
+    :rtype: str
+    """
+    host = urllib.parse.urlparse(url).netloc
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(PREFIX, host, key)
+
+
+def load_content(url):
+    with gzip.open(get_path(url) + ".html.gz", "rb") as f:
+        return f.read()
+
+
+def load_meta(url):
+    path = get_path(url) + ".json"
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def store(url, content, headers):
+    """ Stores the compressed page and the metadata of the response. """
+    path = get_path(url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _write(path + ".html.gz", gzip.compress(content))
+    store_meta(url, {
+        "url": url,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "fetched": time.time(),
+        "revalidated": time.time(),
+    })
+
+
+def store_meta(url, meta):
+    _write(get_path(url) + ".json", json.dumps(meta, indent=2).encode("utf-8"))
+
+
+def _write(path, content):
+    # write to a temporary file first, so concurrent readers never see partial files
+    tmp = f"{path}.{os.getpid()}.{id(content)}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(content)
+    os.replace(tmp, path)
@@ -0,0 +1,200 @@
+"""
+Implements an in-process cache for the loaders.
+
+Loading a table reads the stored file and runs the cleaners, so loading
+the same week or schedule again in the same run is wasted work. The
+loaders are memoized on their arguments and the modification time of
+the stored file: if the file is fetched again or rewritten, the next
+call loads it again.
+
+Cached frames are read-only, callers get a copy by default. The cache
+is bounded by the memory of the cached frames and evicts the least
+recently used frame first.
+"""
+import collections
+import functools
+import inspect
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import src.utils.compact as compact
+import src.utils.storage as storage
+
+# caches the loaders if enabled
+ENABLED = True
+
+# maximum memory of the cached frames in bytes
+MAXSIZE = 512 * 1024 ** 2
+
+# returns copies of the cached frames, otherwise the read-only frames
+# are shared and writing to their values raises a ValueError
+COPY = True
+
+
+class Cache:
+    def __init__(self, maxsize=MAXSIZE):
+        self.maxsize = maxsize
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+
+    def get(self, key, mtime):
+        """ Returns the cached value if it was loaded from the same
+        version of the file, None otherwise. """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != mtime:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, mtime, value):
+        """ Caches the value and evicts the least recently used values
+        until the cache fits into its maximum size. """
+        size = get_size(value)
+        if size > self.maxsize:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[2]
+            self.entries[key] = (mtime, value, size)
+            self.size += size
+            while self.size > self.maxsize:
+                _, (_, _, evicted) = self.entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = self.size = 0
+
+    def info(self):
+        """
+        Returns the statistics of the cache.
+
+        :return: hits, misses, evictions, number of entries, size in bytes
+        :rtype: dict
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self.entries), "size": self.size}
+
+
+cache = Cache()
+
+
+def memoize(get_path):
+    """
+    Memoizes a loader on its arguments and the modification time of its
+    stored file.
+
+    :param get_path: returns the path of the stored file for the arguments of the loader
+    :type get_path: callable
+    :return: decorator
+    :rtype: callable
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__module__, func.__qualname__, freeze(bound.arguments), storage.BACKEND, compact.ENABLED)
+            path = get_path(*bound.args, **bound.kwargs)
+
+            entry = cache.get(key, get_mtime(path))
+            if entry is not None:
+                return share(entry[1])
+
+            value = func(*args, **kwargs)
+            # the file is stored by the loader if it was fetched
+            if isinstance(value, pd.DataFrame):
+                cache.put(key, get_mtime(path), protect(value.copy()))
+            else:
+                cache.put(key, get_mtime(path), value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def get_mtime(path):
+    """
+    Returns the modification times of the stored file, for csv files
+    also of its parquet file.
+
+    :param path: path of stored file
+    :type path: str
+    :return: modification times, None for missing files
+    :rtype: tuple
+    """
+    mtimes = list()
+    for p in {path, storage.get_parquet_path(path)}:
+        try:
+            mtimes.append((p, os.stat(p).st_mtime_ns))
+        except OSError:
+            mtimes.append((p, None))
+    return tuple(sorted(mtimes))
+
+
+def get_size(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return 0
+
+
+def freeze(value):
+    """ Converts the arguments to a hashable key, e.g. the column maps
+    of the team stats. """
+    if isinstance(value, dict):
+        return tuple((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple, range)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(freeze(v) for v in value)
+    return value
+
+
+def protect(df):
+    """ Marks the numpy arrays of the columns read-only, including the
+    arrays they are views of, e.g. the consolidated block of the float
+    columns. Extension columns, e.g. categoricals, are left writable. """
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        if not isinstance(column.dtype, np.dtype):
+            continue
+        values = column.to_numpy(copy=False)
+        while isinstance(values, np.ndarray):
+            values.flags.writeable = False
+            values = values.base
+    return df
+
+
+def share(value):
+    if not isinstance(value, pd.DataFrame):
+        return value
+    if COPY:
+        return value.copy()
+    return value.copy(deep=False)
+
+
+def info():
+    return cache.info()
+
+
+def clear():
+    cache.clear()
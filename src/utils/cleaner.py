@@ -1,7 +1,24 @@
+import collections
+import threading
+
 import numpy as np
+import pandas as pd
 
 import src.config.mapping as mapping
 
+# abbreviations of the teams by their aliases, i.e. abbreviations, names and former names
+ALIASES = {**{team: team for team in mapping.teams}, **mapping.team_map, **mapping.team_changes_map}
+
+# abbreviations of the teams by the codes appended to the names of projected players, e.g. Kyler MurrayARI
+CODES = {alias: team for alias, team in ALIASES.items() if alias.isupper()}
+
+# lengths of the codes, the longest is matched first
+LENGTHS = sorted({len(code) for code in CODES}, reverse=True)
+
+# aliases not found in the mappings with their number of rows
+unknown = collections.Counter()
+lock = threading.Lock()
+
 
 def add_columns(df, data):
     for key, val in data.items():
@@ -13,6 +30,23 @@ def assign_type(df, types):
     return df.astype(types)
 
 
+def clean(df, types):
+    df = drop_unnamed(df)
+    df = map_column_names(df, types)
+    return fix_columns(df, types)
+
+
+def fix_columns(df, types):
+    # removes the separators and assigns the type column at a time
+    return pd.DataFrame({column: fix_column(df[column], types[column]) for column in df.columns}, index=df.index)
+
+
+def fix_column(column, dtype):
+    if column.dtype == object and dtype is not str:
+        column = column.str.replace(",", "", regex=False).str.rstrip("%")
+    return column.astype(dtype)
+
+
 def check_columns(df):
     for column in df.columns.to_list():
         df[column] = df[column].apply(fix_thousands)
@@ -49,6 +83,38 @@ def get_team_projections(player):
                     return team
 
 
+def get_team_stats_column(players):
+    return players.str.extract(r"\(([^()]*)", expand=False)
+
+
+def split_team_projections(players):
+    """
+    Splits the team codes off the names of the projected players in one
+    pass, e.g. "Kyler MurrayARI" to "Kyler Murray" and "ARI". Names of
+    teams are mapped to their abbreviation.
+
+    The codes are looked up by the last characters of the names, which
+    is faster than pandas string methods on the small weekly frames.
+
+    :param players: names of the players with the team appended
+    :type players: pandas.Series
+    :return: names of the players and abbreviations of their teams, missing for free agents
+    :rtype: tuple of pandas.Series
+    """
+    names, teams = list(), list()
+    for player in players:
+        team = mapping.team_map.get(player)
+        if team is None and isinstance(player, str):
+            for length in LENGTHS:
+                team = CODES.get(player[-length:])
+                if team is not None:
+                    player = player[:-length]
+                    break
+        names.append(player)
+        teams.append(team)
+    return pd.Series(names, index=players.index, dtype=object), pd.Series(teams, index=players.index, dtype=object)
+
+
 def add_team_abbreviation(team):
     if team in mapping.teams:
         return team
@@ -61,12 +127,47 @@ def add_team_abbreviation(team):
         return team
 
 
+def add_team_abbreviation_column(teams):
+    """
+    Maps the aliases of the teams to their abbreviations, unknown
+    aliases are kept and counted in the report of get_unknown_aliases.
+
+    :param teams: aliases of the teams
+    :type teams: pandas.Series
+    :return: abbreviations of the teams
+    :rtype: pandas.Series
+    """
+    teams = teams.astype(object)
+    abbreviations = teams.map(ALIASES)
+    missing = abbreviations.isna() & teams.notna()
+    if missing.any():
+        with lock:
+            unknown.update(teams[missing].value_counts().to_dict())
+    return abbreviations.where(~missing, teams)
+
+
+def get_unknown_aliases():
+    """ Returns the aliases not found in the mappings with their number
+    of rows. """
+    with lock:
+        return collections.Counter(unknown)
+
+
+def clear_unknown_aliases():
+    with lock:
+        unknown.clear()
+
+
 def fix_player_stats(player):
     if '(' in player:
         return player.split('(')[0]
     return player
 
 
+def fix_player_stats_column(players):
+    return players.str.split("(", n=1, regex=False).str[0]
+
+
 def fix_player_projections(player):
     to_drop = ""
     for subname in player.split():
@@ -0,0 +1,135 @@
+"""
+Implements the compact representation of the loaded frames.
+
+By default the keys, e.g. player and team, are object columns of
+Python strings and all stats are 64 bit numbers. In compact mode the
+loaders and the summaries return the keys as categorical columns and
+downcast the stats to 32 bit floats and the smallest integer type
+holding their values, e.g. the week to int8.
+
+The categories of a key are shared by all frames: values seen for the
+first time are appended to the categories of the key, so the codes of
+frames loaded before stay valid. src.utils.accumulator.concat aligns
+the frames to the current categories before concatenating them, other
+concatenations fall back to object columns. Merges on keys with the
+same categories compare the integer codes instead of the strings.
+
+The mode is opt-in since float32 stats are rounded, e.g. 13.1 is stored
+as 13.100000381, and values missing in the categories cannot be
+assigned to a key column.
+"""
+import functools
+import threading
+
+import numpy as np
+import pandas as pd
+
+# returns compact frames if enabled
+ENABLED = False
+
+# columns stored as categoricals with shared categories
+KEYS = ["player", "team", "position", "opponent"]
+
+# shared categories of the keys, only ever appended to
+categories = dict()
+lock = threading.Lock()
+
+
+def compacted(func):
+    """
+    Compacts the frames returned by a loader if the compact mode is
+    enabled.
+
+    :param func: loader
+    :type func: callable
+    :return: loader returning compact frames
+    :rtype: callable
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return compact(func(*args, **kwargs))
+
+    return wrapper
+
+
+def compact(df):
+    """
+    Converts the keys of the frame to categoricals with the shared
+    categories and downcasts the numeric columns.
+
+    :param df: frame, returned unchanged if the compact mode is disabled
+    :type df: pandas.DataFrame
+    :return: compact frame
+    :rtype: pandas.DataFrame
+    """
+    if not ENABLED or not isinstance(df, pd.DataFrame):
+        return df
+
+    columns = dict()
+    for column, series in df.items():
+        if column in KEYS and (series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype)):
+            columns[column] = pd.Categorical(series, categories=get_categories(column, series))
+        elif pd.api.types.is_float_dtype(series):
+            columns[column] = series.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(series):
+            columns[column] = pd.to_numeric(series, downcast="integer")
+        else:
+            columns[column] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def align(df):
+    """ Sets the categories of the keys of a compact frame to the
+    current shared categories, frames with the same categories are
+    concatenated and merged on their codes. """
+    if not ENABLED:
+        return df
+
+    # the categories are only appended to, frames with as many categories have the current ones
+    columns = [column for column in KEYS if column in df.columns and column in categories
+               and isinstance(df[column].dtype, pd.CategoricalDtype)
+               and len(df[column].cat.categories) != len(categories[column])]
+    if not columns:
+        return df
+
+    df = df.copy(deep=False)
+    for column in columns:
+        df[column] = df[column].cat.set_categories(categories[column])
+    return df
+
+
+def get_categories(column, values):
+    """
+    Returns the shared categories of a key, the values not seen before
+    are appended.
+
+    :param column: key
+    :type column: str
+    :param values: values of the key
+    :type values: pandas.Series
+    :return: categories
+    :rtype: pandas.Index
+    """
+    values = pd.Index(pd.unique(values.dropna().to_numpy(dtype=object)), dtype=object)
+    with lock:
+        known = categories.get(column)
+        if known is None:
+            known = categories[column] = values
+        else:
+            new = values[~values.isin(known)]
+            if len(new):
+                known = categories[column] = known.append(new)
+        return known
+
+
+def get_memory(df):
+    """ Returns the memory of the frame in bytes, including the strings
+    of object columns. """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def clear():
+    """ Drops the shared categories, frames compacted before are not
+    aligned to the new ones anymore. """
+    with lock:
+        categories.clear()
@@ -0,0 +1,173 @@
+"""
+Implements a streaming extractor for html tables.
+
+Instead of building the full document tree, the page is tokenized once
+and only the cells of the target tables are collected. The result is
+the same as building the tree with BeautifulSoup and the html.parser,
+searching the tables and reading their rows with get_text(strip=True):
+text is stripped per string, comments, scripts and styles are skipped
+and unclosed tags nest the same way.
+"""
+import html.parser
+
+# elements without content, these are never pushed to the stack
+VOID_ELEMENTS = {"area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image",
+                 "img", "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source",
+                 "spacer", "track", "wbr"}
+
+# elements whose text is not part of the extracted cells
+SKIPPED_ELEMENTS = {"script", "style", "template"}
+
+
+class TableExtractor(html.parser.HTMLParser):
+    def __init__(self, identifier):
+        html.parser.HTMLParser.__init__(self, convert_charrefs=True)
+        self.name, self.attrs = identifier
+        self.tables = list()
+
+        # open elements as (name, record), the record holds the rows of a
+        # target table, the cells of a row or the strings of a cell
+        self.stack = list()
+        self.counter = dict()
+        self.open_tables = list()
+        self.open_rows = list()
+        self.open_cells = list()
+        self.skipped = 0
+        self.text = list()
+
+    def matches(self, tag, attrs):
+        """ Checks if the table matches the identifier, multi-valued
+        class attributes match on any of their values. """
+        if tag != self.name:
+            return False
+        attrs = dict(attrs)
+        for key, value in self.attrs.items():
+            if key not in attrs or attrs[key] is None:
+                return False
+            if key == "class":
+                if value not in attrs[key].split() and value != attrs[key]:
+                    return False
+            elif value != attrs[key]:
+                return False
+        return True
+
+    def flush(self):
+        if self.text:
+            string = "".join(self.text).strip()
+            self.text = list()
+            if string:
+                for cell in self.open_cells:
+                    cell.append(string)
+
+    def handle_starttag(self, tag, attrs):
+        self.flush()
+        if tag in VOID_ELEMENTS:
+            return
+
+        record = None
+        if tag == "table" and self.matches(tag, attrs):
+            record = list()
+            self.tables.append(record)
+            self.open_tables.append(record)
+        elif self.open_tables:
+            if tag == "tr":
+                record = ([], [])
+                for table in self.open_tables:
+                    table.append(record)
+                self.open_rows.append(record)
+            elif tag == "th" or tag == "td":
+                record = list()
+                for row in self.open_rows:
+                    row[0 if tag == "th" else 1].append(record)
+                self.open_cells.append(record)
+        if tag in SKIPPED_ELEMENTS:
+            self.skipped += 1
+
+        self.stack.append((tag, record))
+        self.counter[tag] = self.counter.get(tag, 0) + 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self.flush()
+        if not self.counter.get(tag):
+            return
+        while self.stack:
+            name, record = self.stack.pop()
+            self.counter[name] -= 1
+            if name in SKIPPED_ELEMENTS:
+                self.skipped -= 1
+            # records close in the same order as they were opened
+            if record is not None:
+                if name == "table":
+                    self.open_tables.pop()
+                elif name == "tr":
+                    self.open_rows.pop()
+                else:
+                    self.open_cells.pop()
+            if name == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.skipped and self.open_cells:
+            self.text.append(data)
+
+    def handle_comment(self, data):
+        self.flush()
+
+    def handle_decl(self, decl):
+        self.flush()
+
+    def handle_pi(self, data):
+        self.flush()
+
+    def get_tables(self):
+        """
+        Returns the rows of the target tables, the same way as
+        parser.get_table_data: the header rows followed by all rows
+        after the last header row.
+
+        :return: rows of each table
+        :rtype: list of lists
+        """
+        data = list()
+        for table in self.tables:
+            rows = list()
+            header = 0
+            for j, (th, _) in enumerate(table):
+                if th:
+                    rows.append(["".join(cell) for cell in th])
+                    header = j
+            for _, td in table[header + 1:]:
+                rows.append(["".join(cell) for cell in td])
+            data.append(rows)
+        return data
+
+
+def extract(content, identifier):
+    """
+    Extracts the rows of all tables matching the identifier.
+
+    :param content: html page
+    :type content: bytes or str
+    :param identifier: tag name and attributes of the tables, e.g. ("table", {"class": "table"})
+    :type identifier: tuple
+    :return: rows of each table
+    :rtype: list of lists
+    """
+    if isinstance(content, bytes):
+        content = decode(content)
+    extractor = TableExtractor(identifier)
+    extractor.feed(content)
+    extractor.close()
+    extractor.flush()
+    return extractor.get_tables()
+
+
+def decode(content):
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return content.decode("windows-1252", errors="replace")
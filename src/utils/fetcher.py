@@ -0,0 +1,155 @@
+"""
+Implements the concurrent, rate-limited fetching of the raw data.
+
+All requests share one pooled session. Requests to the same host are
+spaced by a minimum interval and failed requests are retried with
+exponential backoff. Bulk updates fetch the targets on a thread pool
+and skip every target that is already cached.
+"""
+import concurrent.futures
+import threading
+import time
+import urllib.parse
+
+import requests
+import requests.adapters
+import tqdm
+
+# number of concurrent downloads
+WORKERS = 8
+
+# minimum interval between two requests to the same host in seconds
+RATE_LIMIT = 0.5
+
+# number of retries and base delay in seconds of the exponential backoff
+RETRIES = 4
+BACKOFF = 1.0
+
+# timeout of a single request in seconds
+TIMEOUT = 30
+
+# status codes worth a retry
+RETRY_STATUS = [429, 500, 502, 503, 504]
+
+
+class RateLimiter:
+    def __init__(self, interval=RATE_LIMIT):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.slots = dict()
+
+    def wait(self, url):
+        """ Blocks until the next request to the host of the url is
+        allowed. """
+        host = urllib.parse.urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.slots.get(host, now))
+            self.slots[host] = slot + self.interval
+        time.sleep(slot - now)
+
+
+class Fetcher:
+    def __init__(self, workers=WORKERS, interval=RATE_LIMIT, retries=RETRIES, backoff=BACKOFF):
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.limiter = RateLimiter(interval)
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes = 0
+
+    def get(self, url, headers=None):
+        """
+        Requests the url, retries with exponential backoff on
+        connection errors and server side failures.
+
+        :param url: url to request
+        :type url: str
+        :param headers: additional request headers
+        :type headers: dict
+        :return: response of the last attempt
+        :rtype: requests.Response
+        """
+        for attempt in range(self.retries + 1):
+            self.limiter.wait(url)
+            try:
+                response = self.session.get(url, headers=headers, timeout=TIMEOUT)
+            except requests.exceptions.RequestException:
+                if attempt == self.retries:
+                    raise
+            else:
+                with self.lock:
+                    self.requests += 1
+                    self.bytes += len(response.content)
+                if response.status_code not in RETRY_STATUS or attempt == self.retries:
+                    return response
+            time.sleep(self.backoff * 2 ** attempt)
+
+    def run(self, targets, exists, store, workers=None, failed=None):
+        """
+        Fetches all targets that are not cached yet on a thread pool
+        and reports progress and throughput.
+
+        :param targets: targets as path of the cached file, fetch function and its arguments
+        :type targets: list of (str, callable, tuple)
+        :param exists: checks if a path is cached
+        :type exists: callable
+        :param store: stores the fetched data to a path
+        :type store: callable
+        :param workers: number of concurrent downloads, defaults to the pool size
+        :type workers: int
+        :param failed: called with the path and the error of each failed target
+        :type failed: callable
+        :return: number of fetched, skipped and failed targets and the elapsed time
+        :rtype: dict
+        """
+        pending = [target for target in targets if not exists(target[0])]
+        summary = {"fetched": 0, "skipped": len(targets) - len(pending), "failed": 0, "seconds": 0.0}
+        requests_, bytes_ = self.requests, self.bytes
+
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers or self.workers) as executor:
+            futures = {executor.submit(download, store, *target): target for target in pending}
+            for future in tqdm.tqdm(concurrent.futures.as_completed(futures), total=len(futures), unit="target"):
+                try:
+                    future.result()
+                    summary["fetched"] += 1
+                except (Exception, SystemExit) as e:
+                    path, fetch, args = futures[future]
+                    print(f"{fetch.__name__}{args} failed: {e}")
+                    summary["failed"] += 1
+                    if failed is not None:
+                        failed(path, e)
+        summary["seconds"] = time.perf_counter() - start
+
+        n_requests = self.requests - requests_
+        n_bytes = self.bytes - bytes_
+        seconds = max(summary["seconds"], 1e-9)
+        print(f"fetched {summary['fetched']}, skipped {summary['skipped']}, failed {summary['failed']} targets "
+              f"in {summary['seconds']:.1f} s ({n_requests / seconds:.2f} requests/s, "
+              f"{n_bytes / seconds / 1024:.1f} kB/s)")
+        return summary
+
+
+def download(store, path, fetch, args):
+    store(path, fetch(*args))
+
+
+fetcher = Fetcher()
+
+
+def get_fetcher():
+    """
+    Returns the fetcher shared by all requests.
+
+    :return: shared fetcher
+    :rtype: Fetcher
+    """
+    return fetcher
@@ -1,9 +1,13 @@
-import os
 import pandas as pd
 import gzip
 import shutil
 
 import src.utils.parser as parser
+import src.utils.storage as storage
+
+
+def exists(path):
+    return storage.get_backend().exists(path)
 
 
 def extract_data(url, path):
@@ -22,16 +26,15 @@ def get_from_fantasypros(url):
     return parser.fetch(url, identifier)
 
 
+def load(path):
+    return storage.get_backend().load(path)
+
+
 def load_data(path):
-    df = pd.DataFrame()
     chunks = pd.read_csv(path, iterator=True, low_memory=False, chunksize=10000)
-    for chunk in chunks:
-        df = pd.concat([df, chunk])
-    return df
+    return pd.concat(chunks)
 
 
 def store(path, df):
-    if not os.path.exists(os.path.dirname(path)):
-        os.makedirs(os.path.join(os.getcwd(), os.path.dirname(path)))
-    df.to_csv(path, index=False)
+    storage.get_backend().store(path, df)
 
@@ -0,0 +1,211 @@
+"""
+Implements the freshness manifest of the stored data.
+
+The manifest records for every stored raw partition when it was
+fetched, the hash of its content and its number of rows. For every
+preprocessed summary it records when it was built and the hashes of the
+sources it was built from, and each source lists its dependents.
+
+An update fetches only partitions that are missing, failed before, came
+back empty or belong to the in-progress season and are older than
+MAX_AGE. Since every stored partition is recorded right away and the
+stored files are the ground truth for what exists, an interrupted update
+resumes where it stopped. A summary is outdated if one of its sources
+has another hash than when the summary was built.
+"""
+import datetime
+import hashlib
+import json
+import os
+import threading
+
+import src.utils.io as io
+import src.utils.storage as storage
+
+PATH = "../raw/manifest.json"
+
+# partitions of the in-progress season older than this are fetched again
+MAX_AGE = datetime.timedelta(hours=12)
+
+# number of changes after which the manifest is written to disk
+FLUSH = 50
+
+
+class Manifest:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.RLock()
+        self.changes = 0
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                self.entries = json.load(f)
+        else:
+            self.entries = dict()
+
+    def get(self, path):
+        """ Returns the entry of a stored file, files stored before the
+        manifest existed are recorded on first access. """
+        path = os.path.normpath(path)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is None and is_stored(path):
+                mtime = os.path.getmtime(get_stored_file(path))
+                fetched = datetime.datetime.fromtimestamp(mtime, datetime.timezone.utc)
+                entry = {"fetched": fetched.isoformat(), "hash": get_hash(path), "rows": None, "status": "ok"}
+                self._set(path, entry)
+            return entry
+
+    def is_stale(self, path, live=False, max_age=MAX_AGE):
+        """
+        Checks if a raw partition has to be fetched.
+
+        :param path: path of the raw partition
+        :type path: str
+        :param live: the partition belongs to the in-progress season and changes
+        :type live: bool
+        :param max_age: maximum age of live partitions
+        :type max_age: datetime.timedelta
+        :return: partition is missing, failed, empty or outdated
+        :rtype: bool
+        """
+        if not is_stored(path):
+            return True
+        entry = self.get(path)
+        if entry.get("status") != "ok" or entry.get("rows") == 0:
+            return True
+        if live:
+            return get_age(entry["fetched"]) > max_age
+        return False
+
+    def is_outdated(self, path, sources):
+        """
+        Checks if a summary has to be rebuilt.
+
+        :param path: path of the summary
+        :type path: str
+        :param sources: paths of the stored data the summary is built from
+        :type sources: list of str
+        :return: summary is missing or one of its sources changed
+        :rtype: bool
+        """
+        if not is_stored(path):
+            return True
+        entry = self.get(os.path.normpath(path))
+        recorded = entry.get("sources")
+        if recorded is None:
+            return True
+        current = {os.path.normpath(source): self.get_hash(source) for source in sources}
+        return current != recorded
+
+    def get_hash(self, path):
+        entry = self.get(path)
+        return entry["hash"] if entry is not None else None
+
+    def get_dependents(self, path):
+        entry = self.get(path)
+        return entry.get("dependents", list()) if entry is not None else list()
+
+    def record_fetch(self, path, rows):
+        """ Records a fetched and stored raw partition. """
+        path = os.path.normpath(path)
+        with self.lock:
+            entry = dict(self.entries.get(path, dict()))
+            entry.update({"fetched": now(), "hash": get_hash(path), "rows": rows, "status": "ok"})
+            entry.pop("error", None)
+            self._set(path, entry)
+
+    def record_failure(self, path, error):
+        """ Records a raw partition that could not be fetched. """
+        path = os.path.normpath(path)
+        with self.lock:
+            entry = dict(self.entries.get(path, dict()))
+            entry.update({"status": "failed", "error": str(error), "failed": now()})
+            self._set(path, entry)
+
+    def record_build(self, path, sources):
+        """ Records a built summary with the hashes of its sources and
+        registers it as dependent of each source. """
+        path = os.path.normpath(path)
+        with self.lock:
+            recorded = dict()
+            for source in sources:
+                source = os.path.normpath(source)
+                recorded[source] = self.get_hash(source)
+                if source in self.entries:
+                    dependents = self.entries[source].setdefault("dependents", list())
+                    if path not in dependents:
+                        dependents.append(path)
+            entry = dict(self.entries.get(path, dict()))
+            entry.update({"built": now(), "hash": get_hash(path), "sources": recorded, "status": "ok"})
+            self._set(path, entry)
+
+    def _set(self, path, entry):
+        self.entries[path] = entry
+        self.changes += 1
+        if self.changes >= FLUSH:
+            self.save()
+
+    def save(self):
+        """ Writes the manifest atomically. """
+        with self.lock:
+            if not self.changes:
+                return
+            storage.make_dirs(self.path)
+            with open(self.path + ".tmp", "w") as f:
+                json.dump(self.entries, f, indent=1, sort_keys=True)
+            os.replace(self.path + ".tmp", self.path)
+            self.changes = 0
+
+
+manifest = None
+
+
+def get_manifest():
+    """ Returns the manifest stored at PATH. """
+    global manifest
+    if manifest is None or manifest.path != PATH:
+        manifest = Manifest(PATH)
+    return manifest
+
+
+def store(path, df):
+    """ Stores a fetched raw partition and records it. """
+    io.store(path, df)
+    get_manifest().record_fetch(path, len(df))
+
+
+def record_failure(path, error):
+    get_manifest().record_failure(path, error)
+
+
+def save():
+    get_manifest().save()
+
+
+def is_stored(path):
+    return os.path.exists(path) or io.exists(path)
+
+
+def get_stored_file(path):
+    """ Returns the file the data of the path is stored in by the current
+    backend, falls back to the file of the other backend. """
+    for stored in [storage.get_backend().get_stored_path(path), path, storage.get_parquet_path(path)]:
+        if os.path.exists(stored):
+            return stored
+    raise FileNotFoundError(path)
+
+
+def get_hash(path):
+    sha1 = hashlib.sha1()
+    with open(get_stored_file(path), "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+def get_age(timestamp):
+    return datetime.datetime.now(datetime.timezone.utc) - datetime.datetime.fromisoformat(timestamp)
+
+
+def now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
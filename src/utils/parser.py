@@ -1,18 +1,29 @@
 import bs4
 import requests
 
+import src.utils.archive as archive
+import src.utils.extractor as extractor
+import src.utils.fetcher as fetcher
+
 
 def fetch(url, identifier):
-    return get_data(get_content(get_soup(get_request(url)), identifier))
+    return extractor.extract(get_page(url).content, identifier)
 
 
 def get_content(soup, *args):
     return soup.find_all(*args)
 
 
+def get_page(url):
+    try:
+        return archive.get(url)
+    except requests.exceptions.RequestException as e:
+        raise SystemExit(e)
+
+
 def get_request(url):
     try:
-        return requests.get(url)
+        return fetcher.get_fetcher().get(url)
     except requests.exceptions.RequestException as e:
         raise SystemExit(e)
 
@@ -0,0 +1,177 @@
+"""
+Implements the storage backends for the raw data cache.
+
+The loaders cache every scraped table in one file per position, week
+and year. The csv backend stores these tables as plain text. The
+parquet backend stores typed, columnar files in the same directory
+layout, i.e. partitioned by year, position and week, so reading them
+back skips the text parsing and type inference.
+
+Existing csv files are migrated one-way: the parquet backend converts
+a csv file the first time it is loaded and leaves the csv in place.
+"""
+import os
+import pandas as pd
+
+# selects the backend used by the loaders, either "csv" or "parquet"
+BACKEND = "csv"
+
+
+class Storage:
+    def exists(self, path):
+        raise NotImplementedError
+
+    def load(self, path):
+        raise NotImplementedError
+
+    def store(self, path, df):
+        raise NotImplementedError
+
+    def get_stored_path(self, path):
+        raise NotImplementedError
+
+
+class CsvStorage(Storage):
+    def exists(self, path):
+        """ Checks if the csv file is stored. """
+        return os.path.exists(path)
+
+    def load(self, path):
+        """ Loads the stored csv file. """
+        return pd.read_csv(path)
+
+    def store(self, path, df):
+        """ Stores the data as csv file. """
+        make_dirs(path)
+        df.to_csv(path, index=False)
+
+    def get_stored_path(self, path):
+        """ Returns the path of the stored csv file. """
+        return path
+
+
+class ParquetStorage(Storage):
+    def exists(self, path):
+        """ Checks if the parquet file or its csv source is stored. """
+        return os.path.exists(get_parquet_path(path)) or os.path.exists(path)
+
+    def load(self, path):
+        """ Loads the stored parquet file, migrates the csv file if not
+        done yet. """
+        if not os.path.exists(get_parquet_path(path)):
+            self.store(path, pd.read_csv(path))
+        return pd.read_parquet(get_parquet_path(path))
+
+    def store(self, path, df):
+        """ Stores the data as typed parquet file. """
+        make_dirs(path)
+        assign_types(df).to_parquet(get_parquet_path(path), index=False)
+
+    def get_stored_path(self, path):
+        """ Returns the path of the parquet file or, if not migrated
+        yet, of its csv source. """
+        if os.path.exists(get_parquet_path(path)):
+            return get_parquet_path(path)
+        return path
+
+
+def get_backend():
+    """
+    Returns the storage backend selected by BACKEND.
+
+    :return: storage backend
+    :rtype: Storage
+    """
+    return backends[BACKEND]
+
+
+def get_parquet_path(path):
+    """
+    Maps the path of a csv file to the path of its parquet file in the
+    same partition directory.
+
+    :param path: path of csv file
+    :type path: str
+    :return: path of parquet file
+    :rtype: str
+    """
+    return os.path.splitext(path)[0] + ".parquet"
+
+
+def make_dirs(path):
+    # concurrent loaders may create the same directory
+    os.makedirs(os.path.join(os.getcwd(), os.path.dirname(path)), exist_ok=True)
+
+
+def assign_types(df):
+    """
+    Types the raw table for the columnar storage. The column names are
+    made unique the same way as pandas.read_csv does and every column
+    holding numbers only, also with thousands separators, is stored as
+    number. All other columns are stored as text.
+
+    :param df: raw table
+    :type df: pandas.DataFrame
+    :return: typed table
+    :rtype: pandas.DataFrame
+    """
+    df = df.copy()
+    df.columns = get_unique_columns(df.columns)
+    for column in df.columns:
+        if df[column].dtype == object:
+            try:
+                df[column] = pd.to_numeric(df[column].str.replace(",", "", regex=False))
+            except (AttributeError, ValueError):
+                # non-numeric column, e.g. player names, keep missing values
+                df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+    return df
+
+
+def get_unique_columns(columns):
+    """
+    Renames empty and duplicate column names as done when reading the
+    csv file, e.g. "" to "Unnamed: 0" and "ATT" to "ATT.1".
+
+    :param columns: column names
+    :type columns: list of str
+    :return: unique column names
+    :rtype: list of str
+    """
+    unique = list()
+    counts = dict()
+    for i, column in enumerate(columns):
+        column = str(column) if str(column) else f"Unnamed: {i}"
+        if column in counts:
+            counts[column] += 1
+            unique.append(f"{column}.{counts[column]}")
+        else:
+            counts[column] = 0
+            unique.append(column)
+    return unique
+
+
+def migrate(prefix):
+    """
+    Migrates all csv files below the prefix to parquet files. The
+    migration is one-way, the csv files are kept.
+
+    :param prefix: root directory of the raw data
+    :type prefix: str
+    :return: number of migrated files
+    :rtype: int
+    """
+    backend = backends["parquet"]
+    n = 0
+    for root, _, files in os.walk(prefix):
+        for file in files:
+            path = os.path.join(root, file)
+            if path.endswith(".csv") and not os.path.exists(get_parquet_path(path)):
+                backend.store(path, pd.read_csv(path))
+                n += 1
+    return n
+
+
+backends = {
+    "csv": CsvStorage(),
+    "parquet": ParquetStorage(),
+}
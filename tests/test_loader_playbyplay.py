@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import src.loader.playbyplay as playbyplay
+import src.loader.statistics as stats
+
+
+def get_season(year, n=2500):
+    rng = np.random.default_rng(year)
+    return pd.DataFrame({
+        "play_id": np.arange(n),
+        "week": rng.integers(1, 18, n),
+        "posteam": rng.choice(["ARI", "BUF", "KC", "TB"], n),
+        "rusher_player_name": rng.choice(["J.Conner", "D.Singletary", None], n),
+        "rush_attempt": rng.integers(0, 2, n).astype(float),
+        "rush_touchdown": rng.integers(0, 2, n).astype(float),
+        "yardline_100": rng.integers(1, 100, n).astype(float),
+        "two_point_attempt": rng.choice([0.0, 1.0, np.nan], n, p=[0.9, 0.05, 0.05]),
+        "desc": [f"play {i}, {year}" for i in range(n)],
+    })
+
+
+class TestLoaderPlayByPlay(unittest.TestCase):
+    def setUp(self):
+        self.prefix, self.source = playbyplay.PREFIX, playbyplay.SOURCE
+        self.tmp = tempfile.mkdtemp()
+        playbyplay.PREFIX = os.path.join(self.tmp, "raw")
+        playbyplay.SOURCE = os.path.join(self.tmp, "source")
+        os.makedirs(playbyplay.SOURCE)
+        for year in [2019, 2020, 2021]:
+            get_season(year).to_csv(os.path.join(playbyplay.SOURCE, f"play_by_play_{year}.csv.gz"), index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+        playbyplay.PREFIX, playbyplay.SOURCE = self.prefix, self.source
+
+    def test_get_playbyplay(self):
+        df = playbyplay.get_playbyplay(2021)
+        expected = get_season(2021)
+        expected["year"] = 2021
+
+        self.assertTrue(os.path.exists(playbyplay.get_playbyplay_path(2021)))
+        pd.testing.assert_frame_equal(expected, df, check_dtype=False)
+
+    def test_get_playbyplay_columns(self):
+        df = playbyplay.get_playbyplay(2021, columns=["rusher_player_name", "yardline_100"])
+        self.assertListEqual(["rusher_player_name", "yardline_100"], df.columns.to_list())
+        self.assertEqual(2500, df.shape[0])
+
+    def test_get_playbyplay_filters(self):
+        df = playbyplay.get_playbyplay(2021, columns=["rush_touchdown", "yardline_100"],
+                                       filters=[("two_point_attempt", "==", 0), ("rush_attempt", "==", 1)])
+        expected = get_season(2021)
+        expected = expected.loc[(expected["two_point_attempt"] == 0) & (expected["rush_attempt"] == 1)]
+        self.assertListEqual(expected["yardline_100"].to_list(), df["yardline_100"].to_list())
+
+    def test_get_accumulated_playbyplay(self):
+        df = playbyplay.get_accumulated_playbyplay([2019, 2020, 2021], columns=["week", "year"],
+                                                   filters=[("week", "<=", 4)])
+        self.assertListEqual([2019, 2020, 2021], df["year"].unique().tolist())
+        self.assertTrue((df["week"] <= 4).all())
+        self.assertListEqual(list(range(df.shape[0])), df.index.to_list())
+
+    def test_convert_extracted(self):
+        os.makedirs(os.path.join(playbyplay.PREFIX, "play-by-play"))
+        get_season(2021, 10).to_csv(os.path.join(playbyplay.PREFIX, "play-by-play", "play_by_play_2021.csv"),
+                                    index=False)
+        self.assertEqual(10, playbyplay.get_playbyplay(2021).shape[0])
+
+    def test_get_playbyplay_stats(self):
+        df = stats.get_playbyplay_stats(2020, columns=["posteam", "year"])
+        self.assertEqual((2500, 2), df.shape)
+
+
+if __name__ == "__main__":
+    unittest.main()
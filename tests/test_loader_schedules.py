@@ -1,10 +1,67 @@
 import unittest
 
+import numpy as np
+
 import src.loader.schedules as schedules
 
+YEARS = range(2016, 2022)
+
 
 class TestLoaderSchedules(unittest.TestCase):
     def test_get_schedule(self):
         df = schedules.get_schedule(2021)
         self.assertEqual(32 * 18, df.shape[0])
         self.assertEqual(5, df.shape[1])
+
+    def test_get_schedule_games(self):
+        df = schedules.get_schedule(2021)
+        self.assertListEqual(["team", "opponent", "week", "home", "year"], df.columns.to_list())
+        self.assertListEqual(list(range(1, 19)), df.loc[df["team"] == "ARI", "week"].to_list())
+
+        ari = df.loc[df["team"] == "ARI"].set_index("week")
+        self.assertEqual("TEN", ari.loc[1, "opponent"])
+        self.assertFalse(ari.loc[1, "home"])
+        self.assertEqual("MIN", ari.loc[2, "opponent"])
+        self.assertTrue(ari.loc[2, "home"])
+        self.assertEqual("BYE", ari.loc[12, "opponent"])
+        self.assertTrue(np.isnan(ari.loc[12, "home"]))
+
+    def test_get_schedules(self):
+        df = schedules.get_schedules(YEARS)
+        self.assertEqual(32 * 17 * 5 + 32 * 18, df.shape[0])
+        self.assertListEqual(list(YEARS), df["year"].unique().tolist())
+
+
+class TestScheduleIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.schedule = schedules.get_schedules(YEARS)
+        cls.index = schedules.ScheduleIndex(cls.schedule)
+
+    def test_get(self):
+        self.assertEqual(("TEN", False), self.index.get(2021, "ARI", 1))
+        self.assertEqual(("MIN", True), self.index.get(2021, "ARI", 2))
+        opponent, home = self.index.get(2021, "ARI", 12)
+        self.assertEqual("BYE", opponent)
+        self.assertTrue(np.isnan(home))
+
+    def test_get_missing(self):
+        self.assertRaises(KeyError, self.index.get, 2015, "ARI", 1)
+        self.assertRaises(KeyError, self.index.get, 2021, "XXX", 1)
+        self.assertRaises(KeyError, self.index.get, 2020, "ARI", 18)
+
+    def test_lookup(self):
+        df = self.index.lookup(self.schedule["year"], self.schedule["team"], self.schedule["week"])
+        self.assertListEqual(self.schedule["opponent"].to_list(), df["opponent"].to_list())
+        expected = self.schedule["home"].fillna("bye").to_list()
+        self.assertListEqual(expected, df["home"].fillna("bye").to_list())
+
+    def test_lookup_missing(self):
+        df = self.index.lookup([2021, 2015, 2021, 2021], ["ARI", "ARI", "XXX", "ARI"], [2, 1, 1, 19])
+        self.assertEqual("MIN", df["opponent"].iloc[0])
+        self.assertTrue(df["opponent"].iloc[1:].isna().all())
+        self.assertTrue(df["home"].iloc[1:].isna().all())
+
+
+if __name__ == "__main__":
+    unittest.main()
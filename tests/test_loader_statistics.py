@@ -68,6 +68,10 @@ class TestLoaderStatisticsFantasyPros(unittest.TestCase):
         self.assertEqual(32, df.shape[0])
         self.assertEqual(14, df.shape[1])
 
+        abbreviated = stats.get_points_allowed(2021, abbreviated=True)
+        self.assertListEqual(df["pa_rb"].to_list(), abbreviated["pa_rb"].to_list())
+        self.assertEqual("DEN", abbreviated.loc[df["team"] == "Denver Broncos", "team"].iloc[0])
+
 
 class TestLoaderStatisticsEspn(unittest.TestCase):
     def test_get_offense_passing(self):
@@ -111,6 +115,49 @@ class TestLoaderStatisticsEspn(unittest.TestCase):
         self.assertEqual(15, df.shape[1])
 
 
+class TestLoaderDerived(unittest.TestCase):
+    def tearDown(self):
+        stats.DERIVED = False
+
+    def test_derive_yearly_stats(self):
+        df = stats.derive_yearly_stats("RB", 2021)
+        scraped = stats.get_yearly_stats("RB", 2021)
+        self.assertListEqual(scraped.columns.to_list(), df.columns.to_list())
+        self.assertEqual(len(scraped), len(df))
+
+        # totals are summed, the longest run is the maximum, the rates are recomputed from the totals
+        taylor = df.loc[df["player"] == "Jonathan Taylor"].iloc[0]
+        self.assertListEqual([332.0, 1811.0, 83.0, 17.0], taylor[["rushing_att", "rushing_yds", "rushing_lng",
+                                                                 "games"]].to_list())
+        self.assertAlmostEqual(1811 / 332, taylor["rushing_avg"])
+        self.assertAlmostEqual(taylor["fantasy_points"] / 17, taylor["fantasy_points_per_game"])
+        # the season page rounds the rates to one decimal
+        derived = df.set_index("player").loc[scraped["player"], "rushing_avg"].to_numpy()
+        self.assertTrue((abs(derived - scraped["rushing_avg"].to_numpy()) <= 0.05 + 1e-9).all())
+
+    def test_derive_yearly_snapcounts(self):
+        df = stats.derive_yearly_snapcounts(2021)
+        scraped = stats.get_yearly_snapcounts(2021)
+        self.assertListEqual(scraped.columns.to_list(), df.columns.to_list())
+
+        rodgers = df.loc[df["player"] == "Aaron Rodgers"].iloc[0]
+        self.assertEqual(983.0, rodgers["snaps"])
+        self.assertAlmostEqual(983 / 16, rodgers["snaps_per_game"])
+        self.assertAlmostEqual(336.3 / 983 * 100, rodgers["points_per_100_snaps"])
+        self.assertEqual(93, round(rodgers["snaps_pct"]))
+        self.assertIsNone(stats.derive_yearly_snapcounts(2015))
+
+    def test_derived_mode(self):
+        stats.DERIVED = True
+        self.assertFalse([path for path, _, _ in stats.get_targets([2021]) if "yearly" in path])
+        df = stats.get_accumulated_yearly_stats("QB")
+        self.assertEqual(932, df.shape[0])
+        self.assertEqual(19, df.shape[1])
+
+        stats.DERIVED = False
+        self.assertEqual(5, len([path for path, _, _ in stats.get_targets([2021]) if "yearly" in path]))
+
+
 class TestLoaderAccumulated(unittest.TestCase):
     def test_get_accumulated_weekly_stats(self):
         df = stats.get_accumulated_weekly_stats("QB", 2021)
@@ -137,6 +184,13 @@ class TestLoaderAccumulated(unittest.TestCase):
         self.assertEqual(1059, df.shape[0])
         self.assertEqual(15, df.shape[1])
 
+    def test_get_accumulated_lazy(self):
+        weeks = [df.week.unique().tolist() for df in stats.get_accumulated_weekly_stats("QB", 2021, lazy=True)]
+        self.assertListEqual([[week] for week in range(1, 19)], weeks)
+
+        years = [df.year.unique().tolist() for df in stats.get_accumulated_yearly_snapcounts(lazy=True)]
+        self.assertListEqual([[year] for year in range(2021, 2015, -1)], years)
+
     def test_get_offense_stats(self):
         df = stats.get_offense_stats(2021)
         self.assertEqual(32, df.shape[0])
@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from src.config.mapping import week_map
+from src.metrics.leaders import Leaders
+from src.preprocessing.statistics.stats import Stats
+
+
+class TestLeaders(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.metrics = ["receiving_rec", "receiving_yds", "receiving_td"]
+        cls.leaders = Leaders("WR", [2020, 2021], cls.metrics)
+
+    def test_cube(self):
+        cube = self.leaders.get_cube()
+        self.assertIs(cube, self.leaders.get_cube())
+        self.assertListEqual(["games"] + self.metrics, cube.columns.unique(level="metric").to_list())
+        self.assertListEqual(list(range(1, 19)), cube.columns.unique(level="week").to_list())
+
+        # the 17 weeks of 2020 hold no games in week 18
+        self.assertEqual(0, cube.loc[2020, ("games", 18)].sum())
+        self.assertGreater(cube.loc[2021, ("games", 18)].sum(), 0)
+
+    def test_totals(self):
+        table = self.leaders.get_data()
+        self.assertIs(table, self.leaders.get_data())
+        for year in [2020, 2021]:
+            expected = Stats("WR", year).get_accumulated_data().groupby(["player", "team"], observed=True)[
+                ["games"] + self.metrics].sum()
+            season = table.loc[table["year"] == year].set_index(["player", "team"]).loc[expected.index]
+            np.testing.assert_allclose(expected["games"], season["games"])
+            for metric in self.metrics:
+                np.testing.assert_allclose(expected[metric], season[f"total_{metric}"])
+                np.testing.assert_allclose(expected[metric] / expected["games"], season[f"{metric}_per_game"])
+
+    def test_leaders(self):
+        leaders = self.leaders.get_leaders("receiving_yds", 2021, n=10)
+        self.assertGreaterEqual(len(leaders), 10)
+        self.assertListEqual(["player", "team", "games", "total_receiving_yds"] +
+                             [f"week_{week}" for week in range(1, week_map[2021] + 1)], leaders.columns.to_list())
+        self.assertTrue(leaders["total_receiving_yds"].is_monotonic_decreasing)
+        np.testing.assert_allclose(leaders["total_receiving_yds"], leaders.filter(like="week_").sum(axis=1))
+
+        # the best player per game of a 17 week season
+        leaders = self.leaders.get_leaders("receiving_td", 2020, n=1, per_game=True)
+        self.assertEqual(f"week_{week_map[2020]}", leaders.columns[-1])
+        table = self.leaders.get_data()
+        self.assertEqual(table.loc[table["year"] == 2020, "receiving_td_per_game"].max(),
+                         leaders["receiving_td_per_game"].iloc[0])
+
+    def test_player(self):
+        player = self.leaders.get_player("Cooper Kupp", 2021).squeeze()
+        self.assertEqual(1, player["total_receiving_yds_rank"])
+        self.assertEqual(player["total_receiving_yds"] / player["games"], player["receiving_yds_per_game"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import src.loader.statistics as loader
+import src.metrics.ranking as ranking
+import src.utils.accumulator as accumulator
+
+
+class TestRanking(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = accumulator.concat([loader.get_accumulated_weekly_stats(position, 2021)
+                                     for position in ["QB", "RB", "TE", "WR"]]).reset_index(drop=True)
+        cls.indicators = ["fantasy_points", "rushing_yds", "receiving_yds", "passing_yds", "receiving_td"]
+
+    def test_methods(self):
+        df = pd.DataFrame({"position": ["WR", "WR", "WR", "WR", "TE", "TE"], "points": [10, 20, 10, 5, 3, np.nan],
+                           "lst": [0, 1, 0, 2, 0, 0]}, index=list("abcdef"))
+        ranks = ranking.rank(df, ["points", "lst"])
+        self.assertListEqual(["points_rank", "lst_rank"], ranks.columns.to_list())
+        self.assertListEqual(list("abcdef"), ranks.index.to_list())
+        np.testing.assert_array_equal([2, 1, 2, 4, 1, np.nan], ranks["points_rank"])
+        np.testing.assert_array_equal([2, 1, 2, 3, 1, np.nan], ranking.rank(df, ["points"], method="dense")["points_rank"])
+        np.testing.assert_array_equal(df.groupby("position")["points"].rank(ascending=False),
+                                      ranking.rank(df, ["points"], method="average")["points_rank"])
+        np.testing.assert_array_equal([2.5, 1, 2.5, np.nan, 1, np.nan],
+                                      ranking.rank(df, ["points"], method="average", k=2)["points_rank"])
+        np.testing.assert_array_equal([0.5, 0.25, 0.5, 1, 1, np.nan],
+                                      ranking.rank(df, ["points"], method="percentile")["points_rank"])
+        np.testing.assert_array_equal([1, 3, 1, 4, 1, 1], ranking.rank(df, ["lst"], ascending=True)["lst_rank"])
+
+        # without keys all rows form one group
+        np.testing.assert_array_equal([2, 1, 2, 4, 5, np.nan], ranking.rank(df, ["points"], keys=list())["points_rank"])
+
+        with self.assertRaises(ValueError):
+            ranking.rank(df, ["points"], method="first")
+
+    def test_groups(self):
+        ranks = ranking.rank(self.df, self.indicators)
+        for indicator in self.indicators:
+            expected = self.df.groupby(["year", "week", "position"])[indicator].rank(ascending=False, method="min")
+            np.testing.assert_array_equal(expected.to_numpy(), ranks[f"{indicator}_rank"].to_numpy())
+
+    def test_top(self):
+        for method in ranking.METHODS:
+            for ascending in [False, True]:
+                with self.subTest(method=method, ascending=ascending):
+                    ranks = ranking.rank(self.df, self.indicators, method=method, ascending=ascending).to_numpy()
+                    top = ranking.rank(self.df, self.indicators, method=method, ascending=ascending, k=5).to_numpy()
+
+                    # the rows of the top 5, including ties at the 5th place, keep their rank
+                    selected = ranking.rank(self.df, self.indicators, ascending=ascending).to_numpy() <= 5
+                    np.testing.assert_array_equal(ranks[selected], top[selected])
+                    self.assertTrue(np.isnan(top[~selected]).all())
+
+        # a k beyond the groups ranks all rows
+        np.testing.assert_array_equal(ranking.rank(self.df, ["fantasy_points"], keys=["week"]).to_numpy(),
+                                      ranking.rank(self.df, ["fantasy_points"], keys=["week"], k=10000).to_numpy())
+
+
+if __name__ == "__main__":
+    unittest.main()
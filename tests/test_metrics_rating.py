@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import src.loader.statistics as loader
+import src.metrics.rating as rating
+import src.metrics.scoring as scoring
+import src.utils.accumulator as accumulator
+
+
+def get_qb_rating_unclamped(player):
+    # the rating of the row-wise implementation without the clamping of the components
+    att = player["passing_att"]
+    return 100 / 6 * ((player["passing_cmp"] / att - 0.3) / 0.2 + (player["passing_yds"] / att - 3) / 4 +
+                      (player["passing_td"] / att) / 0.05 + (0.095 - player["passing_int"] / att) / 0.04)
+
+
+class TestRating(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = accumulator.concat([loader.get_accumulated_weekly_stats(position, 2021)
+                                     for position in ["QB", "RB", "TE", "WR"]]).reset_index(drop=True)
+
+    def test_passer_rating(self):
+        df = pd.DataFrame({"passing_cmp": [10, 0, 20, 0], "passing_att": [10, 0, 30, 5], "passing_yds": [200, 0, 240, 0],
+                           "passing_td": [3, 0, 1, 0], "passing_int": [0, 0, 1, 3]}, index=[4, 5, 6, 7])
+        ratings = rating.get_passer_rating(df)
+        self.assertListEqual([4, 5, 6, 7], ratings.index.to_list())
+        # a perfect game, no attempts, a game without clamping and a game clamped to zero
+        np.testing.assert_allclose([158.33, np.nan, get_qb_rating_unclamped(df.loc[6]), 0.0], ratings, atol=0.01)
+
+        self.assertEqual(0, rating.get_qb_rating(df.loc[5]))
+        self.assertAlmostEqual(ratings[4], rating.get_qb_rating(df.loc[4]))
+
+    def test_passer_rating_bounds(self):
+        ratings = rating.get_passer_rating(self.df.loc[self.df["position"] == "QB"])
+        self.assertTrue(ratings.dropna().between(0, 158.34).all())
+
+        # the components of most QB weeks lie within the bounds
+        qb = self.df.loc[(self.df["position"] == "QB") & (self.df["passing_att"] > 0)]
+        unclamped = qb.apply(get_qb_rating_unclamped, axis=1)
+        self.assertGreater((np.abs(unclamped - ratings[qb.index]) < 1e-9).mean(), 0.5)
+
+    def test_any_a(self):
+        df = pd.DataFrame({"passing_att": [30, 0], "passing_yds": [250, 0], "passing_td": [2, 0],
+                           "passing_int": [1, 0], "sacked": [2, 0]})
+        np.testing.assert_allclose([(250 + 40 - 45) / 32, np.nan], rating.get_adjusted_net_yards_per_attempt(df))
+        df[rating.SACK_YARDS] = [14, 0]
+        np.testing.assert_allclose([(250 + 40 - 45 - 14) / 32, np.nan],
+                                   rating.get_adjusted_net_yards_per_attempt(df))
+
+    def test_efficiency(self):
+        df = self.df.assign(snaps=np.where(self.df["position"] == "QB", 0, 50))
+        efficiency = rating.get_efficiency(df, "ppr")
+        self.assertListEqual(["player", "team", "position", "year", "week", "passer_rating", "any_a",
+                              "yards_per_target", "yards_per_snap", "points_per_opportunity"],
+                             efficiency.columns.to_list())
+        self.assertEqual(len(df), len(efficiency))
+
+        # the receivers have no passer rating, the passers no yards per snap
+        receivers = efficiency["position"] == "WR"
+        self.assertTrue(efficiency.loc[receivers, "passer_rating"].isna().all())
+        self.assertTrue(efficiency.loc[~receivers & (efficiency["position"] == "QB"), "yards_per_snap"].isna().all())
+
+        wr = df.loc[receivers & (df["receiving_tgt"] > 0)]
+        np.testing.assert_allclose(wr["receiving_yds"] / wr["receiving_tgt"],
+                                   efficiency.loc[wr.index, "yards_per_target"])
+        opportunities = wr["receiving_tgt"] + wr["rushing_att"].fillna(0)
+        np.testing.assert_allclose(scoring.score(wr, "ppr") / opportunities,
+                                   efficiency.loc[wr.index, "points_per_opportunity"])
+
+        self.assertNotIn("yards_per_snap", rating.get_efficiency(self.df).columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
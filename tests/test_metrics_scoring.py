@@ -0,0 +1,127 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import src.loader.statistics as loader
+import src.metrics.scoring as scoring
+import src.utils.accumulator as accumulator
+
+
+def score_rowwise(player, reception):
+    # the scoring of the row-wise implementation the engine replaced
+    if player["position"] == "QB":
+        return 6 * player["rushing_td"] + 0.1 * player["rushing_yds"] + 4 * player["passing_td"] + 1 / 25 * player[
+            "passing_yds"] + (-1) * player["passing_int"] + (-2) * player["lst"]
+    return 6 * (player["rushing_td"] + player["receiving_td"]) + 0.1 * (
+            player["rushing_yds"] + player["receiving_yds"]) + reception * player["receiving_rec"] + (-2) * player["lst"]
+
+
+class TestScoring(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = accumulator.concat([loader.get_accumulated_weekly_stats(position, 2021)
+                                     for position in ["QB", "RB", "TE", "WR"]])
+
+    def test_schemes(self):
+        for scheme, reception in [("standard", 0.0), ("halfppr", 0.5), ("ppr", 1.0)]:
+            with self.subTest(scheme=scheme):
+                expected = self.df.fillna(0).apply(score_rowwise, axis=1, reception=reception)
+                np.testing.assert_allclose(expected.to_numpy(), scoring.score(self.df, scheme).to_numpy(), atol=1e-9)
+
+        # the stats of the weeks are scored in standard scoring
+        standard = scoring.score(self.df)
+        self.assertGreater(((standard - self.df["fantasy_points"]).abs() < 0.05).mean(), 0.95)
+
+    def test_series(self):
+        player = self.df.iloc[0]
+        self.assertAlmostEqual(score_rowwise(player.fillna(0), 1.0), scoring.calculate_ppr_fantasy_points(player))
+
+    def test_positions_and_bonuses(self):
+        scheme = {
+            "weights": {"receiving_rec": 1.0, "receiving_yds": 0.1, "rushing_yds": 0.1},
+            "positions": {"TE": {"receiving_rec": 1.5}},
+            "bonuses": [{"stat": "receiving_yds", "threshold": 100, "points": 3},
+                        {"stat": "rushing_yds", "threshold": 100, "points": 2, "positions": ["TE"]}],
+        }
+        df = pd.DataFrame({"position": ["WR", "TE", "TE", "K"], "receiving_rec": [5.0, 5.0, 5.0, np.nan],
+                           "receiving_yds": [100.0, 99.0, 120.0, 0.0], "rushing_yds": [100.0, 100.0, 0.0, 10.0]},
+                          index=[3, 5, 7, 9])
+        points = scoring.score(df, scheme)
+        self.assertListEqual([3, 5, 7, 9], points.index.to_list())
+        np.testing.assert_allclose([5 + 20 + 3, 7.5 + 19.9 + 2, 7.5 + 12 + 3, 1], points.to_numpy())
+
+        # without positions every row scores the default weights
+        np.testing.assert_allclose([5 + 20 + 3, 5 + 19.9, 5 + 12 + 3, 1],
+                                   scoring.score(df.drop("position", axis=1), scheme).to_numpy())
+
+        # the batch scores the rows alike, rows without a position take the default weights
+        df.loc[9, "position"] = np.nan
+        for frame in [df, df.drop("position", axis=1)]:
+            points, _ = scoring.score_leagues(frame, [scheme])
+            np.testing.assert_allclose(scoring.score(frame, scheme).to_numpy(), points.iloc[:, 0].to_numpy())
+
+    def test_compiled(self):
+        self.assertIs(scoring.get_scoring("ppr"), scoring.get_scoring("ppr"))
+        compiled = scoring.Scoring({"weights": {"passing_td": 4}, "positions": {"QB": {"passing_td": 6}}})
+        self.assertListEqual(["passing_td"], compiled.stats)
+        np.testing.assert_array_equal([[6, 4]], compiled.weights)
+
+    def test_leagues(self):
+        schemes = ["standard", "ppr", {"weights": {"receiving_rec": 1.0, "receiving_yds": 0.1},
+                                       "positions": {"TE": {"receiving_rec": 1.5}},
+                                       "bonuses": [{"stat": "receiving_yds", "threshold": 100, "points": 3}]}]
+        points, ranks = scoring.score_leagues(self.df, schemes)
+        self.assertListEqual(["standard", "ppr", scoring.get_hash(schemes[2])], points.columns.to_list())
+        for j, scheme in enumerate(schemes):
+            np.testing.assert_allclose(scoring.score(self.df, scheme).to_numpy(), points.iloc[:, j].to_numpy())
+
+        # the best player of each position and week ranks first in each league
+        keys = [self.df["position"], self.df["week"]]
+        expected = points.groupby(keys, observed=True).rank(ascending=False, method="min")
+        np.testing.assert_array_equal(expected.to_numpy(), ranks.to_numpy())
+        self.assertTrue((ranks.groupby(keys, observed=True).min() == 1).all().all())
+
+    def test_batch_cache(self):
+        batch = scoring.Batch(self.df)
+        first = batch.score(["ppr"])
+        self.assertListEqual([scoring.get_scoring("ppr").hash], list(batch.results))
+        both = batch.score(["halfppr", "ppr"])
+        self.assertEqual(2, len(batch.results))
+        np.testing.assert_array_equal(first["ppr"].to_numpy(), both["ppr"].to_numpy())
+
+        # equal schemes share the compiled scheme and the points
+        scheme = {"weights": {"rushing_yds": 0.1}}
+        self.assertIs(scoring.get_compiled(scheme), scoring.get_compiled({"weights": {"rushing_yds": 0.1}}))
+        batch.score([scheme, dict(scheme)])
+        self.assertEqual(3, len(batch.results))
+
+
+    def test_leagues_cache(self):
+        df = self.df.copy()
+        pending = list()
+        score_pending = scoring.Batch.score_pending
+
+        def count_pending(batch, compiled):
+            pending.append([scoring.name for scoring in compiled])
+            return score_pending(batch, compiled)
+
+        scoring.Batch.score_pending = count_pending
+        try:
+            first, _ = scoring.score_leagues(df, ["standard", "ppr"])
+            second, _ = scoring.score_leagues(df, ["ppr", "halfppr", "standard"])
+        finally:
+            scoring.Batch.score_pending = score_pending
+
+        # the second call only scores the new scheme
+        self.assertListEqual([["standard", "ppr"], ["halfppr"]], pending)
+        pd.testing.assert_frame_equal(first, second[["standard", "ppr"]])
+
+        # the points are dropped with the frame
+        key = id(df)
+        self.assertIn(key, scoring.points_cache)
+        del df
+        self.assertNotIn(key, scoring.points_cache)
+
+if __name__ == "__main__":
+    unittest.main()
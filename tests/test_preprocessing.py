@@ -1,14 +1,47 @@
 """ Implements quick and dirty tests for the preprocessing. """
+import os
+import shutil
+import tempfile
 import unittest
 import numpy as np
+import pandas as pd
+
+import src.preprocessing.preprocessing as preprocessing
+import src.preprocessing.registry as registry
+import src.utils.manifest as manifest
 
 from src.config.fantasypros import snapcounts_type, projections_type, stats_type
 
+import src.loader.schedules as schedules
+import src.loader.statistics as loader
+
+from src.preprocessing.statistics.features import Features, get_features
 from src.preprocessing.statistics.projections import Projections
 from src.preprocessing.statistics.snapcounts import Snapcounts
 from src.preprocessing.statistics.stats import Stats
 from src.preprocessing.statistics.statistics import Statistics
-from src.preprocessing.statistics.teststats import Defense, Offense
+from src.preprocessing.statistics.teamstats import Defense, Offense
+
+# columns of the raw tables the loaders drop
+DROPPED = ["rank", "rost", "fantasy_points_per_game", "snaps_per_game"]
+
+
+def get_columns(types):
+    return [column for column in types.keys() if column not in DROPPED]
+
+
+def setUpModule():
+    # the features resolve the players in a registry of the tested seasons
+    global prefix, registry_dir
+    prefix = tempfile.mkdtemp()
+    registry_dir = registry.DIR
+    registry.DIR = prefix
+    registry.update([2020, 2021])
+
+
+def tearDownModule():
+    shutil.rmtree(prefix)
+    registry.DIR = registry_dir
 
 
 # TODO make clean with test functions
@@ -18,70 +51,70 @@ class TestPreprocessingStats(unittest.TestCase):
     def test_stats_qb(self):
         df = Stats("QB", 2021, refresh=True).get_accumulated_data()
 
-        self.assertEqual(32, len(df.team.unique()))
+        self.assertEqual(32, len(df.loc[df["team"] != "FA"].team.unique()))
         self.assertEqual(1, len(df.position.unique()))
         self.assertEqual(18, len(df.week.unique()))
 
-        self.assertEqual(22, df.shape[1])
-        self.assertListEqual(list(stats_type["QB"].keys()) + ["position", "week", "year", "team"], df.columns.to_list())
+        self.assertEqual(19, df.shape[1])
+        self.assertListEqual(get_columns(stats_type["QB"]) + ["team", "position", "week", "year"], df.columns.to_list())
 
         self.assertEqual(
-            [1.0, 'Kyler Murray', 21.0, 32.0, 65.6, 289.0, 9.0, 4.0, 1.0, 2.0, 5.0, 20.0, 1.0, 0.0, 1.0, 34.6, 34.6,
-             99.3, 'QB', 1, 2021, 'ARI'], df.iloc[0, :].to_list())
+            ['Kyler Murray', 21.0, 32.0, 65.6, 289.0, 9.0, 4.0, 1.0, 2.0, 5.0, 20.0, 1.0, 0.0, 1.0, 34.6, 'ARI', 'QB', 1,
+             2021], df.iloc[0, :].to_list())
         self.assertEqual(
-            [120.0, 'Tim Boyle', 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, -1.0, 0.0, 0.0, 1.0, -0.1, -0.1, 0.2,
-             'QB', 18, 2021, 'DET'], df.iloc[-1, :].to_list())
+            ['Tim Boyle', 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, -1.0, 0.0, 0.0, 1.0, -0.1, 'DET', 'QB', 18, 2021],
+            df.iloc[-1, :].to_list())
 
     def test_stats_rb(self):
         df = Stats("RB", 2021, refresh=True).get_accumulated_data()
 
-        self.assertEqual(32, len(df.team.unique()))
+        self.assertEqual(32, len(df.loc[df["team"] != "FA"].team.unique()))
         self.assertEqual(1, len(df.position.unique()))
         self.assertEqual(18, len(df.week.unique()))
 
-        self.assertEqual(22, df.shape[1])
-        self.assertListEqual(list(stats_type["RB"].keys()) + ["position", "week", "year", "team"], df.columns.to_list())
+        self.assertEqual(19, df.shape[1])
+        self.assertListEqual(get_columns(stats_type["RB"]) + ["team", "position", "week", "year"], df.columns.to_list())
 
         self.assertEqual(
-            [1.0, 'Joe Mixon', 29.0, 127.0, 4.4, 19.0, 0.0, 1.0, 4.0, 4.0, 23.0, 5.8, 0.0, 0.0, 1.0, 21.0, 21.0, 98.1,
-             'RB', 1, 2021, 'CIN'], df.iloc[0, :].to_list())
+            ['Joe Mixon', 29.0, 127.0, 4.4, 19.0, 0.0, 1.0, 4.0, 4.0, 23.0, 5.8, 0.0, 0.0, 1.0, 21.0, 'CIN', 'RB', 1,
+             2021], df.iloc[0, :].to_list())
         self.assertEqual(
-            [240.0, 'Mike Davis', 6.0, 30.0, 5.0, 9.0, 0.0, 0.0, 3.0, 3.0, -2.0, -0.7, 0.0, 2.0, 1.0, -1.2, -1.2, 49.7,
-             'RB', 18, 2021, 'ATL'], df.iloc[-1, :].to_list())
+            ['Mike Davis', 6.0, 30.0, 5.0, 9.0, 0.0, 0.0, 3.0, 3.0, -2.0, -0.7, 0.0, 2.0, 1.0, -1.2, 'ATL', 'RB', 18,
+             2021], df.iloc[-1, :].to_list())
 
     def test_stats_te(self):
         df = Stats("TE", 2021, refresh=True).get_accumulated_data()
 
-        self.assertEqual(32, len(df.team.unique()))
+        self.assertEqual(32, len(df.loc[df["team"] != "FA"].team.unique()))
         self.assertEqual(1, len(df.position.unique()))
         self.assertEqual(18, len(df.week.unique()))
 
-        self.assertEqual(21, df.shape[1])
-        self.assertListEqual(list(stats_type["TE"].keys()) + ["position", "week", "year", "team"], df.columns.to_list())
+        self.assertEqual(18, df.shape[1])
+        self.assertListEqual(get_columns(stats_type["TE"]) + ["team", "position", "week", "year"], df.columns.to_list())
 
         self.assertEqual(
-            [1.0, 'Rob Gronkowski', 8.0, 8.0, 90.0, 11.3, 20.0, 0.0, 2.0, 0.0, 0.0, 0.0, 0.0, 1.0, 21.0, 21.0, 97.7,
-             'TE', 1, 2021, 'TB'], df.iloc[0, :].to_list())
+            ['Rob Gronkowski', 8.0, 8.0, 90.0, 11.3, 20.0, 0.0, 2.0, 0.0, 0.0, 0.0, 0.0, 1.0, 21.0, 'TB', 'TE', 1, 2021],
+            df.iloc[0, :].to_list())
         self.assertEqual(
-            [214.0, 'Blake Bell', 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.2, 'TE', 18,
-             2021, 'KC'], df.iloc[-1, :].to_list())
+            ['Blake Bell', 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 'KC', 'TE', 18, 2021],
+            df.iloc[-1, :].to_list())
 
     def test_stats_wr(self):
         df = Stats("WR", 2021, refresh=True).get_accumulated_data()
 
-        self.assertEqual(32, len(df.team.unique()))
+        self.assertEqual(32, len(df.loc[df["team"] != "FA"].team.unique()))
         self.assertEqual(1, len(df.position.unique()))
         self.assertEqual(18, len(df.week.unique()))
 
-        self.assertEqual(21, df.shape[1])
-        self.assertListEqual(list(stats_type["WR"].keys()) + ["position", "week", "year", "team"], df.columns.to_list())
+        self.assertEqual(18, df.shape[1])
+        self.assertListEqual(get_columns(stats_type["WR"]) + ["team", "position", "week", "year"], df.columns.to_list())
 
         self.assertEqual(
-            [1.0, 'Tyreek Hill', 11.0, 15.0, 197.0, 17.9, 75.0, 0.0, 1.0, 1.0, 4.0, 0.0, 0.0, 1.0, 26.1, 26.1, 100.0,
-             'WR', 1, 2021, 'KC'], df.iloc[0, :].to_list())
+            ['Tyreek Hill', 11.0, 15.0, 197.0, 17.9, 75.0, 0.0, 1.0, 1.0, 4.0, 0.0, 0.0, 1.0, 26.1, 'KC', 'WR', 1, 2021],
+            df.iloc[0, :].to_list())
         self.assertEqual(
-            [368.0, 'Andre Roberts', 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, -2.0, -2.0, 0.1, 'WR',
-             18, 2021, 'LAC'], df.iloc[-1, :].to_list())
+            ['Andre Roberts', 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, -2.0, 'LAC', 'WR', 18, 2021],
+            df.iloc[-1, :].to_list())
 
 
 class TestPreprocessingSnapcounts(unittest.TestCase):
@@ -91,13 +124,13 @@ class TestPreprocessingSnapcounts(unittest.TestCase):
         self.assertEqual(18, len(df.week.unique()))
         self.assertEqual(["QB", "RB", "TE", "WR"], np.sort(df.position.unique()).tolist())
 
-        self.assertEqual(15, df.shape[1])
-        self.assertListEqual(list(snapcounts_type.keys()) + ["week", "year"], df.columns.to_list())
+        self.assertEqual(14, df.shape[1])
+        self.assertListEqual(get_columns(snapcounts_type) + ["week", "year"], df.columns.to_list())
 
-        self.assertEqual(['Aaron Rodgers', 'QB', 'GB', 1.0, 42.0, 42.0, 74.0, 0.0, 0.0, 67.0, 67.0, 3.3, 7.9, 1, 2021],
+        self.assertEqual(['Aaron Rodgers', 'QB', 'GB', 1.0, 42.0, 74.0, 0.0, 0.0, 67.0, 67.0, 3.3, 7.9, 1, 2021],
                          df.iloc[0, :].to_list())
-        self.assertEqual(['C.J. Saunders', 'WR', 'CAR', 1.0, 15.0, 15.0, 20.0, 0.0, 13.0, 13.0, 13.0, 1.1, 7.3, 18,
-                          2021], df.iloc[-1, :].to_list())
+        self.assertEqual(['C.J. Saunders', 'WR', 'CAR', 1.0, 15.0, 20.0, 0.0, 13.0, 13.0, 13.0, 1.1, 7.3, 18, 2021],
+                         df.iloc[-1, :].to_list())
 
 
 class TestPreprocessingProjections(unittest.TestCase):
@@ -163,7 +196,7 @@ class TestPreprocessingProjections(unittest.TestCase):
         self.assertEqual(
             ['Tyreek Hill', 6.5, 93.8, 0.8, 0.8, 4.6, 0.0, 0.1, 14.6, 'KC', 'WR', 1, 2021], df.iloc[0, :].to_list())
         self.assertEqual(
-            ['Marcus Kemp', 0.1, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.1, 'KC', 'WR', 18, 2021], df.iloc[-1, :].to_list())
+            ['River Cracraft', 0.1, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.1, 'MIA', 'WR', 18, 2021], df.iloc[-1, :].to_list())
 
 
 class TestPreprocessingTeamStats(unittest.TestCase):
@@ -186,16 +219,151 @@ class TestPreprocessingTeamStats(unittest.TestCase):
 
 class TestPreprocessingStatistics(unittest.TestCase):
     def test_statistics(self):
-        df = Statistics("QB", 2016, refresh=True).get_accumulated_data()
+        df = Statistics("QB", 2021, refresh=True).get_accumulated_data()
 
         self.assertEqual(32, len(df.team.unique()))
         self.assertEqual(32, len(df.opponent.unique()))
-        self.assertEqual(17, len(df.week.unique()))
+        self.assertEqual(18, len(df.week.unique()))
 
         unique_names = df.player.unique()
         for unique_name in unique_names:
             self.assertGreater(19, len(df.loc[df["player"] == unique_name]), f"{unique_name} appears too much.")
 
 
+class TestPreprocessingFeatures(unittest.TestCase):
+    def test_features(self):
+        df = Features(2020, refresh=True).get_accumulated_data()
+
+        self.assertFalse(df.duplicated(["player", "position", "year", "week"]).any())
+        self.assertTrue(df["player"].is_monotonic_increasing)
+        self.assertEqual(32, len(df.opponent.unique()))
+        self.assertEqual(["QB", "RB", "TE", "WR"], np.sort(df.position.unique()).tolist())
+
+        row = df.loc[(df["player"] == "Derrick Henry") & (df["week"] == 1)].iloc[0]
+        self.assertEqual(("DEN", False), schedules.get_schedule_index([2020]).get(2020, "TEN", 1))
+        self.assertEqual("DEN", row["opponent"])
+        self.assertFalse(row["home"])
+
+        defense = Defense(2020).concat_data().set_index("team")
+        self.assertEqual(defense.loc["DEN", "rushing_yds_allowed"], row["rushing_yds_allowed"])
+
+        snapcounts = loader.get_weekly_snapcounts(1, 2020).set_index("player")
+        self.assertEqual(snapcounts.loc["Derrick Henry", "snaps"], row["snaps"])
+        self.assertEqual(registry.resolve(pd.Series(["Derrick Henry"]), years=2020)[0], row["player_id"])
+        self.assertFalse(df["player_id"].isna().any())
+
+        pa = loader.get_points_allowed(2020)
+        self.assertEqual(pa.loc[pa["team"] == "Denver Broncos", "pa_rb"].iloc[0], row["points_allowed"])
+
+    def test_statistics(self):
+        # the statistics are the same as joined by merges
+        season = Stats("WR", 2021).concat_data()
+        season = pd.merge(season, schedules.get_schedule(2021), how="inner", on=["team", "week", "year"])
+        season = season.loc[season["opponent"] != "BYE"]
+        defense = Defense(2021).concat_data().drop(["games_defense"], axis=1).rename(columns={"team": "opponent"})
+        expected = pd.merge(season, defense, how="inner", on=["opponent", "year"])
+
+        df = Statistics("WR", 2021, refresh=True).get_accumulated_data()
+        self.assertListEqual(expected.columns.to_list(), df.columns.to_list())
+        key = ["player", "week"]
+        pd.testing.assert_frame_equal(expected.sort_values(key).reset_index(drop=True),
+                                      df.sort_values(key).reset_index(drop=True), check_dtype=False)
+
+    def test_get_features(self):
+        df = get_features([2021], columns=["fantasy_points", "snaps_pct"], positions=["WR"],
+                          players=["Cooper Kupp"], weeks=[1, 2], refresh=True)
+
+        self.assertListEqual(["player", "position", "year", "week"], df.index.names)
+        self.assertListEqual(["fantasy_points", "snaps_pct"], df.columns.to_list())
+        self.assertListEqual([("Cooper Kupp", "WR", 2021, 1), ("Cooper Kupp", "WR", 2021, 2)], df.index.to_list())
+
+
+class TestPreprocessingStorage(unittest.TestCase):
+    def setUp(self):
+        self.prefix = tempfile.mkdtemp()
+        self.path = manifest.PATH
+        manifest.PATH = os.path.join(self.prefix, "manifest.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.prefix)
+        manifest.PATH = self.path
+        preprocessing.FORMAT = "csv"
+
+    def get_stats(self):
+        stats = Stats("QB", 2021)
+        stats.dir = self.prefix
+        return stats
+
+    def test_formats(self):
+        expected = Stats("QB", 2021).concat_data()
+        for format_ in ["csv", "parquet"]:
+            with self.subTest(format=format_):
+                preprocessing.FORMAT = format_
+                stats = self.get_stats()
+                stats.store_accumulated_data()
+                self.assertTrue(stats.get_path().endswith(format_))
+                self.assertFalse(stats.is_outdated())
+
+                pd.testing.assert_frame_equal(expected, stats.get_accumulated_data())
+
+                df = stats.get_accumulated_data(columns=["player", "fantasy_points"], weeks=[1, 2],
+                                                players=["Kyler Murray", "Tom Brady"])
+                self.assertListEqual(["player", "fantasy_points"], df.columns.to_list())
+                rows = expected["week"].isin([1, 2]) & expected["player"].isin(["Kyler Murray", "Tom Brady"])
+                self.assertEqual(4, len(df))
+                self.assertListEqual(expected.loc[rows, "fantasy_points"].to_list(), df["fantasy_points"].to_list())
+
+                df = stats.get_accumulated_data(columns=["week"])
+                self.assertListEqual(["week"], df.columns.to_list())
+                self.assertEqual(len(expected), len(df))
+
+    def test_schema(self):
+        preprocessing.FORMAT = "parquet"
+        stats = self.get_stats()
+        df = stats.store_accumulated_data()
+
+        schema = stats.get_schema()
+        self.assertEqual("Stats", schema["summary"])
+        self.assertEqual(2021, schema["year"])
+        self.assertEqual(len(df), schema["rows"])
+        self.assertEqual("float64", schema["types"]["fantasy_points"])
+        self.assertEqual("int64", schema["types"]["week"])
+
+    def test_migrate(self):
+        stats = self.get_stats()
+        df = stats.store_accumulated_data()
+
+        preprocessing.FORMAT = "parquet"
+        self.assertFalse(os.path.exists(stats.get_path()))
+        pd.testing.assert_frame_equal(df, stats.get_accumulated_data())
+        self.assertTrue(os.path.exists(stats.get_path()))
+        self.assertEqual(len(df), stats.get_schema()["rows"])
+
+    def test_incremental(self):
+        for format_ in ["csv", "parquet"]:
+            with self.subTest(format=format_):
+                preprocessing.FORMAT = format_
+                stats = self.get_stats()
+                expected = stats.store_accumulated_data()
+                self.assertListEqual([], stats.get_changed_weeks())
+
+                # the latest week is appended and a corrected past week is restated
+                df = expected.copy()
+                df.loc[df["week"] == 3, "fantasy_points"] = 0.0
+                stats.write(df.loc[df["week"] < 18])
+                week_3 = os.path.normpath(stats.get_week_sources(3)[0])
+                manifest.get_manifest().get(stats.get_path())["sources"][week_3] = None
+                self.assertListEqual([3, 18], stats.get_changed_weeks())
+
+                loaded = list()
+                load_week = stats.load_week
+                stats.load_week = lambda week: loaded.append(week) or load_week(week)
+                stats.store_accumulated_data(weeks=stats.get_changed_weeks())
+
+                self.assertListEqual([3, 18], loaded)
+                self.assertListEqual([], stats.get_changed_weeks())
+                pd.testing.assert_frame_equal(expected, stats.load_accumulated_data())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+import src.preprocessing.build as build
+import src.utils.manifest as manifest
+
+from src.preprocessing.preprocessing import Preprocessing
+
+
+class Week(Preprocessing):
+    def __init__(self, prefix, week, refresh=True):
+        Preprocessing.__init__(self, 2021, refresh)
+        self.week = week
+        self.filename = f"week_{week}.csv"
+        self.dir = prefix
+
+    def concat_data(self):
+        time.sleep(0.1)
+        if self.week < 0:
+            raise ValueError("table not found")
+        return pd.DataFrame({"week": [self.week], "points": [float(self.week)]})
+
+    def get_sources(self):
+        return list()
+
+
+class Season(Preprocessing):
+    def __init__(self, prefix, weeks, refresh=True):
+        Preprocessing.__init__(self, 2021, refresh)
+        self.weeks = [Week(prefix, week, refresh) for week in weeks]
+        self.filename = "season.csv"
+        self.dir = prefix
+
+    def concat_data(self):
+        for week in self.weeks:
+            if not os.path.exists(week.get_path()):
+                raise ValueError(f"{week.get_path()} is not stored")
+        return pd.concat([week.get_accumulated_data() for week in self.weeks])
+
+    def get_sources(self):
+        return [week.get_path() for week in self.weeks]
+
+    def get_dependencies(self):
+        return self.weeks
+
+
+class TestBuild(unittest.TestCase):
+    def setUp(self):
+        self.prefix = tempfile.mkdtemp()
+        self.path = manifest.PATH
+        manifest.PATH = os.path.join(self.prefix, "manifest.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.prefix)
+        manifest.PATH = self.path
+
+    def test_build(self):
+        for workers in [1, 4]:
+            with self.subTest(workers=workers):
+                season = Season(self.prefix, [1, 2, 3])
+                summary = build.build([season] + season.weeks, workers)
+
+                self.assertEqual(season.get_path(), summary["built"][-1])
+                self.assertCountEqual([task.get_path() for task in [season] + season.weeks], summary["built"])
+                self.assertCountEqual(summary["built"], summary["timings"].keys())
+                self.assertListEqual([1.0, 2.0, 3.0], pd.read_csv(season.get_path())["points"].to_list())
+                self.assertListEqual(sorted(["manifest.json", "season.csv", "week_1.csv", "week_2.csv",
+                                             "week_3.csv"]), sorted(os.listdir(self.prefix)))
+                self.assertFalse(manifest.get_manifest().is_outdated(season.get_path(), season.get_sources()))
+
+    def test_failed(self):
+        season = Season(self.prefix, [1, -1])
+        summary = build.build([season] + season.weeks, 2)
+
+        self.assertListEqual([season.weeks[0].get_path()], summary["built"])
+        self.assertCountEqual([season.weeks[1].get_path(), season.get_path()], summary["failed"])
+        self.assertFalse(os.path.exists(season.get_path()))
+
+    def test_failed_last(self):
+        # the season is skipped after its only week failed, nothing is left to run
+        season = Season(self.prefix, [-1])
+        summary = build.build([season] + season.weeks, 1)
+
+        self.assertListEqual(list(), summary["built"])
+        self.assertListEqual([season.weeks[0].get_path(), season.get_path()], summary["failed"])
+        self.assertFalse(os.path.exists(season.get_path()))
+
+    def test_circular(self):
+        season = Season(self.prefix, [1])
+        season.weeks[0].get_dependencies = lambda: [season]
+        with self.assertRaises(ValueError):
+            build.build([season, season.weeks[0]], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
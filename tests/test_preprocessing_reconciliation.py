@@ -0,0 +1,26 @@
+import unittest
+
+import src.preprocessing.reconciliation as reconciliation
+
+
+class TestReconciliation(unittest.TestCase):
+    def test_reconcile(self):
+        df = reconciliation.reconcile([2021])
+        self.assertListEqual(["kind", "position", "year", "column", "compared", "mismatched", "max_difference"],
+                             df.columns.to_list())
+        self.assertListEqual(["QB", "RB", "TE", "WR", None], df["position"].unique().tolist())
+
+        # the stats of the weeks add up to the season pages
+        stats = df.loc[df["kind"] == "stats"]
+        self.assertEqual(0, stats["mismatched"].sum())
+        self.assertEqual(84, stats.loc[(stats["position"] == "QB") & (stats["column"] == "players"),
+                                       "compared"].iloc[0])
+
+        # the season pages count games without offensive snaps, the snaps add up
+        snapcounts = df.loc[df["kind"] == "snapcounts"].set_index("column")
+        self.assertEqual(0, snapcounts.loc["snaps", "mismatched"])
+        self.assertGreater(snapcounts.loc["games", "mismatched"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+import src.loader.playbyplay as pbp
+import src.loader.players as players
+import src.preprocessing.registry as registry
+import src.utils.manifest as manifest
+
+
+def get_records(rows):
+    return pd.DataFrame(rows, columns=["player", "team", "position", "year", "week"])
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.prefix = tempfile.mkdtemp()
+        self.registry = registry.Registry(self.prefix)
+
+    def tearDown(self):
+        shutil.rmtree(self.prefix)
+
+    def test_namesakes(self):
+        # two receivers of the same name in the same weeks, one of them changes the team
+        self.registry.register(get_records([
+            ("Steve Smith", "CAR", "WR", 2009, 1), ("Steve Smith", "NYG", "WR", 2009, 1),
+            ("Steve Smith", "NYG", "WR", 2009, 2), ("Steve Smith", "CAR", "WR", 2009, 2),
+            ("Steve Smith", "BAL", "WR", 2010, 1), ("Steve Smith", "NYG", "WR", 2010, 1),
+        ]))
+        self.assertEqual(2, len(self.registry.players))
+
+        history = self.registry.history.groupby("player_id")["team"].unique().apply(list).to_dict()
+        self.assertDictEqual({0: ["CAR", "BAL"], 1: ["NYG"]}, history)
+
+    def test_gap(self):
+        # a namesake on the same position years later is another player, unless on the same team
+        self.registry.register(get_records([
+            ("Mike Williams", "TB", "WR", 2010, 1), ("Mike Williams", "LAC", "WR", 2017, 1),
+            ("Adrian Peterson", "MIN", "RB", 2010, 1), ("Adrian Peterson", "MIN", "RB", 2014, 1),
+            ("Adrian Peterson", "NO", "RB", 2015, 1),
+        ]))
+        self.assertListEqual(["Mike Williams", "Adrian Peterson", "Mike Williams"],
+                             self.registry.players["player"].to_list())
+
+    def test_stable(self):
+        records = get_records([("Tom Brady", "NE", "QB", 2019, 1), ("Julian Edelman", "NE", "WR", 2019, 1)])
+        self.assertEqual(2, self.registry.register(records))
+        self.registry.store()
+
+        # registered records are skipped, new records keep the ids
+        stored = registry.Registry(self.prefix)
+        self.assertEqual(0, stored.register(records))
+        self.assertEqual(1, stored.register(get_records([("Tom Brady", "TB", "QB", 2020, 1),
+                                                         ("Rob Gronkowski", "TB", "TE", 2020, 1)])))
+        self.assertListEqual([0, 2], stored.history.loc[stored.history["year"] == 2020, "player_id"].to_list())
+        pd.testing.assert_frame_equal(self.registry.players, stored.players.iloc[:2])
+
+    def test_resolve(self):
+        # the ids are assigned in the order of the weeks
+        self.registry.register(get_records([
+            ("Odell Beckham Jr.", "NYG", "WR", 2018, 1), ("Todd Gurley", "LAR", "RB", 2018, 1),
+            ("Steve Smith", "CAR", "WR", 2012, 1), ("Steve Smith", "LAR", "WR", 2012, 1),
+            ("Aaron Rodgers", "GB", "QB", 2018, 1), ("Aaron Jones", "GB", "RB", 2018, 1),
+        ]))
+
+        names = pd.Series(["Odell Beckham", "Todd Gurley II", "Nobody"], index=[5, 6, 7])
+        ids = self.registry.resolve(names)
+        self.assertListEqual([5, 6, 7], ids.index.to_list())
+        self.assertListEqual([2, 3], ids.iloc[:2].to_list())
+        self.assertTrue(pd.isna(ids[7]))
+
+        ids = self.registry.resolve(pd.Series(["Steve Smith", "Steve Smith"]), teams=["LAR", "CAR"], years=2012)
+        self.assertListEqual([1, 0], ids.to_list())
+
+        ids = self.registry.resolve(pd.Series(["A.Rodgers", "A.Jones", "O.Beckham"]), teams=["GB", "GB", "NYG"],
+                                    years=2018, abbreviated=True)
+        self.assertListEqual([4, 5, 2], ids.to_list())
+
+    def test_fuzzy(self):
+        self.registry.register(get_records([
+            ("Amon-Ra St. Brown", "DET", "WR", 2021, 1), ("Josh Allen", "BUF", "QB", 2021, 1),
+            ("Gabriel Davis", "BUF", "WR", 2021, 1), ("Mike Williams", "LAC", "WR", 2021, 1),
+            ("Michael Carter", "NYJ", "RB", 2021, 1), ("Javonte Williams", "DEN", "RB", 2021, 1),
+            ("Jamaal Williams", "DET", "RB", 2021, 1), ("Jameson Williams", "DET", "WR", 2021, 1),
+        ]))
+
+        # approximate matches within the team and season, unknown players of the team are not resolved
+        names = pd.Series(["A.St. Brown", "Jos.Allen", "M.Williams", "Mi.Carter", "J.Williams", "J.Williams",
+                           "M.Carter", "D.Swift"])
+        teams = ["DET", "BUF", "LAC", "NYJ", "DEN", "DET", "BUF", "DET"]
+        ids = self.registry.resolve(names, teams, years=2021, abbreviated=True, fuzzy=True)
+        self.assertListEqual([0, 1, 3, 4, 5], ids.iloc[:5].to_list())
+        # two players of the block are as similar
+        self.assertTrue(ids.iloc[5:].isna().all())
+
+        ids = self.registry.resolve(pd.Series(["Gabe Davis", "Gabe Davis"]), ["BUF", "DET"], years=2021, fuzzy=True)
+        self.assertListEqual([2], ids.dropna().to_list())
+        self.assertTrue(pd.isna(ids.iloc[1]))
+
+        with self.assertRaises(ValueError):
+            self.registry.resolve(names, fuzzy=True)
+
+    def test_playbyplay_names(self):
+        paths = registry.DIR, pbp.PREFIX, manifest.PATH
+        registry.DIR = os.path.join(self.prefix, "registry")
+        pbp.PREFIX = os.path.join(self.prefix, "raw")
+        manifest.PATH = os.path.join(self.prefix, "manifest.json")
+        try:
+            self.registry = registry.Registry(registry.DIR)
+            registry.update([2021], self.registry)
+            plays = pd.DataFrame({
+                "posteam": ["DET", "DET", "DET", "BUF"], "passer_player_name": ["J.Goff", "J.Goff", None, "Jos.Allen"],
+                "receiver_player_name": ["A.St. Brown", None, None, "S.Diggs"],
+                "rusher_player_name": [None, "D.Swift", "J.Goff", None], "yardline_100": [20.0, 5.0, 1.0, 30.0],
+            })
+            os.makedirs(os.path.dirname(pbp.get_playbyplay_path(2021)))
+            plays.to_parquet(pbp.get_playbyplay_path(2021))
+
+            names = registry.get_playbyplay_names(2021)
+            self.assertEqual(5, len(names))
+            self.assertFalse(names["player_id"].isna().any())
+            expected = self.registry.resolve(pd.Series(["Jared Goff", "Amon-Ra St. Brown"]), ["DET", "DET"],
+                                             years=2021)
+            resolved = names.set_index("player")["player_id"]
+            self.assertListEqual(expected.to_list(), [resolved["J.Goff"], resolved["A.St. Brown"]])
+
+            # the stored mapping is reused until the play-by-play data changes
+            self.assertFalse(manifest.get_manifest().is_outdated(registry.get_playbyplay_path(2021),
+                                                                 [pbp.get_playbyplay_path(2021),
+                                                                  registry.get_history_path()]))
+            pd.testing.assert_frame_equal(names, registry.get_playbyplay_names(2021))
+        finally:
+            registry.DIR, pbp.PREFIX, manifest.PATH = paths
+
+    def test_normalize(self):
+        names = pd.Series(["Odell Beckham Jr.", "J.J. Nelson", "JJ Nelson", "Ka'Raun White", "Todd Gurley II",
+                           "Amon-Ra St. Brown"])
+        self.assertListEqual(["odell beckham", "jj nelson", "jj nelson", "karaun white", "todd gurley",
+                              "amon ra st brown"], registry.normalize(names).to_list())
+        self.assertListEqual(["o beckham", "a ra st brown"],
+                             registry.abbreviate(registry.normalize(names.iloc[[0, 5]])).to_list())
+
+    def test_rosters(self):
+        self.registry.register(registry.get_records([2021]))
+        rosters = players.get_players(2021)
+
+        # every player of the rosters and stats is resolved
+        ids = self.registry.resolve(rosters["player"], rosters["team"], rosters["position"], rosters["year"],
+                                    rosters["week"])
+        self.assertFalse(ids.isna().any())
+        self.assertEqual(len(rosters.drop_duplicates(["player", "team"])),
+                         len(pd.DataFrame({"id": ids, "team": rosters["team"]}).drop_duplicates()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import contextlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import src.loader.schedules as schedules
+import src.preprocessing.warehouse as warehouse
+import src.utils.manifest as manifest
+
+from src.preprocessing.statistics.stats import Stats
+
+
+class TestWarehouse(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.prefix = tempfile.mkdtemp()
+        cls.manifest = manifest.PATH
+        manifest.PATH = os.path.join(cls.prefix, "manifest.json")
+        cls.path = os.path.join(cls.prefix, "warehouse.sqlite")
+        cls.rows = warehouse.build([2021], refresh=True, path=cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.prefix)
+        manifest.PATH = cls.manifest
+
+    def test_build(self):
+        self.assertEqual(set(self.rows.keys()), {"stats", "snapcounts", "projections", "schedules", "offense",
+                                                 "defense", "points_allowed"})
+        for table, rows in self.rows.items():
+            with self.subTest(table=table):
+                self.assertGreater(rows, 0)
+                self.assertEqual(warehouse.query(f"SELECT COUNT(*) AS n FROM {table}", path=self.path)["n"][0], rows)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_types(self):
+        types = warehouse.query("SELECT name, type FROM pragma_table_info('schedules')", path=self.path)
+        self.assertEqual(dict(zip(types["name"], types["type"])),
+                         {"team": "TEXT", "opponent": "TEXT", "week": "INTEGER", "home": "INTEGER", "year": "INTEGER"})
+
+        df = warehouse.select("stats", ["player", "week", "fantasy_points"], path=self.path, year=2021)
+        self.assertTrue(pd.api.types.is_integer_dtype(df["week"]))
+        self.assertTrue(pd.api.types.is_float_dtype(df["fantasy_points"]))
+
+    def test_indexes(self):
+        for table, column in [("stats", "player"), ("snapcounts", "player"), ("schedules", "team")]:
+            with self.subTest(table=table):
+                plan = warehouse.query(f"EXPLAIN QUERY PLAN SELECT * FROM {table} "
+                                       f"WHERE {column} = 'X' AND year = 2021 AND week = 1", path=self.path)
+                self.assertIn(f"USING INDEX {table}_{column}_year_week", " ".join(plan["detail"]))
+
+    def test_select(self):
+        expected = Stats("RB", 2021, refresh=True).get_accumulated_data()
+        expected = expected.loc[(expected["player"] == "Derrick Henry") & expected["week"].isin([1, 2])]
+
+        df = warehouse.select("stats", ["week", "rushing_att", "fantasy_points"], path=self.path,
+                              player="Derrick Henry", week=[1, 2])
+        np.testing.assert_array_equal(df["week"], expected["week"])
+        np.testing.assert_array_almost_equal(df["rushing_att"], expected["rushing_att"])
+        np.testing.assert_array_almost_equal(df["fantasy_points"], expected["fantasy_points"])
+
+    def test_join(self):
+        df = warehouse.query("SELECT s.week, g.opponent, g.home FROM stats s JOIN schedules g "
+                             "ON g.team = s.team AND g.year = s.year AND g.week = s.week "
+                             "WHERE s.player = ? AND s.year = 2021 ORDER BY s.week", ("Derrick Henry",), self.path)
+        expected = schedules.get_schedule(2021).set_index(["team", "week"]).loc["TEN"]
+        for week, opponent, home in df.itertuples(index=False):
+            with self.subTest(week=week):
+                self.assertEqual(opponent, expected.loc[week, "opponent"])
+                self.assertEqual(bool(home), expected.loc[week, "home"])
+
+    def test_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            warehouse.query("SELECT 1", path=os.path.join(self.prefix, "missing.sqlite"))
+
+
+class TestWarehouseUpdate(unittest.TestCase):
+    def setUp(self):
+        self.prefix = tempfile.mkdtemp()
+        self.manifest = manifest.PATH
+        manifest.PATH = os.path.join(self.prefix, "manifest.json")
+        self.source = os.path.join(self.prefix, "source.csv")
+        self.write(1.0)
+
+    def tearDown(self):
+        shutil.rmtree(self.prefix)
+        manifest.PATH = self.manifest
+
+    def write(self, points):
+        pd.DataFrame({"player": ["A", None], "year": [2021, 2021], "week": [1, 2],
+                      "points": [points, np.nan]}).to_csv(self.source, index=False)
+        manifest.get_manifest().record_fetch(self.source, 2)
+
+    def get_table(self):
+        return warehouse.Table("points", [(lambda: pd.read_csv(self.source), [self.source])],
+                               [warehouse.PLAYER_INDEX])
+
+    def test_update(self):
+        with contextlib.closing(sqlite3.connect(os.path.join(self.prefix, "warehouse.sqlite"))) as connection:
+            table = self.get_table()
+            self.assertTrue(warehouse.is_outdated(connection, table))
+            self.assertEqual(warehouse.load_table(connection, table), 2)
+            self.assertFalse(warehouse.is_outdated(connection, table))
+
+            rows = connection.execute("SELECT player, points FROM points ORDER BY week").fetchall()
+            self.assertEqual(rows, [("A", 1.0), (None, None)])
+
+            self.write(2.0)
+            self.assertTrue(warehouse.is_outdated(connection, table))
+            warehouse.load_table(connection, table)
+            self.assertFalse(warehouse.is_outdated(connection, table))
+            self.assertEqual(connection.execute("SELECT points FROM points WHERE week = 1").fetchall(), [(2.0,)])
+
+
+if __name__ == '__main__':
+    unittest.main()
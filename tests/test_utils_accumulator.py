@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import src.utils.accumulator as accumulator
+
+
+def load(week, columns):
+    if not columns:
+        return None
+    return pd.DataFrame({column: [week * 10 + i for i in range(3)] for column in columns})
+
+
+def load_loop(calls):
+    df = pd.DataFrame()
+    for args in calls:
+        df = pd.concat([df, load(*args)])
+    return df
+
+
+class TestAccumulator(unittest.TestCase):
+    def test_accumulate(self):
+        calls = [(1, ["a", "b"]), (2, ["a", "b"]), (3, ["a", "b"])]
+        df = accumulator.accumulate(load, calls)
+        pd.testing.assert_frame_equal(load_loop(calls), df)
+        self.assertListEqual([10, 11, 12, 20, 21, 22, 30, 31, 32], df["a"].to_list())
+
+    def test_accumulate_columns(self):
+        calls = [(1, ["a", "b"]), (2, ["a", "c"]), (3, ["c", "b", "d"])]
+        df = accumulator.accumulate(load, calls)
+        pd.testing.assert_frame_equal(load_loop(calls), df)
+        self.assertListEqual(["a", "b", "c", "d"], df.columns.to_list())
+        self.assertTrue(np.isnan(df["c"].iloc[0]))
+
+    def test_accumulate_missing(self):
+        calls = [(1, []), (2, ["a"]), (3, []), (4, ["a"])]
+        df = accumulator.accumulate(load, calls)
+        self.assertListEqual([20, 21, 22, 40, 41, 42], df["a"].to_list())
+        self.assertTrue(accumulator.accumulate(load, [(1, [])]).empty)
+
+    def test_accumulate_lazy(self):
+        calls = [(week, ["a"]) for week in range(1, 20)]
+        frames = accumulator.accumulate(load, calls, workers=4, lazy=True)
+        self.assertNotIsInstance(frames, pd.DataFrame)
+        self.assertListEqual([week * 10 for week in range(1, 20)], [df["a"].iloc[0] for df in frames])
+
+
+    def test_accumulate_lazy_bounded(self):
+        started = list()
+
+        def load_started(week, columns):
+            started.append(week)
+            return load(week, columns)
+
+        calls = [(week, ["a"]) for week in range(1, 20)]
+        frames = accumulator.accumulate(load_started, calls, workers=2, lazy=True)
+        self.assertListEqual(list(), started)
+
+        # taking two partitions starts at most one further load per worker and partition taken
+        self.assertListEqual([10, 20], [next(frames)["a"].iloc[0] for _ in range(2)])
+        self.assertLessEqual(len(started), 2 + 2)
+        frames.close()
+        self.assertLess(len(started), len(calls))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import http.server
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import pandas as pd
+
+import src.utils.archive as archive
+import src.utils.fetcher as fetcher
+import src.utils.io as io
+
+LAST_MODIFIED = "Sun, 09 Jan 2022 12:00:00 GMT"
+
+
+def get_page(version):
+    rows = "".join(f"<tr><td>{i}</td><td>Team {i}</td><td>{i * version}</td></tr>" for i in range(1, 4))
+    return f"""<html><body><table class="table">
+<tr><th>Rank</th><th>Team</th><th>YDS</th></tr>{rows}
+</table></body></html>""".encode("utf-8")
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    version = 1
+    requests = list()
+
+    def do_GET(self):
+        etag = f'"v{Handler.version}"'
+        conditional = self.headers.get("If-None-Match") is not None
+        Handler.requests.append((self.path, conditional))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        page = get_page(Handler.version)
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestArchive(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.version = 1
+        Handler.requests.clear()
+        self.prefix = archive.PREFIX
+        archive.PREFIX = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(archive.PREFIX)
+        archive.PREFIX = self.prefix
+
+    def test_store(self):
+        page = archive.get(f"{self.url}/stats")
+        self.assertEqual(get_page(1), page.content)
+        self.assertTrue(os.path.exists(archive.get_path(f"{self.url}/stats") + ".html.gz"))
+
+        meta = archive.load_meta(f"{self.url}/stats")
+        self.assertEqual(f"{self.url}/stats", meta["url"])
+        self.assertEqual('"v1"', meta["etag"])
+        self.assertEqual(LAST_MODIFIED, meta["last_modified"])
+
+    def test_archived(self):
+        archive.get(f"{self.url}/stats")
+        Handler.version = 2
+        self.assertEqual(get_page(1), archive.get(f"{self.url}/stats").content)
+        self.assertEqual(1, len(Handler.requests))
+
+    def test_offline(self):
+        archive.get(f"{self.url}/stats")
+        with archive.using("offline"):
+            self.assertEqual(get_page(1), archive.get(f"{self.url}/stats").content)
+            self.assertRaises(SystemExit, archive.get, f"{self.url}/other")
+        self.assertEqual(1, len(Handler.requests))
+        self.assertEqual("archive", archive.MODE)
+
+    def test_revalidate_unchanged(self):
+        archive.get(f"{self.url}/stats")
+        with archive.using("revalidate"):
+            page = archive.get(f"{self.url}/stats")
+        self.assertEqual(get_page(1), page.content)
+        self.assertListEqual([("/stats", False), ("/stats", True)], Handler.requests)
+
+    def test_revalidate_changed(self):
+        archive.get(f"{self.url}/stats")
+        Handler.version = 2
+        with archive.using("revalidate"):
+            self.assertEqual(get_page(2), archive.get(f"{self.url}/stats").content)
+        self.assertEqual(get_page(2), archive.get(f"{self.url}/stats").content)
+        self.assertEqual('"v2"', archive.load_meta(f"{self.url}/stats")["etag"])
+
+    def test_reparse(self):
+        url = f"{self.url}/stats"
+        archive.get(url)
+
+        def fetch():
+            data = io.get_from_fantasypros(url)
+            return pd.DataFrame(data=data[0][1:], columns=data[0][0])
+
+        tmp = tempfile.mkdtemp()
+        path = os.path.join(tmp, "stats.csv")
+        with archive.using("offline"):
+            summary = fetcher.get_fetcher().run([(path, fetch, ())], lambda p: False, io.store)
+        df = pd.read_csv(path)
+        shutil.rmtree(tmp)
+
+        self.assertEqual(1, summary["fetched"])
+        self.assertEqual(1, len(Handler.requests))
+        self.assertListEqual([1, 2, 3], df["YDS"].to_list())
+
+
+if __name__ == "__main__":
+    unittest.main()
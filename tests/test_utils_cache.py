@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+import src.loader.statistics as stats
+import src.utils.cache as cache
+
+loads = list()
+
+
+def _path(name):
+    return os.path.join(PREFIX, f"{name}.csv")
+
+
+@cache.memoize(lambda name, scale=1: _path(name))
+def load(name, scale=1):
+    loads.append(name)
+    if not os.path.exists(_path(name)):
+        return None
+    df = pd.read_csv(_path(name))
+    df["value"] *= scale
+    return df
+
+
+PREFIX = None
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        global PREFIX
+        PREFIX = tempfile.mkdtemp()
+        pd.DataFrame({"player": ["A", "B"], "value": [1, 2]}).to_csv(_path("week_1"), index=False)
+        loads.clear()
+        cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(PREFIX)
+        cache.COPY = True
+        cache.ENABLED = True
+
+    def test_memoize(self):
+        load("week_1")
+        load("week_1", 1)
+        load(name="week_1")
+        self.assertListEqual(["week_1"], loads)
+        self.assertEqual(2, cache.info()["hits"])
+        self.assertEqual(1, cache.info()["misses"])
+
+        self.assertListEqual([2, 4], load("week_1", scale=2)["value"].to_list())
+        self.assertListEqual(["week_1", "week_1"], loads)
+
+    def test_mtime(self):
+        load("week_1")
+        pd.DataFrame({"player": ["A"], "value": [3]}).to_csv(_path("week_1"), index=False)
+        stat = os.stat(_path("week_1"))
+        os.utime(_path("week_1"), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        self.assertListEqual([3], load("week_1")["value"].to_list())
+        self.assertEqual(2, len(loads))
+        self.assertEqual(1, cache.info()["entries"])
+
+    def test_missing(self):
+        self.assertIsNone(load("week_2"))
+        self.assertIsNone(load("week_2"))
+        self.assertEqual(1, len(loads))
+
+        pd.DataFrame({"player": ["A"], "value": [3]}).to_csv(_path("week_2"), index=False)
+        self.assertEqual(1, load("week_2").shape[0])
+
+    def test_copy(self):
+        df = load("week_1")
+        df.loc[0, "value"] = 100
+        df.drop("player", axis=1, inplace=True)
+
+        df = load("week_1")
+        self.assertListEqual([1, 2], df["value"].to_list())
+        df.loc[0, "value"] = 100
+        self.assertListEqual([1, 2], load("week_1")["value"].to_list())
+
+    def test_read_only(self):
+        load("week_1")
+        cache.COPY = False
+        df = load("week_1")
+        for i in range(df.shape[1]):
+            with self.assertRaises(ValueError):
+                df.iloc[0, i] = df.iloc[1, i]
+        df["value"] = df["value"] * 2
+        self.assertListEqual([1, 2], load("week_1")["value"].to_list())
+
+    def test_disabled(self):
+        cache.ENABLED = False
+        load("week_1")
+        load("week_1")
+        self.assertEqual(2, len(loads))
+        self.assertEqual(0, cache.info()["entries"])
+
+    def test_eviction(self):
+        df = pd.DataFrame({"value": range(100)})
+        size = cache.get_size(df)
+        lru = cache.Cache(maxsize=2 * size)
+        lru.put("a", 0, df)
+        lru.put("b", 0, df)
+        lru.get("a", 0)
+        lru.put("c", 0, df)
+
+        self.assertIsNotNone(lru.get("a", 0))
+        self.assertIsNone(lru.get("b", 0))
+        self.assertIsNotNone(lru.get("c", 0))
+        self.assertEqual({"hits": 3, "misses": 1, "evictions": 1, "entries": 2, "size": 2 * size}, lru.info())
+
+        lru.put("d", 0, pd.DataFrame({"value": range(1000)}))
+        self.assertEqual(2, lru.info()["entries"])
+
+    def test_loader(self):
+        df = stats.get_weekly_stats("QB", 1, 2021)
+        self.assertEqual(0, cache.info()["hits"])
+        pd.testing.assert_frame_equal(df, stats.get_weekly_stats("QB", 1, 2021))
+        stats.get_accumulated_weekly_stats("QB", 2021)
+        self.assertEqual(2, cache.info()["hits"])
+        self.assertEqual(18, cache.info()["misses"])
+
+
+if __name__ == "__main__":
+    unittest.main()
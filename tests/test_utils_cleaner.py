@@ -0,0 +1,134 @@
+import glob
+import os
+import unittest
+
+import pandas as pd
+
+import src.config.espn as espn_mapping
+import src.config.fantasypros as fp_mapping
+import src.utils.cleaner as cleaner
+
+PREFIX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "raw")
+
+
+def clean_rowwise(df, types):
+    df = cleaner.drop_unnamed(df)
+    df = cleaner.map_column_names(df, types)
+    df = cleaner.check_columns(df)
+    return cleaner.assign_type(df, types)
+
+
+def clean_stats_rowwise(df, types):
+    df = cleaner.drop_unnamed(df)
+    df = cleaner.map_column_names(df, types)
+    df = cleaner.check_columns(df)
+    df["team"] = df["player"].apply(cleaner.get_team_stats)
+    df["player"] = df["player"].apply(cleaner.fix_player_stats)
+    df["rost"] = df["rost"].apply(cleaner.fix_rost)
+    return cleaner.assign_type(df, types)
+
+
+def get_points_allowed_names(df):
+    return dict(list(fp_mapping.pa_type.items())[:df.shape[1]])
+
+
+def clean_points_allowed_rowwise(df, types):
+    df = cleaner.map_column_names(cleaner.drop_unnamed(df), get_points_allowed_names(df))
+    df = cleaner.check_columns(df)
+    return cleaner.assign_type(df, {column: types[column] for column in df.columns})
+
+
+def clean_points_allowed(df, types):
+    df = cleaner.map_column_names(cleaner.drop_unnamed(df), get_points_allowed_names(df))
+    return cleaner.fix_columns(df, types)
+
+
+def clean_stats(df, types):
+    df = cleaner.clean(df, types)
+    df["team"] = cleaner.get_team_stats_column(df["player"])
+    df["player"] = cleaner.fix_player_stats_column(df["player"])
+    return df
+
+
+class TestCleaner(unittest.TestCase):
+    def assertCleanedEqual(self, pattern, get_types, rowwise=clean_rowwise, vectorized=cleaner.clean):
+        paths = sorted(glob.glob(os.path.join(PREFIX, pattern)))
+        self.assertTrue(paths)
+        for path in paths:
+            with self.subTest(path=os.path.relpath(path, PREFIX)):
+                types = get_types(path)
+                expected = rowwise(pd.read_csv(path), types)
+                pd.testing.assert_frame_equal(expected, vectorized(pd.read_csv(path), types))
+
+    def test_weekly_stats(self):
+        self.assertCleanedEqual("weekly_stats/*/*/week_*.csv",
+                                lambda path: fp_mapping.stats_type[path.split(os.sep)[-2]],
+                                clean_stats_rowwise, clean_stats)
+
+    def test_yearly_stats(self):
+        self.assertCleanedEqual("yearly_stats/*/*.csv",
+                                lambda path: fp_mapping.stats_type[os.path.basename(path).split("_")[0]],
+                                clean_stats_rowwise, clean_stats)
+
+    def test_snapcounts(self):
+        self.assertCleanedEqual("weekly_snapcounts/*/week_*.csv", lambda path: fp_mapping.snapcounts_type)
+        self.assertCleanedEqual("yearly_snapcounts/*.csv", lambda path: fp_mapping.snapcounts_type)
+
+    def test_projections(self):
+        self.assertCleanedEqual("projections/*/*/week_*.csv",
+                                lambda path: fp_mapping.projections_type[path.split(os.sep)[-2]])
+
+    def test_points_allowed(self):
+        # older seasons lack some positions, assign_type fails on the full map for these
+        self.assertCleanedEqual("points_allowed/*.csv", lambda path: fp_mapping.pa_type,
+                                clean_points_allowed_rowwise, clean_points_allowed)
+        df = clean_points_allowed(pd.read_csv(os.path.join(PREFIX, "points_allowed", "points_allowed_2009.csv")),
+                                  fp_mapping.pa_type)
+        self.assertEqual(9, df.shape[1])
+
+    def test_team_stats(self):
+        self.assertCleanedEqual("teamstats/*/*.csv",
+                                lambda path: getattr(espn_mapping, "_".join(os.path.basename(path).split("_")[:2])
+                                                     + "_map"))
+
+    def test_fix_column(self):
+        column = pd.Series(["1,234", "5", None, "98.8%"])
+        self.assertListEqual([1234.0, 5.0, 98.8], cleaner.fix_column(column, float).dropna().to_list())
+        self.assertListEqual(["a,b", "c"], cleaner.fix_column(pd.Series(["a,b", "c"]), str).to_list())
+
+    def test_team_stats_column(self):
+        players = pd.Series(["Kyler Murray(ARI)", "Patrick Mahomes II(KC)", "Derrick Henry (TEN)"])
+        self.assertListEqual(players.apply(cleaner.get_team_stats).to_list(),
+                             cleaner.get_team_stats_column(players).to_list())
+        self.assertListEqual(players.apply(cleaner.fix_player_stats).to_list(),
+                             cleaner.fix_player_stats_column(players).to_list())
+
+    def test_split_team_projections(self):
+        paths = sorted(glob.glob(os.path.join(PREFIX, "projections", "*", "*", "week_*.csv")))
+        players = pd.concat([pd.read_csv(path).iloc[:, 0] for path in paths], ignore_index=True).drop_duplicates()
+        players = pd.concat([players, pd.Series(["Arizona Cardinals", "Derek CarrOAK", "Odell Beckham Jr."])])
+
+        names, teams = cleaner.split_team_projections(players)
+        self.assertListEqual(players.apply(cleaner.fix_player_projections).to_list()[:-3] + ["Arizona Cardinals"],
+                             names.to_list()[:-2])
+        self.assertListEqual(players.apply(cleaner.get_team_projections).to_list()[:-2],
+                             teams.to_list()[:-2])
+        # former abbreviations are mapped, free agents have no team
+        self.assertListEqual(["Derek Carr", "Odell Beckham Jr."], names.to_list()[-2:])
+        self.assertEqual("LV", teams.iloc[-2])
+        self.assertTrue(pd.isna(teams.iloc[-1]))
+
+    def test_add_team_abbreviation_column(self):
+        cleaner.clear_unknown_aliases()
+        teams = pd.Series(["Houston Texans", "St. Louis Rams", "KC", "Washington", "Gotham Knights", None,
+                           "Gotham Knights"])
+        abbreviations = cleaner.add_team_abbreviation_column(teams)
+        self.assertListEqual(["HOU", "LAR", "KC", "WAS", "Gotham Knights"], abbreviations.iloc[:5].to_list())
+        self.assertTrue(pd.isna(abbreviations.iloc[5]))
+        self.assertDictEqual({"Gotham Knights": 2}, dict(cleaner.get_unknown_aliases()))
+        cleaner.clear_unknown_aliases()
+        self.assertFalse(cleaner.get_unknown_aliases())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import src.loader.statistics as loader
+import src.utils.accumulator as accumulator
+import src.utils.compact as compact
+
+
+def get_frame(players, week):
+    return pd.DataFrame({"player": players, "team": ["TEN"] * len(players), "week": week,
+                         "fantasy_points": np.arange(len(players), dtype=np.float64) + 0.5, "home": True})
+
+
+class TestCompact(unittest.TestCase):
+    def setUp(self):
+        self.enabled = compact.ENABLED
+        compact.ENABLED = True
+        compact.clear()
+
+    def tearDown(self):
+        compact.ENABLED = self.enabled
+        compact.clear()
+
+    def test_disabled(self):
+        compact.ENABLED = False
+        df = get_frame(["A", "B"], 1)
+        self.assertIs(compact.compact(df), df)
+
+    def test_compact(self):
+        df = compact.compact(get_frame(["A", "B", None], 1))
+        self.assertIsInstance(df["player"].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(df["team"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["week"].dtype, np.int8)
+        self.assertEqual(df["fantasy_points"].dtype, np.float32)
+        self.assertEqual(df["home"].dtype, bool)
+        self.assertListEqual(["A", "B"], df["player"].cat.categories.to_list())
+        self.assertTrue(pd.isna(df["player"].iloc[2]))
+
+    def test_shared_categories(self):
+        first = compact.compact(get_frame(["A", "B"], 1))
+        second = compact.compact(get_frame(["C", "A"], 2))
+        self.assertListEqual(["A", "B"], first["player"].cat.categories.to_list())
+        self.assertListEqual(["A", "B", "C"], second["player"].cat.categories.to_list())
+        # the codes of earlier frames stay valid
+        self.assertListEqual([0, 1], first["player"].cat.codes.to_list())
+        self.assertListEqual([2, 0], second["player"].cat.codes.to_list())
+
+    def test_concat(self):
+        frames = [compact.compact(get_frame(["A", "B"], 1)), compact.compact(get_frame(["C", "A"], 2))]
+        df = accumulator.concat(frames)
+        self.assertIsInstance(df["player"].dtype, pd.CategoricalDtype)
+        self.assertListEqual(["A", "B", "C", "A"], df["player"].to_list())
+
+    def test_merge(self):
+        left = compact.compact(get_frame(["A", "B"], 1))
+        right = compact.compact(get_frame(["C", "A"], 1))
+        df = pd.merge(compact.align(left), compact.align(right), on=["player", "week"])
+        self.assertListEqual(["A"], df["player"].to_list())
+        self.assertIsInstance(df["player"].dtype, pd.CategoricalDtype)
+
+    def test_loader(self):
+        df = loader.get_weekly_stats("RB", 1, 2021)
+        self.assertIsInstance(df["player"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["rushing_yds"].dtype, np.float32)
+
+        compact.ENABLED = False
+        default = loader.get_weekly_stats("RB", 1, 2021)
+        self.assertEqual(default["player"].dtype, object)
+        self.assertListEqual(default["player"].to_list(), df["player"].to_list())
+        np.testing.assert_array_almost_equal(default["fantasy_points"], df["fantasy_points"], decimal=4)
+        self.assertLess(compact.get_memory(df), compact.get_memory(default))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import bs4
+
+import src.utils.extractor as extractor
+import src.utils.parser as parser
+
+FANTASYPROS = ("table", {"class": "table"})
+ESPN = ("table", {"class": "Table"})
+
+PAGE = b"""<!DOCTYPE html>
+<html><head><title>Stats</title><script>var table = "<table class='table'>";</script></head><body>
+<div class="nav"><table class="menu"><tr><td>Menu</td></tr></table></div>
+<table class="table table-bordered" id="data">
+<thead><tr><th>Rank</th><th>Player</th><th>CMP</th><th>YDS</th><th>ROST</th></tr></thead>
+<tbody>
+<tr><td>1</td><td><a class="player-name" href="#">Josh Allen</a> (BUF)<!-- note --></td><td>409</td>
+<td>4,407</td><td>100.0%</td></tr>
+<tr class="mpb-available"><td>2</td><td><a href="#">Justin&nbsp;Herbert</a> <small>(LAC)</small></td><td>443</td>
+<td>5,014</td><td>98.8%<br/></td></tr>
+<tr><td>3</td><td>Tom Brady &amp; Co<script>track();</script></td><td>485</td><td>5,316</td><td>99.0%</td></tr>
+<tr><td>4<td>unclosed</tr>
+</tbody></table>
+<table class="Table"><tbody><tr><td>Team</td></tr><tr><td><span>Buffalo</span> Bills</td></tr></tbody></table>
+<table class="Table"><thead><tr><th colspan="2">Passing</th></tr><tr><th>GP</th><th>YDS</th></tr></thead>
+<tbody><tr><td>17</td><td>2,771</td></tr></tbody></table>
+<table class="table"><tr><td>first row without header</td></tr><tr><td>second</td></tr></table>
+</body></html>"""
+
+
+def get_data(content, identifier):
+    return parser.get_data(parser.get_content(bs4.BeautifulSoup(content, "html.parser"), *identifier))
+
+
+class TestExtractor(unittest.TestCase):
+    def test_fantasypros(self):
+        data = extractor.extract(PAGE, FANTASYPROS)
+        self.assertListEqual(get_data(PAGE, FANTASYPROS), data)
+        self.assertEqual(2, len(data))
+        self.assertListEqual(["Rank", "Player", "CMP", "YDS", "ROST"], data[0][0])
+        self.assertListEqual(["1", "Josh Allen(BUF)", "409", "4,407", "100.0%"], data[0][1])
+        self.assertListEqual(["2", "Justin\xa0Herbert(LAC)", "443", "5,014", "98.8%"], data[0][2])
+        self.assertListEqual(["3", "Tom Brady & Co", "485", "5,316", "99.0%"], data[0][3])
+        self.assertListEqual([["second"]], data[1])
+
+    def test_espn(self):
+        data = extractor.extract(PAGE, ESPN)
+        self.assertListEqual(get_data(PAGE, ESPN), data)
+        self.assertListEqual([["BuffaloBills"]], data[0])
+        self.assertListEqual([["Passing"], ["GP", "YDS"], ["17", "2,771"]], data[1])
+
+    def test_unclosed(self):
+        data = extractor.extract(PAGE, FANTASYPROS)
+        self.assertListEqual(["4unclosed", "unclosed"], data[0][4])
+
+    def test_nested(self):
+        page = """<table class="table"><tr><th>A</th></tr>
+        <tr><td><table class="table"><tr><th>B</th></tr><tr><td>inner</td></tr></table>outer</td></tr></table>"""
+        self.assertListEqual(get_data(page, FANTASYPROS), extractor.extract(page, FANTASYPROS))
+
+    def test_stray_end_tags(self):
+        page = """<div><table class="table"></span><tr><th>A</th></tr><tr><td>1</p></td></tr></div>
+        <tr><td>2</td></tr></table>"""
+        self.assertListEqual(get_data(page, FANTASYPROS), extractor.extract(page, FANTASYPROS))
+
+    def test_no_table(self):
+        self.assertListEqual([], extractor.extract(b"<html><body><p>Nothing</p></body></html>", FANTASYPROS))
+
+    def test_decode(self):
+        self.assertEqual("Ja'Marr", extractor.decode("Ja'Marr".encode("utf-8")))
+        self.assertEqual("Jos\xe9", extractor.decode("Jos\xe9".encode("windows-1252")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import http.server
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import src.utils.archive as archive
+import src.utils.fetcher as fetcher
+import src.utils.io as io
+
+PAGE = b"""<html><body>
+<table class="table">
+<tr><th>Rank</th><th>Player</th><th>YDS</th></tr>
+<tr><td>1</td><td><a>Josh Allen</a>(BUF)</td><td>4,407</td></tr>
+</table>
+</body></html>"""
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    hits = dict()
+
+    def do_GET(self):
+        hits = Handler.hits.setdefault(self.path, list())
+        hits.append(time.monotonic())
+        # fail the first two requests to /flaky with a server error
+        if self.path == "/flaky" and len(hits) <= 2:
+            self.send_response(503)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestFetcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.hits.clear()
+
+    def test_get(self):
+        response = fetcher.Fetcher(interval=0.0).get(f"{self.url}/page")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(PAGE, response.content)
+
+    def test_backoff(self):
+        response = fetcher.Fetcher(interval=0.0, backoff=0.01).get(f"{self.url}/flaky")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(3, len(Handler.hits["/flaky"]))
+
+    def test_retries_exhausted(self):
+        response = fetcher.Fetcher(interval=0.0, retries=1, backoff=0.01).get(f"{self.url}/flaky")
+        self.assertEqual(503, response.status_code)
+
+    def test_rate_limit(self):
+        f = fetcher.Fetcher(workers=4, interval=0.05)
+        targets = [(str(i), f.get, (f"{self.url}/limited",)) for i in range(5)]
+        f.run(targets, lambda path: False, lambda path, response: None)
+        hits = Handler.hits["/limited"]
+        self.assertEqual(5, len(hits))
+        self.assertGreaterEqual(hits[-1] - hits[0], 4 * 0.05 * 0.9)
+
+    def test_run(self):
+        tmp = tempfile.mkdtemp()
+
+        def store(path, response):
+            with open(path, "wb") as file:
+                file.write(response.content)
+
+        f = fetcher.Fetcher(workers=3, interval=0.0)
+        open(os.path.join(tmp, "cached"), "w").close()
+        targets = [(os.path.join(tmp, name), f.get, (f"{self.url}/{name}",)) for name in ["cached", "a", "b", "c"]]
+
+        summary = f.run(targets, os.path.exists, store)
+        self.assertEqual(3, summary["fetched"])
+        self.assertEqual(1, summary["skipped"])
+        self.assertEqual(0, summary["failed"])
+        self.assertNotIn("/cached", Handler.hits)
+        with open(os.path.join(tmp, "a"), "rb") as file:
+            self.assertEqual(PAGE, file.read())
+
+        summary = f.run(targets, os.path.exists, store)
+        self.assertEqual(0, summary["fetched"])
+        self.assertEqual(4, summary["skipped"])
+
+    def test_run_failed(self):
+        def fetch():
+            raise SystemExit("connection refused")
+
+        summary = fetcher.Fetcher().run([("missing", fetch, ())], lambda path: False, lambda path, df: None)
+        self.assertEqual(1, summary["failed"])
+
+    def test_get_from_fantasypros(self):
+        prefix = archive.PREFIX
+        archive.PREFIX = tempfile.mkdtemp()
+        try:
+            data = io.get_from_fantasypros(f"{self.url}/stats")
+        finally:
+            shutil.rmtree(archive.PREFIX)
+            archive.PREFIX = prefix
+        self.assertListEqual([["Rank", "Player", "YDS"], ["1", "Josh Allen(BUF)", "4,407"]], data[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+import src.preprocessing.update as update
+import src.utils.fetcher as fetcher
+import src.utils.manifest as manifest
+
+from src.preprocessing.preprocessing import Preprocessing
+
+
+class Summary(Preprocessing):
+    def __init__(self, prefix, sources):
+        Preprocessing.__init__(self, 2021)
+        self.sources = sources
+        self.builds = 0
+        self.filename = "summary.csv"
+        self.dir = os.path.join(prefix, "preprocessed")
+
+    def concat_data(self):
+        self.builds += 1
+        return pd.concat([pd.read_csv(source) for source in self.sources])
+
+    def get_sources(self):
+        return self.sources
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.prefix = tempfile.mkdtemp()
+        self.path = manifest.PATH
+        manifest.PATH = os.path.join(self.prefix, "manifest.json")
+        self.week_1 = os.path.join(self.prefix, "week_1.csv")
+        self.week_2 = os.path.join(self.prefix, "week_2.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.prefix)
+        manifest.PATH = self.path
+
+    def test_stale(self):
+        m = manifest.get_manifest()
+        self.assertTrue(m.is_stale(self.week_1))
+
+        manifest.store(self.week_1, pd.DataFrame({"player": ["A"], "points": [1.0]}))
+        self.assertFalse(m.is_stale(self.week_1))
+        self.assertFalse(m.is_stale(self.week_1, live=True))
+        self.assertTrue(m.is_stale(self.week_1, live=True, max_age=datetime.timedelta(0)))
+
+        manifest.store(self.week_2, pd.DataFrame({"player": [], "points": []}))
+        self.assertTrue(m.is_stale(self.week_2))
+
+        manifest.record_failure(self.week_1, ValueError("table not found"))
+        self.assertTrue(m.is_stale(self.week_1))
+        self.assertEqual("table not found", m.get(self.week_1)["error"])
+
+    def test_unrecorded(self):
+        pd.DataFrame({"player": ["A"], "points": [1.0]}).to_csv(self.week_1, index=False)
+        m = manifest.get_manifest()
+        self.assertFalse(m.is_stale(self.week_1))
+        self.assertEqual(manifest.get_hash(self.week_1), m.get_hash(self.week_1))
+
+    def test_save(self):
+        manifest.store(self.week_1, pd.DataFrame({"player": ["A"], "points": [1.0]}))
+        manifest.save()
+        self.assertTrue(os.path.exists(manifest.PATH))
+
+        m = manifest.Manifest(manifest.PATH)
+        self.assertEqual(1, m.get(self.week_1)["rows"])
+
+    def test_update(self):
+        # an interrupted update resumes with the missing and failed targets
+        fetched = list()
+
+        def fetch(path):
+            fetched.append(path)
+            if path == self.week_2:
+                raise ValueError("table not found")
+            return pd.DataFrame({"player": ["A"], "points": [1.0]})
+
+        targets = [(self.week_1, fetch, (self.week_1,)), (self.week_2, fetch, (self.week_2,))]
+
+        def run():
+            m = manifest.get_manifest()
+            fetcher.Fetcher(workers=1).run(targets, lambda path: not m.is_stale(path), manifest.store, 1,
+                                           manifest.record_failure)
+
+        run()
+        run()
+        self.assertListEqual([self.week_1, self.week_2, self.week_2], fetched)
+        self.assertEqual("failed", manifest.get_manifest().get(self.week_2)["status"])
+
+    def test_rebuild(self):
+        manifest.store(self.week_1, pd.DataFrame({"player": ["A"], "points": [1.0]}))
+        manifest.store(self.week_2, pd.DataFrame({"player": ["B"], "points": [2.0]}))
+        summary = Summary(self.prefix, [self.week_1, self.week_2])
+
+        self.assertListEqual([summary.get_path()], update.rebuild([summary], workers=1))
+        self.assertListEqual([], update.rebuild([summary], workers=1))
+        self.assertEqual(1, summary.builds)
+        self.assertIn(os.path.normpath(summary.get_path()), manifest.get_manifest().get_dependents(self.week_1))
+
+        manifest.store(self.week_2, pd.DataFrame({"player": ["B"], "points": [3.0]}))
+        self.assertTrue(summary.is_outdated())
+        update.rebuild([summary], workers=1)
+        self.assertEqual(2, summary.builds)
+        self.assertListEqual([1.0, 3.0], pd.read_csv(summary.get_path())["points"].to_list())
+
+        # storing the same content again does not rebuild the summary
+        manifest.store(self.week_2, pd.DataFrame({"player": ["B"], "points": [3.0]}))
+        self.assertFalse(summary.is_outdated())
+
+
+if __name__ == "__main__":
+    unittest.main()
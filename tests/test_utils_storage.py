@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+import src.loader.schedules as schedules
+import src.loader.statistics as stats
+import src.utils.storage as storage
+
+
+class TestStorage(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        shutil.copytree(stats.PREFIX, os.path.join(cls.tmp, "raw"))
+        cls.prefix = (stats.PREFIX, schedules.PREFIX)
+        stats.PREFIX = schedules.PREFIX = os.path.join(cls.tmp, "raw")
+
+    @classmethod
+    def tearDownClass(cls):
+        stats.PREFIX, schedules.PREFIX = cls.prefix
+        shutil.rmtree(cls.tmp)
+
+    def tearDown(self):
+        storage.BACKEND = "csv"
+
+    def assertBackendsEqual(self, func, *args):
+        storage.BACKEND = "csv"
+        expected = func(*args)
+        storage.BACKEND = "parquet"
+        pd.testing.assert_frame_equal(expected, func(*args))
+        # second call reads the migrated parquet file
+        pd.testing.assert_frame_equal(expected, func(*args))
+
+    def test_get_unique_columns(self):
+        self.assertListEqual(["Unnamed: 0", "ATT", "YDS", "ATT.1", "YDS.1"],
+                             storage.get_unique_columns(["", "ATT", "YDS", "ATT", "YDS"]))
+
+    def test_assign_types(self):
+        df = pd.DataFrame(data=[["Josh Allen(BUF)", "4,407", "100.0%"]], columns=["Player", "YDS", "ROST"])
+        df = storage.assign_types(df)
+        self.assertEqual(4407, df.loc[0, "YDS"])
+        self.assertEqual("100.0%", df.loc[0, "ROST"])
+
+    def test_parquet_path(self):
+        self.assertEqual("raw/weekly_stats/2021/QB/week_1.parquet",
+                         storage.get_parquet_path("raw/weekly_stats/2021/QB/week_1.csv"))
+
+    def test_weekly_stats(self):
+        self.assertBackendsEqual(stats.get_weekly_stats, "QB", 1, 2021)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "raw/weekly_stats/2021/QB/week_1.parquet")))
+
+    def test_yearly_stats(self):
+        self.assertBackendsEqual(stats.get_yearly_stats, "WR", 2021)
+
+    def test_snapcounts(self):
+        self.assertBackendsEqual(stats.get_weekly_snapcounts, 1, 2021)
+
+    def test_projections(self):
+        self.assertBackendsEqual(stats.get_projections, "RB", 1, 2021)
+
+    def test_points_allowed(self):
+        self.assertBackendsEqual(stats.get_points_allowed, 2021)
+
+    def test_team_stats(self):
+        self.assertBackendsEqual(stats.get_defense_passing_stats, 2021)
+        self.assertBackendsEqual(stats.get_offense_downs_stats, 2021)
+
+    def test_schedule(self):
+        self.assertBackendsEqual(schedules.get_schedule, 2021)
+
+    def test_store(self):
+        storage.BACKEND = "parquet"
+        path = os.path.join(self.tmp, "raw/test/table.csv")
+        df = pd.DataFrame(data=[["Kyler Murray(ARI)", "21", "5"]], columns=["Player", "ATT", "ATT"])
+        storage.get_backend().store(path, df)
+        self.assertTrue(storage.get_backend().exists(path))
+        self.assertFalse(os.path.exists(path))
+        self.assertListEqual(["Player", "ATT", "ATT.1"], storage.get_backend().load(path).columns.to_list())
+
+    def test_migrate(self):
+        prefix = os.path.join(self.tmp, "raw/teamstats/2020")
+        self.assertEqual(8, storage.migrate(prefix))
+        self.assertEqual(0, storage.migrate(prefix))
+
+
+if __name__ == "__main__":
+    unittest.main()